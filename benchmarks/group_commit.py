@@ -0,0 +1,71 @@
+"""
+Durable logging throughput: per-record fsync versus group commit.
+
+Runs `--threads` writers that each log `--records` transactions through a
+GroupCommitTransactionLogger, first with max_batch=1 (one fsync per record)
+and then with the configured batching, and prints throughput and metrics.
+
+    python benchmarks/group_commit.py --threads 32 --records 200 --max-delay-ms 1
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse  # noqa: E402
+from payment_service.loggers import GroupCommitTransactionLogger  # noqa: E402
+
+
+def run(path: str, threads: int, records: int, max_batch: int, max_delay: float):
+    logger = GroupCommitTransactionLogger(path, max_batch=max_batch, max_delay=max_delay)
+    customer = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+    payment = PaymentData(amount=100, source="tok_visa")
+    response = PaymentResponse(status="success", amount=100, transaction_id="txn_1", message="ok")
+
+    def write():
+        for _ in range(records):
+            logger.log_transaction(customer, payment, response)
+
+    workers = [threading.Thread(target=write) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    logger.close()
+    return threads * records / elapsed, logger.metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--max-batch", type=int, default=1000)
+    parser.add_argument("--max-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, max_batch, max_delay in [
+            ("fsync/record", 1, 0.0),
+            ("group commit", args.max_batch, args.max_delay_ms / 1000),
+        ]:
+            rate, metrics = run(
+                str(Path(directory) / f"{max_batch}.log"),
+                args.threads, args.records, max_batch, max_delay,
+            )
+            print(
+                f"{label:>13}: {rate:9.0f} records/s, {metrics.commits} fsyncs, "
+                f"batch mean {metrics.mean_batch_size:.1f} max {metrics.max_batch_size}, "
+                f"fsync {metrics.mean_commit_seconds * 1000:.2f} ms, "
+                f"wait {metrics.mean_wait_seconds * 1000:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures the cold import cost of payment_service and guards against regressions.
+
+By default the target is `payment_service.service`, the entry point that
+`main.py` loads. Each sample imports the target module in a fresh interpreter and reads the
+cumulative time reported by `python -X importtime`. The script exits with
+status 1 when the median exceeds the budget, or when a module that must stay
+lazy (the Stripe SDK by default) was imported.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module payment_service.processors --budget-ms 300
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def sample(module: str, forbidden: list[str]) -> tuple[float, list[tuple[int, str]], list[str]]:
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Nested imports are indented by two spaces per level.
+        cumulative.append((int(cumulative_us), name[1:]))
+    total_us = next(us for us, name in reversed(cumulative) if name == module)
+    leaked = [name for name in result.stdout.strip().split(",") if name]
+    return total_us / 1000, cumulative, leaked
+
+
+def direct_dependencies(
+    cumulative: list[tuple[int, str]], module: str
+) -> list[tuple[int, str]]:
+    """Returns the imports made directly by `module`.
+
+    -X importtime prints in post-order, so a module's subtree is the block of
+    more deeply indented lines just above it.
+    """
+    index = max(i for i, (_, name) in enumerate(cumulative) if name == module)
+    direct = []
+    for us, name in reversed(cumulative[:index]):
+        depth = len(name) - len(name.lstrip())
+        if depth == 0:
+            break
+        if depth == 2:
+            direct.append((us, name.strip()))
+    return direct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="payment_service.service")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    parser.add_argument("--forbid", nargs="*", default=["stripe", "dotenv"])
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        total_ms, cumulative, leaked = sample(args.module, args.forbid)
+        timings.append(total_ms)
+
+    median = statistics.median(timings)
+    print(f"{args.module}: median {median:.1f} ms over {args.runs} runs "
+          f"(min {min(timings):.1f}, max {max(timings):.1f}, budget {args.budget_ms:.0f})")
+    print("slowest direct dependencies (cumulative ms, last run):")
+    for us, name in sorted(direct_dependencies(cumulative, args.module), reverse=True)[: args.top]:
+        print(f"  {us / 1000:8.1f}  {name}")
+
+    failed = False
+    if leaked:
+        print(f"FAIL: eagerly imported {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
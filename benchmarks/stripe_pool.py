@@ -0,0 +1,79 @@
+"""
+Measures StripePaymentProcessor against the local Stripe simulator.
+
+Sends charges through one processor from several threads and reports the
+number of TCP connections the simulator accepted next to the requests it
+served (pool reuse), the throughput, and how many requests were retries.
+
+    python benchmarks/stripe_pool.py --charges 500 --threads 8 --pool-size 8
+    python benchmarks/stripe_pool.py --latency-ms 40 --error-rate 0.05 --retries 2
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData  # noqa: E402
+from payment_service.processors import StripePaymentProcessor  # noqa: E402
+from payment_service.stripe_simulator import (  # noqa: E402
+    Latency,
+    SimulatorConfig,
+    StripeSimulator,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--charges", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        latency=Latency(args.latency_ms, args.jitter_ms, "normal"),
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    customer = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+    payment = PaymentData(amount=100, source="tok_visa")
+
+    with StripeSimulator(config) as simulator:
+        processor = StripePaymentProcessor(
+            api_key="sk_test_simulator",
+            api_base=simulator.url,
+            pool_size=args.pool_size,
+            max_network_retries=args.retries,
+        )
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            responses = list(
+                executor.map(
+                    lambda _: processor.process_transaction(customer, payment),
+                    range(args.charges),
+                )
+            )
+        elapsed = time.perf_counter() - start
+        processor.close()
+        stats = simulator.stats()
+
+    failed = sum(1 for response in responses if response.status != "succeeded")
+    print(f"charges:     {args.charges} ({failed} failed)")
+    print(f"requests:    {stats['requests']} ({stats['requests'] - args.charges} retries)")
+    print(f"statuses:    {stats['statuses']}")
+    print(f"connections: {stats['connections']} (pool size {args.pool_size})")
+    print(f"throughput:  {args.charges / elapsed:.0f} charges/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Per-request overhead of a ChainHandler chain versus its compiled form.
+
+Builds a chain of alternating CustomerHandler/PaymentHandler links, then
+times `chain.handle(request)` against `chain.compile()(request)` on a valid
+request (the hot path: nothing is printed). With `--independent N`, also
+compares N independent handlers that each block for `--io-ms` run in
+sequence against the same chain compiled with a thread pool.
+
+    python benchmarks/validation_chain.py --length 4 --number 200000
+    python benchmarks/validation_chain.py --independent 4 --io-ms 20
+"""
+
+import argparse
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, Request  # noqa: E402
+from payment_service.validators import ChainHandler, CustomerHandler, PaymentHandler  # noqa: E402
+
+
+class RemoteCheck(ChainHandler):
+    """Stand-in for a stage that waits on a remote service."""
+
+    independent = True
+
+    def __init__(self, io_ms: float):
+        self.io_ms = io_ms
+
+    def check(self, request: Request):
+        time.sleep(self.io_ms / 1000)
+
+
+def link(handlers: list[ChainHandler]) -> ChainHandler:
+    for current, following in zip(handlers, handlers[1:]):
+        current.set_next(following)
+    return handlers[0]
+
+
+def build_chain(length: int):
+    return link([
+        CustomerHandler() if i % 2 == 0 else PaymentHandler() for i in range(length)
+    ])
+
+
+def compare_independent(request: Request, stages: int, io_ms: float, number: int):
+    chain = link([CustomerHandler(), *(RemoteCheck(io_ms) for _ in range(stages))])
+    with ThreadPoolExecutor(max_workers=stages) as executor:
+        for label, validate in [
+            ("sequential", chain.compile()),
+            ("parallel", chain.compile(executor=executor)),
+        ]:
+            started = time.perf_counter()
+            for _ in range(number):
+                assert validate(request) == ()
+            elapsed = (time.perf_counter() - started) / number * 1000
+            print(f"{label:>13}: {elapsed:8.2f} ms/request "
+                  f"({stages} independent stages of {io_ms:g} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--length", type=int, default=2)
+    parser.add_argument("--number", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--independent", type=int, default=0)
+    parser.add_argument("--io-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    request = Request(
+        customer_data=CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co")),
+        payment_data=PaymentData(amount=100, source="tok_visa"),
+    )
+    chain = build_chain(args.length)
+    compiled = chain.compile()
+    assert compiled(request) == ()
+
+    results = {}
+    for label, call in [
+        ("chain.handle", lambda: chain.handle(request)),
+        ("compiled", lambda: compiled(request)),
+    ]:
+        best = min(timeit.repeat(call, number=args.number, repeat=args.repeat))
+        results[label] = best / args.number * 1e9
+        print(f"{label:>13}: {results[label]:8.1f} ns/request")
+    print(f"{'speedup':>13}: {results['chain.handle'] / results['compiled']:8.2f}x "
+          f"(chain length {args.length})")
+
+    if args.independent:
+        compare_independent(request, args.independent, args.io_ms, number=50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Having a conftest here puts `src` on sys.path, so the tests import
+# `payment_service` the same way the benchmarks do, without installing it.
@@ -0,0 +1,259 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .async_service_protocol import AsyncPaymentServiceProtocol
+from .commons import (
+    BatchItemResult,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    Request,
+)
+from .idempotency import IdempotencyCache, fingerprint
+from .listeners import AsyncListenersManager, PaymentEvent, RefundEvent
+from .loggers import AsyncTransactionLoggerProtocol
+from .notifiers import AsyncNotifierProtocol
+from .processors import (
+    AsyncPaymentProcessorProtocol,
+    AsyncRecurringPaymentProcessorProtocol,
+    AsyncRefundProcessorProtocol,
+)
+from .validators import ChainHandler
+
+
+@dataclass
+class AsyncPaymentService(AsyncPaymentServiceProtocol):
+    """
+    Versión asyncio de PaymentService.
+
+    Todas las dependencias con I/O (procesador, notificador, listeners y
+    logger) son corutinas, de modo que un solo event loop puede mantener
+    miles de pagos en vuelo sin dedicar un hilo a cada uno. La validación
+    sigue siendo síncrona porque solo usa CPU.
+
+    Attributes:
+        payment_processor: Procesador de pagos asíncrono
+        notifier: Servicio asíncrono para enviar notificaciones
+        validators: Cadena de validaciones. Se compila al crear el servicio;
+            un pago que no la supera lanza ValueError sin llegar al procesador.
+        logger: Registrador asíncrono de transacciones
+        listeners: Administrador de listeners asíncronos
+        refund_processor: Procesador de reembolsos asíncrono (opcional)
+        recurring_processor: Procesador de pagos recurrentes asíncrono (opcional)
+        max_concurrency: Transacciones simultáneas permitidas en process_batch
+        idempotency_cache: Caché de respuestas por clave de idempotencia
+            (opcional), igual que en PaymentService. Los reintentos
+            concurrentes con la misma clave esperan al primero en el event
+            loop en lugar de volver a cobrar.
+    """
+    payment_processor: AsyncPaymentProcessorProtocol
+    notifier: AsyncNotifierProtocol
+    validators: ChainHandler
+    logger: AsyncTransactionLoggerProtocol
+    listeners: AsyncListenersManager
+    refund_processor: Optional[AsyncRefundProcessorProtocol] = None
+    recurring_processor: Optional[AsyncRecurringPaymentProcessorProtocol] = None
+    max_concurrency: int = 1000
+    idempotency_cache: Optional[IdempotencyCache] = None
+
+    def __post_init__(self):
+        # La cadena se recorre una sola vez aquí y no en cada pago; los
+        # handlers enlazados después con set_next no se incluyen.
+        self._validate = self.validators.compile_async()
+
+    def set_notifier(self, notifier: AsyncNotifierProtocol):
+        """
+        Cambia el notificador utilizado por el servicio.
+
+        Args:
+            notifier: El nuevo notificador asíncrono a utilizar
+        """
+        print("Changing the notifier implementation")
+        self.notifier = notifier
+
+    async def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse:
+        """
+        Procesa una transacción de pago completa sin bloquear el event loop.
+
+        Sigue el mismo flujo que PaymentService.process_transaction. Una vez
+        que el procesador responde, los listeners, la notificación y el
+        registro se ejecutan de forma concurrente.
+
+        Args:
+            customer_data: Datos del cliente que realiza el pago
+            payment_data: Datos del pago a procesar
+            idempotency_key: Clave de idempotencia del cliente (opcional). Se
+                reenvía al procesador y, si hay idempotency_cache, los
+                reintentos con la misma clave reutilizan la primera respuesta
+                que no haya fallado. Reutilizar la clave con otros datos lanza
+                ValueError.
+
+        Returns:
+            La respuesta del procesador de pagos
+        """
+        if idempotency_key and self.idempotency_cache:
+            return await self.idempotency_cache.get_or_run_async(
+                ("transaction", idempotency_key),
+                lambda: self._process_transaction(
+                    customer_data, payment_data, idempotency_key
+                ),
+                fingerprint(customer_data, payment_data),
+            )
+        return await self._process_transaction(
+            customer_data, payment_data, idempotency_key
+        )
+
+    async def _process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str],
+    ) -> PaymentResponse:
+        try:
+            request = Request(customer_data=customer_data, payment_data=payment_data)
+            failures = await self._validate(request)
+            if failures:
+                raise ValueError("; ".join(failure.message for failure in failures))
+        except Exception as e:
+            print(f"Error processing transaction: {e}")
+            raise e
+
+        started = time.perf_counter()
+        payment_response = await self.payment_processor.process_transaction(
+            customer_data, payment_data, idempotency_key=idempotency_key
+        )
+        event = PaymentEvent(
+            payment_response,
+            customer_data,
+            payment_data,
+            processor=type(self.payment_processor).__name__,
+            elapsed=time.perf_counter() - started,
+        )
+
+        await asyncio.gather(
+            self.listeners.notify_all(event),
+            self.notifier.send_confirmation(customer_data),
+            self.logger.log_transaction(
+                customer_data, payment_data, payment_response
+            ),
+        )
+        return payment_response
+
+    async def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_concurrency: Optional[int] = None,
+    ) -> list[BatchItemResult]:
+        """
+        Procesa muchas transacciones de forma concurrente en el event loop.
+
+        Un pool fijo de max_concurrency tareas consume el iterable de forma
+        perezosa, así que nunca hay más corutinas que ese límite y sirve para
+        lotes muy grandes, igual que PaymentService.process_batch.
+
+        Args:
+            items: Iterable de tuplas (customer_data, payment_data)
+            max_concurrency: Límite de transacciones en vuelo; por defecto
+                usa el atributo max_concurrency del servicio
+
+        Returns:
+            Un BatchItemResult por elemento, en el mismo orden de entrada
+        """
+        limit = self.max_concurrency if max_concurrency is None else max_concurrency
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        pending = enumerate(items)
+        results: list[BatchItemResult] = []
+
+        async def worker():
+            # Workers share the iterator; each next() runs without yielding
+            # to the loop, so every item is taken by exactly one worker.
+            for index, (customer_data, payment_data) in pending:
+                try:
+                    response = await self.process_transaction(
+                        customer_data, payment_data
+                    )
+                    results.append(BatchItemResult(index=index, response=response))
+                except Exception as e:
+                    results.append(BatchItemResult(index=index, error=str(e)))
+
+        await asyncio.gather(*(worker() for _ in range(limit)))
+        results.sort(key=lambda result: result.index)
+        return results
+
+    async def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ):
+        """
+        Procesa un reembolso para una transacción existente.
+
+        Sigue el mismo flujo que PaymentService.process_refund: el registro
+        y el RefundEvent para los listeners se ejecutan de forma concurrente.
+
+        Args:
+            transaction_id: Identificador de la transacción a reembolsar
+            idempotency_key: Clave de idempotencia del cliente (opcional), con
+                el mismo comportamiento que en process_transaction
+
+        Returns:
+            La respuesta del procesador de reembolsos
+
+        Raises:
+            Exception: Si este servicio no tiene configurado un procesador de reembolsos
+        """
+        if not self.refund_processor:
+            raise Exception("this processor does not support refunds")
+        if idempotency_key and self.idempotency_cache:
+            return await self.idempotency_cache.get_or_run_async(
+                ("refund", idempotency_key),
+                lambda: self._process_refund(transaction_id, idempotency_key),
+                fingerprint(transaction_id),
+            )
+        return await self._process_refund(transaction_id, idempotency_key)
+
+    async def _process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str]
+    ) -> PaymentResponse:
+        refund_response = await self.refund_processor.refund_payment(
+            transaction_id, idempotency_key=idempotency_key
+        )
+        event = RefundEvent(transaction_id, refund_response)
+        await asyncio.gather(
+            self.listeners.notify_all(event, event.topic),
+            self.logger.log_refund(transaction_id, refund_response),
+        )
+        return refund_response
+
+    async def setup_recurring(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ):
+        """
+        Configura un pago recurrente para un cliente.
+
+        Args:
+            customer_data: Datos del cliente para el pago recurrente
+            payment_data: Datos del pago recurrente a configurar
+
+        Returns:
+            La respuesta del procesador de pagos recurrentes
+
+        Raises:
+            Exception: Si este servicio no tiene configurado un procesador de pagos recurrentes
+        """
+        if not self.recurring_processor:
+            raise Exception("this processor does not support recurring")
+        recurring_response = await self.recurring_processor.setup_recurring_payment(
+            customer_data, payment_data
+        )
+        await self.logger.log_transaction(
+            customer_data, payment_data, recurring_response
+        )
+        return recurring_response
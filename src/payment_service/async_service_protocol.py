@@ -0,0 +1,43 @@
+from typing import Iterable, Optional, Protocol
+
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse
+from .loggers import AsyncTransactionLoggerProtocol
+from .notifiers import AsyncNotifierProtocol
+from .processors import (
+    AsyncPaymentProcessorProtocol,
+    AsyncRecurringPaymentProcessorProtocol,
+    AsyncRefundProcessorProtocol,
+)
+from .validators import ChainHandler
+from .listeners import AsyncListenersManager
+
+
+class AsyncPaymentServiceProtocol(Protocol):
+    payment_processor: AsyncPaymentProcessorProtocol
+    notifier: AsyncNotifierProtocol
+    validators: ChainHandler
+    logger: AsyncTransactionLoggerProtocol
+    listeners: AsyncListenersManager
+    refund_processor: Optional[AsyncRefundProcessorProtocol] = None
+    recurring_processor: Optional[AsyncRecurringPaymentProcessorProtocol] = None
+
+    async def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse: ...
+
+    async def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_concurrency: Optional[int] = None,
+    ) -> list[BatchItemResult]: ...
+
+    async def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ): ...
+
+    async def setup_recurring(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ): ...
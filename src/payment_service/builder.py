@@ -13,7 +13,12 @@ from .processors import (
     RefundProcessorProtocol,
 )
 from .validators import CustomerValidator, PaymentDataValidator, ChainHandler, CustomerHandler
-from listeners import ListenersManager, AccountAbilityListener
+from .listeners import (
+    AccountAbilityListener,
+    BackpressurePolicy,
+    EventBus,
+    ListenersManager,
+)
 
 @dataclass
 class PaymentServiceBuilder():
@@ -91,4 +96,16 @@ class PaymentServiceBuilder():
         accountability_listener = AccountAbilityListener()
         listener.subscribe(accountability_listener)
 
-        self.listener = listener
\ No newline at end of file
+        self.listener = listener
+
+    def set_event_bus(
+        self,
+        workers: int = 1,
+        maxsize: int = 10_000,
+        policy: BackpressurePolicy = BackpressurePolicy.BLOCK,
+    ) -> Self:
+        """Like set_list, but listeners are notified from background workers."""
+        listener = EventBus(workers=workers, maxsize=maxsize, policy=policy)
+        listener.subscribe(AccountAbilityListener())
+        self.listener = listener
+        return self
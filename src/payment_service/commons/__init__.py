@@ -1,3 +1,4 @@
+from .batch_result import BatchItemResult, RefundBatchReport, RefundOutcome
 from .contact import ContactInfo
 from .customer import CustomerData
 from .payment_data import PaymentData, PaymentType
@@ -5,11 +6,14 @@ from .payment_response import PaymentResponse
 from .request import Request
 
 __all__ = [
+    "BatchItemResult",
     "ContactInfo",
     "CustomerData",
     "PaymentData",
     "PaymentResponse",
     "PaymentType",
+    "RefundBatchReport",
+    "RefundOutcome",
     "Request",
 ]
 
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .payment_response import PaymentResponse
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    response: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class RefundOutcome(BaseModel):
+    transaction_id: str
+    response: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+    # Set when the refund could not be written to the transaction log.
+    log_error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response.status != "failed"
+
+
+class RefundBatchReport(BaseModel):
+    outcomes: list[RefundOutcome]
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Refunds processed per second."""
+        if not self.elapsed_seconds:
+            return 0.0
+        return len(self.outcomes) / self.elapsed_seconds
+
+    @property
+    def unlogged(self) -> int:
+        """Refunds whose log entry could not be written."""
+        return sum(1 for outcome in self.outcomes if outcome.log_error)
@@ -8,3 +8,7 @@ class PaymentResponse(BaseModel):
     amount: int
     transaction_id: Optional[str] = None
     message: Optional[str] = None
+    timings: Optional[dict[str, float]] = None
+    # Set on failures caused by the processor itself (connection errors,
+    # rate limiting, 5xx) rather than by the payment, e.g. a card decline.
+    backend_error: bool = False
@@ -1,7 +1,8 @@
-from typing import Protocol
+import os
+from typing import Iterable, Optional, Protocol, Union
 
 from service_protocol import PaymentServiceProtocol
-from .commons import CustomerData, PaymentData, PaymentResponse
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse, RefundBatchReport
  
 
 
@@ -9,10 +10,29 @@ class PaymentServiceDecoratorProtocol(Protocol):
     wrapped = PaymentServiceProtocol()
 
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse: ...
 
-    def process_refund(self, transaction_id: str): ...
+    def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_workers: Optional[int] = None,
+    ) -> list[BatchItemResult]: ...
+
+    def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ): ...
+
+    def process_refunds(
+        self,
+        transaction_ids: Union[Iterable[str], str, os.PathLike],
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        log_batch_size: int = 500,
+    ) -> RefundBatchReport: ...
 
     def setup_recurring(
         self, customer_data: CustomerData, payment_data: PaymentData
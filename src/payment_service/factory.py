@@ -1,20 +1,37 @@
-from commons import PaymentData, PaymentType
-from processors import PaymentProcessorProtocol, OfflinePaymentProcessor, StripePaymentProcessor, LocalPaymentProcessor
+from typing import Optional
+
+from .commons import PaymentData, PaymentType
+from .processors import (
+    ANY_CURRENCY,
+    PaymentProcessorProtocol,
+    ProcessorRegistry,
+    default_registry,
+)
+from .processors.registry import ProcessorFactory
 
 class PaymentProcessorFactory:
-    @staticmethod
-    def create_payment_processor(payment_data: PaymentData) -> PaymentProcessorProtocol:
-        match payment_data.type:
-            case PaymentType.OFFLINE:
-                return OfflinePaymentProcessor()
-            
-            case PaymentType.ONLINE:
-                match payment_data.currency:
-                    case "USD":
-                        return StripePaymentProcessor()
-                    case _:
-                        return LocalPaymentProcessor()
-                    
-            case _:
-                raise ValueError("Invalid payment type")
-                         
\ No newline at end of file
+    """
+    Resolves the processor for a payment through a ProcessorRegistry.
+
+    The default routes send offline payments to OfflinePaymentProcessor,
+    online USD payments to StripePaymentProcessor and any other online
+    currency to LocalPaymentProcessor. Processors are shared instances, so
+    repeated calls reuse the same pooled clients.
+    """
+
+    registry: ProcessorRegistry = default_registry
+
+    @classmethod
+    def create_payment_processor(cls, payment_data: PaymentData) -> PaymentProcessorProtocol:
+        return cls.registry.resolve(payment_data)
+
+    @classmethod
+    def register(
+        cls,
+        name: str,
+        payment_type: PaymentType,
+        currency: Optional[str] = ANY_CURRENCY,
+        factory: Optional[ProcessorFactory] = None,
+        shared: bool = True,
+    ):
+        cls.registry.register(name, payment_type, currency, factory, shared)
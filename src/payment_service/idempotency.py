@@ -0,0 +1,149 @@
+import asyncio
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Awaitable, Callable, Hashable, Optional
+
+from pydantic import BaseModel
+
+from .caching import SingleFlight, TTLCache
+from .commons import PaymentResponse
+
+
+def fingerprint(*parts: BaseModel | str) -> str:
+    """Digest of a request payload, to detect a key reused for another request."""
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        text = part.model_dump_json() if isinstance(part, BaseModel) else part
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def is_final(response: PaymentResponse) -> bool:
+    """
+    Whether a response may be replayed to retries.
+
+    Failed responses are never stored: the processors report connection
+    errors and timeouts as failed responses, and a retry must reach the
+    processor again. Declines are not lost by this, since the key is also
+    forwarded to the processor.
+    """
+    return response.status != "failed"
+
+
+@dataclass
+class IdempotencyCache:
+    """
+    Remembers completed `PaymentResponse`s by idempotency key.
+
+    A retry carrying a key that already completed gets the stored response
+    without reaching the processor again. A retry that arrives while the
+    first request is still in flight waits for it instead of issuing a
+    second charge. Only responses accepted by `cacheable` are stored, so a
+    failed attempt can be retried with the same key. Entries are bounded by
+    `maxsize` (LRU) and `ttl`.
+
+    Each entry keeps the fingerprint of the request that created it; reusing
+    a key with a different fingerprint raises ValueError instead of
+    returning the other request's response.
+
+    `get_or_run_async` is the asyncio counterpart of `get_or_run`; retries
+    are collapsed with futures of the running event loop instead of
+    blocking a thread. Both share the stored responses.
+    """
+
+    maxsize: int = 10_000
+    ttl: float = 24 * 60 * 60
+    cacheable: Callable[[PaymentResponse], bool] = is_final
+    _responses: TTLCache = field(init=False, repr=False)
+    _in_flight: SingleFlight = field(init=False, repr=False)
+    _in_flight_async: dict[Hashable, asyncio.Future] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._responses = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._in_flight = SingleFlight()
+        self._in_flight_async = {}
+
+    def get_or_run(
+        self,
+        key: Hashable,
+        operation: Callable[[], PaymentResponse],
+        fingerprint: Optional[str] = None,
+    ) -> PaymentResponse:
+        cached = self._lookup(key, fingerprint)
+        if cached is not None:
+            return cached
+
+        def run() -> tuple[Optional[str], PaymentResponse]:
+            cached = self._lookup(key, fingerprint)
+            if cached is not None:
+                return fingerprint, cached
+            response = operation()
+            if self.cacheable(response):
+                self._responses.set(key, (fingerprint, response))
+            return fingerprint, response
+
+        # Callers that joined an in-flight request compare against the
+        # fingerprint of the request that ran it.
+        owner, response = self._in_flight.do(key, run)
+        self._check(key, owner, fingerprint)
+        return response
+
+    async def get_or_run_async(
+        self,
+        key: Hashable,
+        operation: Callable[[], Awaitable[PaymentResponse]],
+        fingerprint: Optional[str] = None,
+    ) -> PaymentResponse:
+        """Like `get_or_run`, for coroutines running on one event loop."""
+        cached = self._lookup(key, fingerprint)
+        if cached is not None:
+            return cached
+        running = self._in_flight_async.get(key)
+        if running is not None:
+            # Shielded so a retry that gets cancelled does not cancel the
+            # request it joined.
+            owner, response = await asyncio.shield(running)
+            self._check(key, owner, fingerprint)
+            return response
+
+        # Nothing awaits between the lookups and registering the future, so
+        # no other coroutine can start the same key in between.
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight_async[key] = future
+        try:
+            response = await operation()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Retrieved here so a failure nobody joined is not logged.
+                future.exception()
+            raise
+        finally:
+            del self._in_flight_async[key]
+        if self.cacheable(response):
+            self._responses.set(key, (fingerprint, response))
+        future.set_result((fingerprint, response))
+        return response
+
+    def forget(self, key: Hashable):
+        self._responses.pop(key)
+
+    def _lookup(
+        self, key: Hashable, fingerprint: Optional[str]
+    ) -> Optional[PaymentResponse]:
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        owner, response = entry
+        self._check(key, owner, fingerprint)
+        return response
+
+    @staticmethod
+    def _check(key: Hashable, owner: Optional[str], fingerprint: Optional[str]):
+        if owner != fingerprint:
+            raise ValueError(
+                f"Idempotency key {key!r} was already used for a different request"
+            )
@@ -1,7 +1,27 @@
-from accountability_listener import AccountAbilityListener
-from manager import ListenersManager
+from .accountability_listener import AccountAbilityListener
+from .accounting import AccountingListener, AccountingSnapshot, Totals
+from .event_bus import BackpressurePolicy, EventBus
+from .events import PaymentEvent, RefundEvent
+from .listener import BatchListener, Listener
+from .manager import ALL_TOPICS, ListenersManager
+from .topics import EventTopic
+from .async_listener import AsyncListener
+from .async_manager import AsyncListenersManager
 
 __all__ = [
+    "ALL_TOPICS",
     "AccountAbilityListener",
-    "ListenersManager"
-]
\ No newline at end of file
+    "AccountingListener",
+    "AccountingSnapshot",
+    "AsyncListener",
+    "AsyncListenersManager",
+    "BackpressurePolicy",
+    "BatchListener",
+    "EventBus",
+    "EventTopic",
+    "Listener",
+    "ListenersManager",
+    "PaymentEvent",
+    "RefundEvent",
+    "Totals",
+]
@@ -0,0 +1,367 @@
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Sequence
+
+from payment_service.caching import TTLCache
+
+from .events import PaymentEvent, RefundEvent
+
+UNKNOWN = "unknown"
+
+# ("payment", timestamp, transaction_id, currency, processor, amount, succeeded)
+# or ("refund", timestamp, transaction_id, amount)
+Entry = tuple[Any, ...]
+
+
+class Totals(NamedTuple):
+    count: int = 0
+    amount: int = 0
+    denied: int = 0
+    refunds: int = 0
+    refunded: int = 0
+
+    def add_payment(self, amount: int, succeeded: bool) -> "Totals":
+        if succeeded:
+            return self._replace(count=self.count + 1, amount=self.amount + amount)
+        return self._replace(denied=self.denied + 1)
+
+    def add_refund(self, amount: int) -> "Totals":
+        return self._replace(refunds=self.refunds + 1, refunded=self.refunded + amount)
+
+
+def _empty() -> Mapping:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class AccountingSnapshot:
+    """
+    Immutable view of the running totals at one point in time.
+
+    `by_bucket` maps the start (epoch seconds) of each time bucket to its
+    totals; it is assembled when read, every other field is shared as is.
+    """
+
+    totals: Totals = Totals()
+    by_currency: Mapping[str, Totals] = field(default_factory=_empty)
+    by_processor: Mapping[str, Totals] = field(default_factory=_empty)
+    closed_buckets: Mapping[int, Totals] = field(default_factory=_empty)
+    current_bucket: Optional[tuple[int, Totals]] = None
+    events: int = 0
+    last_timestamp: float = 0.0
+
+    @property
+    def by_bucket(self) -> Mapping[int, Totals]:
+        if self.current_bucket is None:
+            return self.closed_buckets
+        start, totals = self.current_bucket
+        return MappingProxyType({**self.closed_buckets, start: totals})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "totals": list(self.totals),
+            "by_currency": {key: list(value) for key, value in self.by_currency.items()},
+            "by_processor": {key: list(value) for key, value in self.by_processor.items()},
+            "by_bucket": {str(key): list(value) for key, value in self.by_bucket.items()},
+            "events": self.events,
+            "last_timestamp": self.last_timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AccountingSnapshot":
+        buckets = {int(key): Totals(*value) for key, value in data["by_bucket"].items()}
+        current = max(buckets, default=None)
+        return cls(
+            totals=Totals(*data["totals"]),
+            by_currency=MappingProxyType(
+                {key: Totals(*value) for key, value in data["by_currency"].items()}
+            ),
+            by_processor=MappingProxyType(
+                {key: Totals(*value) for key, value in data["by_processor"].items()}
+            ),
+            closed_buckets=MappingProxyType(
+                {key: value for key, value in buckets.items() if key != current}
+            ),
+            current_bucket=None if current is None else (current, buckets[current]),
+            events=data["events"],
+            last_timestamp=data["last_timestamp"],
+        )
+
+
+class _Journal:
+    """
+    Append-only file of the entries applied since the last checkpoint.
+
+    Offsets count bytes from the first entry ever written, and the header
+    line records the offset the file starts at (`base`), so compacting the
+    file after a checkpoint does not invalidate the offset saved in it.
+    """
+
+    def __init__(self, path: str, start: int):
+        self.path = path
+        if not os.path.exists(path):
+            self._rewrite(start, b"")
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "r+b")
+        header = self._file.readline()
+        self.base = json.loads(header)["base"]
+        self._header = len(header)
+        tail = self._file.read()
+        # Drop a line torn by a crash before appending after it.
+        complete = tail.rfind(b"\n") + 1
+        self._file.truncate(self._header + complete)
+        self._file.seek(0, os.SEEK_END)
+        self.offset = self.base + complete
+
+    def entries(self, since: int) -> list[Entry]:
+        """The entries written at or after offset `since`."""
+        if since >= self.offset:
+            return []
+        self._file.seek(self._header + max(0, since - self.base))
+        lines = self._file.read().splitlines()
+        self._file.seek(0, os.SEEK_END)
+        return [tuple(json.loads(line)) for line in lines]
+
+    def append(self, entries: Sequence[Entry]):
+        data = "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        ).encode()
+        self._file.write(data)
+        self._file.flush()
+        self.offset += len(data)
+
+    def compact(self, upto: int):
+        """Drops the entries before offset `upto`."""
+        self._file.seek(self._header + max(0, upto - self.base))
+        tail = self._file.read()
+        self._file.close()
+        self._rewrite(upto, tail)
+        self._open()
+
+    def close(self):
+        self._file.close()
+
+    def _rewrite(self, base: int, tail: bytes):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as journal:
+            journal.write(json.dumps({"base": base}).encode() + b"\n" + tail)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class AccountingListener:
+    """
+    Keeps running payment and refund totals per currency, processor and time bucket.
+
+    Each `PaymentEvent` or `RefundEvent` updates the totals incrementally;
+    other events are ignored. The state is published as an immutable
+    `AccountingSnapshot` after every update (once per batch when delivered
+    by an `EventBus`), so `snapshot()` is a single attribute read.
+
+    Refunds are attributed to the currency and processor of the original
+    payment when it was seen recently (`max_tracked` payments are
+    remembered), otherwise to `UNKNOWN`. Only the latest `max_buckets` time
+    buckets are kept.
+
+    With `checkpoint_path` every applied event is also appended to a
+    journal (`<checkpoint_path>.journal`, flushed per batch), and the
+    snapshot is written to the checkpoint as JSON (atomically, through a
+    temporary file) at most every `checkpoint_interval` seconds, on
+    `checkpoint()` and on `close()`. The checkpoint records the journal
+    offset it covers and the payments remembered for refund attribution; on
+    start the listener restores it and replays the journal from that offset,
+    so totals survive a crash. The journal is compacted after each
+    checkpoint. With `checkpoint_on_exit` the listener is closed from an
+    `atexit` hook. Events still queued in an EventBus when the process dies
+    never reach the listener and are not recovered.
+    """
+
+    bucket_seconds: int = 3600
+    max_buckets: int = 24 * 90
+    max_tracked: int = 100_000
+    checkpoint_path: Optional[str] = None
+    checkpoint_interval: float = 60.0
+    checkpoint_on_exit: bool = True
+    clock: Callable[[], float] = time.monotonic
+
+    _snapshot: AccountingSnapshot = field(
+        default_factory=AccountingSnapshot, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        if self.bucket_seconds <= 0 or self.max_buckets < 1:
+            raise ValueError("bucket_seconds and max_buckets must be positive")
+        self._payments = TTLCache(maxsize=self.max_tracked, ttl=float("inf"))
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._last_checkpoint = self.clock()
+        self._journal: Optional[_Journal] = None
+        self._closed = False
+        if self.checkpoint_path:
+            self._restore()
+            if self.checkpoint_on_exit:
+                atexit.register(self.close)
+
+    def snapshot(self) -> AccountingSnapshot:
+        return self._snapshot
+
+    def notify(self, event: Any):
+        self.notify_batch((event,))
+
+    def notify_batch(self, events: Sequence[Any]):
+        entries = [entry for entry in map(self._entry, events) if entry]
+        if not entries:
+            return
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("accounting listener is closed")
+            if self._journal is not None:
+                self._journal.append(entries)
+            self._snapshot = self._apply(self._snapshot, entries)
+            due = (
+                self.checkpoint_path
+                and self.clock() - self._last_checkpoint >= self.checkpoint_interval
+            )
+        if due:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Writes the current snapshot to `checkpoint_path` and compacts the journal."""
+        if not self.checkpoint_path:
+            raise ValueError("checkpoint_path is not configured")
+        with self._checkpoint_lock:
+            with self._lock:
+                if self._journal is None:
+                    raise RuntimeError("accounting listener is closed")
+                self._last_checkpoint = self.clock()
+                offset = self._journal.offset
+                state = {
+                    **self._snapshot.to_dict(),
+                    "journal_offset": offset,
+                    "payments": self._payments.items(),
+                }
+            tmp_path = f"{self.checkpoint_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as checkpoint:
+                json.dump(state, checkpoint)
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+            os.replace(tmp_path, self.checkpoint_path)
+            with self._lock:
+                self._journal.compact(offset)
+
+    def close(self):
+        """Writes a final checkpoint and closes the journal."""
+        if self._closed:
+            return
+        if self._journal is not None:
+            self.checkpoint()
+        with self._checkpoint_lock, self._lock:
+            self._closed = True
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        if self.checkpoint_path and self.checkpoint_on_exit:
+            atexit.unregister(self.close)
+
+    def _restore(self):
+        offset = 0
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as checkpoint:
+                state = json.load(checkpoint)
+            self._snapshot = AccountingSnapshot.from_dict(state)
+            for transaction_id, attribution in state.get("payments", []):
+                self._payments.set(transaction_id, tuple(attribution))
+            offset = state.get("journal_offset", 0)
+        self._journal = _Journal(f"{self.checkpoint_path}.journal", offset)
+        replayed = self._journal.entries(since=offset)
+        if replayed:
+            self._snapshot = self._apply(self._snapshot, replayed)
+
+    @staticmethod
+    def _entry(event: Any) -> Optional[Entry]:
+        if isinstance(event, PaymentEvent):
+            return (
+                "payment",
+                event.timestamp,
+                event.response.transaction_id,
+                event.payment.currency,
+                event.processor,
+                event.payment.amount,
+                event.succeeded,
+            )
+        if isinstance(event, RefundEvent) and event.succeeded:
+            return (
+                "refund",
+                event.timestamp,
+                event.transaction_id,
+                event.response.amount,
+            )
+        return None
+
+    def _apply(
+        self, snapshot: AccountingSnapshot, entries: Sequence[Entry]
+    ) -> AccountingSnapshot:
+        totals = snapshot.totals
+        by_currency = dict(snapshot.by_currency)
+        by_processor = dict(snapshot.by_processor)
+        closed = snapshot.closed_buckets
+        current = snapshot.current_bucket
+        last_timestamp = snapshot.last_timestamp
+
+        for entry in entries:
+            if entry[0] == "payment":
+                _, timestamp, transaction_id, currency, processor, amount, succeeded = entry
+                if succeeded and transaction_id:
+                    self._payments.set(transaction_id, (currency, processor))
+                update = partial(Totals.add_payment, amount=amount, succeeded=succeeded)
+            else:
+                _, timestamp, transaction_id, amount = entry
+                currency, processor = self._payments.get(
+                    transaction_id, (UNKNOWN, UNKNOWN)
+                )
+                update = partial(Totals.add_refund, amount=amount)
+
+            totals = update(totals)
+            by_currency[currency] = update(by_currency.get(currency, Totals()))
+            by_processor[processor] = update(by_processor.get(processor, Totals()))
+            last_timestamp = max(last_timestamp, timestamp)
+
+            start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+            if current is None or start == current[0]:
+                current = (start, update(current[1] if current else Totals()))
+            elif start > current[0]:
+                closed = self._close_bucket(closed, current)
+                current = (start, update(Totals()))
+            else:
+                # A late event for an older bucket: copy the closed buckets.
+                closed = MappingProxyType(
+                    {**closed, start: update(closed.get(start, Totals()))}
+                )
+
+        return AccountingSnapshot(
+            totals=totals,
+            by_currency=MappingProxyType(by_currency),
+            by_processor=MappingProxyType(by_processor),
+            closed_buckets=closed,
+            current_bucket=current,
+            events=snapshot.events + len(entries),
+            last_timestamp=last_timestamp,
+        )
+
+    def _close_bucket(
+        self, closed: Mapping[int, Totals], bucket: tuple[int, Totals]
+    ) -> Mapping[int, Totals]:
+        buckets = {**closed, bucket[0]: bucket[1]}
+        for start in sorted(buckets)[: max(0, len(buckets) - self.max_buckets + 1)]:
+            del buckets[start]
+        return MappingProxyType(buckets)
@@ -0,0 +1,5 @@
+from typing import Protocol
+
+
+class AsyncListener[T](Protocol):
+    async def notify(self, event: T): ...
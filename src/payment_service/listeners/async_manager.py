@@ -0,0 +1,18 @@
+import asyncio
+from typing import Optional
+
+from .async_listener import AsyncListener
+from .manager import Subscriptions
+from .topics import EventTopic
+
+
+class AsyncListenersManager[T](Subscriptions[AsyncListener]):
+    """Awaits the listeners subscribed to an event's topic concurrently."""
+
+    async def notify_all(self, event: T, topic: Optional[EventTopic] = None):
+        """Delivers `event` to `topic` subscribers; `topic` defaults to `event.topic`."""
+        if topic is None:
+            topic = getattr(event, "topic", None)
+        await asyncio.gather(
+            *(listener.notify(event) for listener in self.subscribers(topic))
+        )
@@ -0,0 +1,232 @@
+import atexit
+import os
+import pickle
+import tempfile
+import threading
+from collections import deque
+from enum import Enum
+from typing import Iterable, Optional
+
+from .listener import Listener
+from .manager import ListenersManager
+from .topics import EventTopic
+
+
+class BackpressurePolicy(Enum):
+    """What `EventBus.notify_all` does when the queue is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+class EventBus[T](ListenersManager[T]):
+    """
+    Listeners manager that delivers events from background dispatch workers.
+
+    `notify_all` only enqueues the event, so a slow listener no longer delays
+    the payment that produced it. Up to `maxsize` events are held in memory;
+    beyond that `policy` decides whether the publisher blocks, the oldest
+    queued event is dropped, or events are spilled to a file (pickled, so
+    they must be picklable) and read back once the queue drains.
+
+    Each worker takes up to `batch_size` queued events at a time and hands
+    every listener the ones of the topics it subscribed to. Listeners with a
+    `notify_batch` method get them in one call; the rest get one `notify`
+    per event. With one worker events are delivered in order.
+
+    `flush` waits until every published event has been delivered, and
+    `close` stops accepting events, drains the queue and joins the workers.
+    With `drain_on_exit` it is also closed from an `atexit` hook.
+    """
+
+    def __init__(
+        self,
+        listeners: Iterable[Listener] = (),
+        maxsize: int = 10_000,
+        workers: int = 1,
+        batch_size: int = 100,
+        policy: BackpressurePolicy = BackpressurePolicy.BLOCK,
+        spill_path: Optional[str] = None,
+        drain_on_exit: bool = True,
+    ):
+        if workers < 1 or batch_size < 1 or maxsize < 1:
+            raise ValueError("maxsize, workers and batch_size must be at least 1")
+        super().__init__(listeners)
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.policy = policy
+        self.spill_path = spill_path
+        self.drain_on_exit = drain_on_exit
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+        self._events: deque = deque()
+        self._pending = 0
+        self._closed = False
+        self._stopping = False
+        self._changed = threading.Condition()
+        self._spill_file = None
+        self._spill_read = 0
+        self._spill_count = 0
+        self._running = self.workers
+        self._threads = [
+            threading.Thread(target=self._run, name=f"event-bus-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        if self.drain_on_exit:
+            atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        """Events published but not yet delivered, spilled ones included."""
+        return self._pending
+
+    def notify_all(self, event: T, topic: Optional[EventTopic] = None):
+        if topic is None:
+            topic = getattr(event, "topic", None)
+        event = (topic, event)
+        with self._changed:
+            if self._closed:
+                raise RuntimeError("event bus is closed")
+            if self.policy is BackpressurePolicy.SPILL and self._spill_count:
+                # Keep FIFO order: once events are on disk, new ones follow them.
+                self._spill(event)
+            elif len(self._events) < self.maxsize:
+                self._events.append(event)
+            elif self.policy is BackpressurePolicy.BLOCK:
+                self._changed.wait_for(
+                    lambda: len(self._events) < self.maxsize or self._closed
+                )
+                if self._closed:
+                    raise RuntimeError("event bus is closed")
+                self._events.append(event)
+            elif self.policy is BackpressurePolicy.DROP_OLDEST:
+                self._events.popleft()
+                self._events.append(event)
+                self.dropped += 1
+                self._pending -= 1
+            else:
+                self._spill(event)
+            self._pending += 1
+            self._changed.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every published event to be delivered. Returns False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stops accepting events, delivers what is queued and stops the workers."""
+        with self._changed:
+            if self._closed:
+                return self._pending == 0
+            self._closed = True
+            self._changed.notify_all()
+        drained = self.flush(timeout)
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._changed:
+            self._close_spill()
+        if self.drain_on_exit:
+            atexit.unregister(self.close)
+        return drained
+
+    def _spill(self, event: tuple[Optional[EventTopic], T]):
+        if self._spill_file is None:
+            if self.spill_path:
+                self._spill_file = open(self.spill_path, "w+b")
+            else:
+                self._spill_file = tempfile.TemporaryFile(prefix="event-bus-")
+        self._spill_file.seek(0, os.SEEK_END)
+        pickle.dump(event, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill_count += 1
+        self.spilled += 1
+
+    def _unspill(self):
+        """
+        Moves up to `maxsize` spilled events back into memory (lock held).
+
+        If the file cannot be read back, the events still in it are counted
+        as failed, so `flush` does not wait for them forever.
+        """
+        try:
+            self._spill_file.seek(self._spill_read)
+            while self._spill_count and len(self._events) < self.maxsize:
+                self._events.append(pickle.load(self._spill_file))
+                self._spill_count -= 1
+            self._spill_read = self._spill_file.tell()
+        except Exception as e:
+            print(f"Could not read {self._spill_count} spilled events: {e}")
+            self.failed += self._spill_count
+            self._pending -= self._spill_count
+            self._spill_count = 0
+            self._changed.notify_all()
+        if not self._spill_count:
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._spill_read = 0
+
+    def _close_spill(self):
+        """Closes the spill file once every worker has exited (lock held)."""
+        if self._running == 0 and self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _next_batch(self) -> Optional[list[tuple[Optional[EventTopic], T]]]:
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._events or self._spill_count or self._stopping
+            )
+            if not self._events and self._spill_count:
+                self._unspill()
+            if not self._events:
+                return None
+            events = self._events
+            batch = [events.popleft() for _ in range(min(self.batch_size, len(events)))]
+            self._changed.notify_all()
+            return batch
+
+    def _run(self):
+        try:
+            while (batch := self._next_batch()) is not None:
+                deliveries: dict[int, tuple[object, list[T]]] = {}
+                for topic, event in batch:
+                    for listener in self.subscribers(topic):
+                        deliveries.setdefault(id(listener), (listener, []))[1].append(event)
+                failed = sum(
+                    self._deliver(listener, events)
+                    for listener, events in deliveries.values()
+                )
+                with self._changed:
+                    self.failed += failed
+                    self._pending -= len(batch)
+                    self._changed.notify_all()
+        finally:
+            # close() may have given up waiting for this worker; the last
+            # one out closes the spill file instead.
+            with self._changed:
+                self._running -= 1
+                self._close_spill()
+
+    @staticmethod
+    def _deliver(listener, events: list[T]) -> int:
+        """Delivers `events` to one listener and returns the number of failed calls."""
+        if hasattr(listener, "notify_batch"):
+            calls = [(listener.notify_batch, events)]
+        else:
+            calls = [(listener.notify, event) for event in events]
+        failed = 0
+        for notify, argument in calls:
+            try:
+                notify(argument)
+            except Exception as e:
+                print(f"Listener {type(listener).__name__} failed: {e}")
+                failed += 1
+        return failed
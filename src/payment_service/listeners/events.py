@@ -0,0 +1,108 @@
+import time
+from typing import Optional
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+from .topics import EventTopic
+
+
+class PaymentEvent:
+    """
+    A processed payment, as published to listeners.
+
+    Holds references to the objects the service already has instead of a
+    formatted message; `str(event)` renders the text on demand. `timestamp`
+    is the wall-clock time the processor answered and `elapsed` the seconds
+    the processor call took.
+    """
+
+    __slots__ = (
+        "topic",
+        "response",
+        "customer",
+        "payment",
+        "processor",
+        "timestamp",
+        "elapsed",
+    )
+
+    def __init__(
+        self,
+        response: PaymentResponse,
+        customer: CustomerData,
+        payment: PaymentData,
+        processor: str,
+        elapsed: float = 0.0,
+        timestamp: Optional[float] = None,
+    ):
+        self.topic = EventTopic.for_payment(response)
+        self.response = response
+        self.customer = customer
+        self.payment = payment
+        self.processor = processor
+        self.elapsed = elapsed
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def succeeded(self) -> bool:
+        return self.topic is EventTopic.PAYMENT_SUCCEEDED
+
+    @property
+    def transaction_id(self) -> Optional[str]:
+        return self.response.transaction_id
+
+    @property
+    def amount(self) -> int:
+        return self.payment.amount
+
+    @property
+    def currency(self) -> str:
+        return self.payment.currency
+
+    def __str__(self) -> str:
+        if self.succeeded:
+            return f"Pago procesado al: {self.response.transaction_id}"
+        return f"Pago denegado: {self.response.message}"
+
+    def __repr__(self) -> str:
+        return (
+            f"PaymentEvent(topic={self.topic.value}, "
+            f"transaction_id={self.transaction_id!r}, amount={self.amount}, "
+            f"currency={self.currency!r}, processor={self.processor!r})"
+        )
+
+
+class RefundEvent:
+    """A processed refund, as published to listeners."""
+
+    __slots__ = ("topic", "transaction_id", "response", "timestamp")
+
+    def __init__(
+        self,
+        transaction_id: str,
+        response: PaymentResponse,
+        timestamp: Optional[float] = None,
+    ):
+        self.topic = EventTopic.for_refund(response)
+        self.transaction_id = transaction_id
+        self.response = response
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def succeeded(self) -> bool:
+        return self.topic is EventTopic.REFUND_SUCCEEDED
+
+    @property
+    def amount(self) -> int:
+        return self.response.amount
+
+    def __str__(self) -> str:
+        if self.succeeded:
+            return f"Reembolso procesado: {self.transaction_id}"
+        return f"Reembolso fallido: {self.transaction_id}"
+
+    def __repr__(self) -> str:
+        return (
+            f"RefundEvent(topic={self.topic.value}, "
+            f"transaction_id={self.transaction_id!r}, amount={self.amount})"
+        )
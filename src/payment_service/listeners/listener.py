@@ -1,5 +1,11 @@
-from typing import Protocol
+from typing import Protocol, Sequence
 
 
 class Listener[T](Protocol):
-    def notify(self, event: T): ...
\ No newline at end of file
+    def notify(self, event: T): ...
+
+
+class BatchListener[T](Listener[T], Protocol):
+    """Listener that can take several events in one call from an `EventBus`."""
+
+    def notify_batch(self, events: Sequence[T]): ...
@@ -1,15 +1,123 @@
+import threading
+import weakref
+from typing import Iterable, Optional
+
 from .listener import Listener
-from dataclasses import dataclass, field
+from .topics import EventTopic
+
+ALL_TOPICS = None
+
+
+class Subscriptions[L]:
+    """
+    Topic-indexed listener subscriptions shared by the sync and async managers.
+
+    Subscriptions live in a topic -> {listener id: listener} index, so an
+    event only reaches the listeners of its topic plus those subscribed to
+    `ALL_TOPICS`, and `unsubcribe` is a dict pop per topic. The listeners of
+    each topic are cached as a tuple that is rebuilt only after the
+    subscriptions change. With `weak=True` the manager keeps a weak
+    reference and the listener is dropped once nothing else references it.
+
+    `listeners` is still accepted by the constructor and can be assigned:
+    both subscribe the given listeners to `ALL_TOPICS`, replacing the
+    current subscriptions. Reading it returns a snapshot, so mutating the
+    returned list does not subscribe anything.
+    """
+
+    def __init__(self, listeners: Iterable[L] = ()):
+        self._index: dict[Optional[EventTopic], dict[int, L | weakref.ref]] = {}
+        self._topics: dict[int, tuple[Optional[EventTopic], ...]] = {}
+        self._routes: dict[Optional[EventTopic], tuple] = {}
+        # Reentrant: a weak listener's callback can run while the lock is held.
+        self._lock = threading.RLock()
+        self.listeners = listeners
+
+    @property
+    def listeners(self) -> list[L]:
+        """Every live subscribed listener, once each."""
+        with self._lock:
+            entries = [
+                entry
+                for subscribers in self._index.values()
+                for entry in subscribers.values()
+            ]
+        return list({id(listener): listener for listener in _resolve(entries)}.values())
+
+    @listeners.setter
+    def listeners(self, listeners: Iterable[L]):
+        with self._lock:
+            self._index, self._topics, self._routes = {}, {}, {}
+            for listener in listeners:
+                self.subscribe(listener)
+
+    def subscribe(
+        self,
+        listener: L,
+        topics: Optional[Iterable[EventTopic]] = ALL_TOPICS,
+        weak: bool = False,
+    ):
+        """Subscribes `listener` to `topics`, or to every event when omitted."""
+        key = id(listener)
+        if weak:
+            entry = weakref.ref(listener, lambda _: self._remove(key))
+        else:
+            entry = listener
+        topics = (ALL_TOPICS,) if topics is ALL_TOPICS else tuple(topics)
+        with self._lock:
+            self._unsubscribe(key)
+            for topic in topics:
+                self._index.setdefault(topic, {})[key] = entry
+            self._topics[key] = topics
+            self._routes = {}
+
+    def unsubcribe(self, listener: L):
+        with self._lock:
+            if not self._unsubscribe(id(listener)):
+                raise ValueError(f"{listener!r} is not subscribed")
+            self._routes = {}
+
+    def subscribers(self, topic: Optional[EventTopic]) -> Iterable[L]:
+        """Listeners of `topic` plus those subscribed to every topic."""
+        routes = self._routes
+        entries = routes.get(topic)
+        if entries is None:
+            with self._lock:
+                by_key = dict(self._index.get(ALL_TOPICS, {}))
+                if topic is not ALL_TOPICS:
+                    by_key.update(self._index.get(topic, {}))
+                entries = self._routes[topic] = tuple(by_key.values())
+        return _resolve(entries)
+
+    def _unsubscribe(self, key: int) -> bool:
+        topics = self._topics.pop(key, None)
+        if topics is None:
+            return False
+        for topic in topics:
+            self._index[topic].pop(key, None)
+        return True
+
+    def _remove(self, key: int):
+        with self._lock:
+            self._unsubscribe(key)
+            self._routes = {}
+
 
-class ListenersManager[T]:
-    listeners = list[Listener] = field(default_factory=list)
+class ListenersManager[T](Subscriptions[Listener]):
+    """Delivers events to the listeners subscribed to their topic."""
 
-    def subscribe(self, listener: Listener):
-        self.listeners.append(listener)
+    def notify_all(self, event: T, topic: Optional[EventTopic] = None):
+        """Delivers `event` to `topic` subscribers; `topic` defaults to `event.topic`."""
+        if topic is None:
+            topic = getattr(event, "topic", None)
+        for listener in self.subscribers(topic):
+            listener.notify(event)
 
-    def unsubcribe(self, listener: Listener):
-        self.listeners.remove(listener)
 
-    def notify_all(self, event: T):
-        for listener in self.listeners:
-            listener.notify(event)
\ No newline at end of file
+def _resolve[L](entries: Iterable[L | weakref.ref]) -> Iterable[L]:
+    for entry in entries:
+        if type(entry) is weakref.ref:
+            entry = entry()
+            if entry is None:
+                continue
+        yield entry
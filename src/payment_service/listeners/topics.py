@@ -0,0 +1,25 @@
+from enum import Enum
+
+from payment_service.commons import PaymentResponse
+
+# Local processors answer "success", Stripe answers "succeeded".
+_SUCCESS_STATUSES = frozenset({"success", "succeeded"})
+
+
+class EventTopic(Enum):
+    PAYMENT_SUCCEEDED = "payment.succeeded"
+    PAYMENT_DENIED = "payment.denied"
+    REFUND_SUCCEEDED = "refund.succeeded"
+    REFUND_FAILED = "refund.failed"
+
+    @classmethod
+    def for_payment(cls, response: PaymentResponse) -> "EventTopic":
+        if response.status in _SUCCESS_STATUSES:
+            return cls.PAYMENT_SUCCEEDED
+        return cls.PAYMENT_DENIED
+
+    @classmethod
+    def for_refund(cls, response: PaymentResponse) -> "EventTopic":
+        if response.status in _SUCCESS_STATUSES:
+            return cls.REFUND_SUCCEEDED
+        return cls.REFUND_FAILED
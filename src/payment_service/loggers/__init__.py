@@ -1,3 +1,48 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .async_transaction import AsyncTransactionLogger, AsyncTransactionLoggerProtocol
+from .buffered import BufferedTransactionLogger
+from .formats import JsonLinesFormatter, RecordFormatter, TextFormatter
+from .group_commit import GroupCommitMetrics, GroupCommitTransactionLogger
+from .rotation import RotatingFile, RotationPolicy
 from .transaction import TransactionLogger
 
-__all__ = ["TransactionLogger"]
+if TYPE_CHECKING:
+    from .index import TransactionLogReader, build_index
+
+# The index module doubles as a CLI run with `python -m`, so it is only
+# imported when used.
+_LAZY_LOGGERS = {
+    "TransactionLogReader": ".index",
+    "build_index": ".index",
+}
+
+__all__ = [
+    "AsyncTransactionLogger",
+    "AsyncTransactionLoggerProtocol",
+    "BufferedTransactionLogger",
+    "GroupCommitMetrics",
+    "GroupCommitTransactionLogger",
+    "JsonLinesFormatter",
+    "RecordFormatter",
+    "RotatingFile",
+    "RotationPolicy",
+    "TextFormatter",
+    "TransactionLogReader",
+    "TransactionLogger",
+    "build_index",
+]
+
+
+def __getattr__(name: str):
+    module = _LAZY_LOGGERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
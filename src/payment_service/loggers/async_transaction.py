@@ -0,0 +1,54 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+from .transaction import TransactionLogger
+
+
+class AsyncTransactionLoggerProtocol(Protocol):
+    """Protocol for recording transactions without blocking the event loop."""
+
+    async def log_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+    ): ...
+
+    async def log_refund(
+        self, transaction_id: str, refund_response: PaymentResponse
+    ): ...
+
+
+@dataclass
+class AsyncTransactionLogger(AsyncTransactionLoggerProtocol):
+    """
+    Runs a `TransactionLogger` off the event loop.
+
+    Local file writes have no native asyncio API, so each write is handed
+    to the default executor instead of stalling every in-flight payment.
+    """
+
+    wrapped: TransactionLogger = field(default_factory=TransactionLogger)
+
+    async def log_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+    ):
+        await asyncio.to_thread(
+            self.wrapped.log_transaction,
+            customer_data,
+            payment_data,
+            payment_response,
+        )
+
+    async def log_refund(
+        self, transaction_id: str, refund_response: PaymentResponse
+    ):
+        await asyncio.to_thread(
+            self.wrapped.log_refund, transaction_id, refund_response
+        )
@@ -0,0 +1,101 @@
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .transaction import TransactionLogger
+
+
+@dataclass
+class BufferedTransactionLogger(TransactionLogger):
+    """
+    Transaction logger that keeps the log open and writes records in batches.
+
+    Records are formatted in memory and appended to a buffer; the buffer is
+    written with one call once it holds `max_buffer_size` characters, or
+    when the oldest buffered record is `flush_interval` seconds old (checked
+    on each write and by a background thread, so a quiet period does not
+    leave records behind). Set `flush_interval` to None to flush only on
+    size and explicitly.
+
+    Every record is added and written under a lock, so records from
+    concurrent threads never interleave. `flush` and `close` push what is
+    buffered; with `flush_on_exit` the logger is also closed from an
+    `atexit` hook, otherwise records still buffered at exit are lost. A
+    `rotation` policy applies per flushed batch.
+    """
+
+    max_buffer_size: int = 64 * 1024
+    flush_interval: Optional[float] = 1.0
+    flush_on_exit: bool = True
+    clock: Callable[[], float] = time.monotonic
+
+    def __post_init__(self):
+        if self.max_buffer_size < 1:
+            raise ValueError("max_buffer_size must be at least 1")
+        self._file = self._open()
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._oldest = 0.0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="log-flusher", daemon=True
+            )
+            self._flusher.start()
+        if self.flush_on_exit:
+            atexit.register(self.close)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            self._flush_locked()
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._closed.is_set():
+                return True
+            self._closed.set()
+            try:
+                self._flush_locked()
+            finally:
+                self._file.close()
+                if self.flush_on_exit:
+                    atexit.unregister(self.close)
+        if self._flusher is not None:
+            self._flusher.join(timeout)
+        return True
+
+    def _write(self, text: str):
+        with self._lock:
+            if self._closed.is_set():
+                raise RuntimeError("transaction logger is closed")
+            if not self._buffer:
+                self._oldest = self.clock()
+            self._buffer.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self.max_buffer_size or self._expired():
+                self._flush_locked()
+
+    def _expired(self) -> bool:
+        return (
+            self.flush_interval is not None
+            and self.clock() - self._oldest >= self.flush_interval
+        )
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+        self._buffered = 0
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._buffer and self._expired() and not self._closed.is_set():
+                    self._flush_locked()
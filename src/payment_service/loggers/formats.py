@@ -0,0 +1,93 @@
+import json
+from typing import Optional, Protocol
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class RecordFormatter(Protocol):
+    """Turns one transaction or refund into the text appended to the log."""
+
+    def format_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+        timestamp: float,
+    ) -> str: ...
+
+    def format_refund(
+        self, transaction_id: str, refund_response: PaymentResponse, timestamp: float
+    ) -> str: ...
+
+
+class TextFormatter(RecordFormatter):
+    """The original multi-line, human-readable records."""
+
+    def format_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+        timestamp: float,
+    ) -> str:
+        record = (
+            f"{customer_data.name} paid {payment_data.amount}\n"
+            f"Payment status: {payment_response.status}\n"
+        )
+        if payment_response.transaction_id:
+            record += f"Transaction ID: {payment_response.transaction_id}\n"
+        return record + f"Message: {payment_response.message}\n"
+
+    def format_refund(
+        self, transaction_id: str, refund_response: PaymentResponse, timestamp: float
+    ) -> str:
+        return (
+            f"Refund processed for transaction {transaction_id}\n"
+            f"Refund status: {refund_response.status}\n"
+            f"Message: {refund_response.message}\n"
+        )
+
+
+class JsonLinesFormatter(RecordFormatter):
+    """
+    One JSON object per line, with a `type` of "payment" or "refund" and
+    a `ts` in epoch seconds. This is the format `build_index` understands.
+    """
+
+    def format_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+        timestamp: float,
+    ) -> str:
+        return _line({
+            "type": "payment",
+            "ts": timestamp,
+            "transaction_id": payment_response.transaction_id,
+            "customer": customer_data.name,
+            "customer_id": customer_data.customer_id,
+            "email": customer_data.contact_info.email,
+            "phone": customer_data.contact_info.phone,
+            "amount": payment_data.amount,
+            "currency": payment_data.currency,
+            "status": payment_response.status,
+            "message": payment_response.message,
+        })
+
+    def format_refund(
+        self, transaction_id: str, refund_response: PaymentResponse, timestamp: float
+    ) -> str:
+        return _line({
+            "type": "refund",
+            "ts": timestamp,
+            "transaction_id": transaction_id,
+            "refund_id": refund_response.transaction_id,
+            "amount": refund_response.amount,
+            "status": refund_response.status,
+            "message": refund_response.message,
+        })
+
+
+def _line(record: dict[str, Optional[object]]) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
@@ -0,0 +1,167 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+from .transaction import TransactionLogger
+
+_sync = getattr(os, "fdatasync", os.fsync)
+
+
+class GroupCommitMetrics(NamedTuple):
+    commits: int
+    records: int
+    max_batch_size: int
+    mean_batch_size: float
+    mean_commit_seconds: float
+    mean_wait_seconds: float
+
+
+class _Batch:
+    __slots__ = ("records", "done", "error", "opened_at")
+
+    def __init__(self):
+        self.records: list[str] = []
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.opened_at = 0.0
+
+
+@dataclass
+class GroupCommitTransactionLogger(TransactionLogger):
+    """
+    Transaction logger whose writes return only once the record is on disk.
+
+    Callers append their record to the open batch and wait; a committer
+    thread writes the whole batch with one write and one fsync (fdatasync
+    where available) and then releases every caller in it. Records arriving
+    while a commit is in progress form the next batch, so the number of
+    fsyncs per second stays roughly constant as concurrency grows.
+
+    A batch is closed once it holds `max_batch` records, and committed when
+    the committer is free and either the batch is full or its first record
+    has waited `max_delay` seconds; with the default delay of 0 a batch is
+    committed as soon as the previous fsync finishes. With `max_batch=1`
+    this is plain per-record fsync. If the write fails, every caller of
+    that batch gets the error. `metrics()` reports batch sizes, fsync time
+    and the time callers waited. With `flush_on_exit` the logger is closed
+    from an `atexit` hook, so the open batch is committed before exit.
+    """
+
+    max_batch: int = 1000
+    max_delay: float = 0.0
+    flush_on_exit: bool = True
+
+    def __post_init__(self):
+        if self.max_batch < 1 or self.max_delay < 0:
+            raise ValueError("max_batch must be at least 1 and max_delay not negative")
+        self._file = self._open()
+        self._changed = threading.Condition()
+        self._batch = _Batch()
+        self._sealed: deque[_Batch] = deque()
+        self._tail: Optional[_Batch] = None
+        self._closed = False
+        self._commits = 0
+        self._records = 0
+        self._max_batch_size = 0
+        self._commit_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._committer = threading.Thread(
+            target=self._run, name="group-commit", daemon=True
+        )
+        self._committer.start()
+        if self.flush_on_exit:
+            atexit.register(self.close)
+
+    def metrics(self) -> GroupCommitMetrics:
+        with self._changed:
+            commits, records = self._commits, self._records
+            return GroupCommitMetrics(
+                commits=commits,
+                records=records,
+                max_batch_size=self._max_batch_size,
+                mean_batch_size=records / commits if commits else 0.0,
+                mean_commit_seconds=self._commit_seconds / commits if commits else 0.0,
+                mean_wait_seconds=self._wait_seconds / records if records else 0.0,
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every record written so far is on disk."""
+        batch = self._tail
+        return batch is None or batch.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        with self._changed:
+            if self._closed:
+                return True
+            self._closed = True
+            self._changed.notify_all()
+        self._committer.join(timeout)
+        if self._committer.is_alive():
+            return False
+        self._file.close()
+        if self.flush_on_exit:
+            atexit.unregister(self.close)
+        return True
+
+    def _write(self, text: str):
+        started = time.perf_counter()
+        with self._changed:
+            if self._closed:
+                raise RuntimeError("transaction logger is closed")
+            batch = self._batch
+            if not batch.records:
+                batch.opened_at = started
+            batch.records.append(text)
+            self._tail = batch
+            if len(batch.records) >= self.max_batch:
+                self._sealed.append(batch)
+                self._batch = _Batch()
+            self._changed.notify_all()
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        waited = time.perf_counter() - started
+        with self._changed:
+            self._wait_seconds += waited
+
+    def _next_batch(self) -> Optional[_Batch]:
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._sealed or self._batch.records or self._closed
+            )
+            if self._sealed:
+                return self._sealed.popleft()
+            batch = self._batch
+            if not batch.records:
+                return None
+            if self.max_delay and not self._closed:
+                deadline = batch.opened_at + self.max_delay
+                self._changed.wait_for(
+                    lambda: self._batch is not batch or self._closed,
+                    max(0.0, deadline - time.perf_counter()),
+                )
+                if self._sealed:
+                    return self._sealed.popleft()
+            self._batch = _Batch()
+            return batch
+
+    def _run(self):
+        while (batch := self._next_batch()) is not None:
+            started = time.perf_counter()
+            try:
+                self._file.write("".join(batch.records))
+                self._file.flush()
+                _sync(self._file.fileno())
+            except BaseException as e:
+                batch.error = e
+            elapsed = time.perf_counter() - started
+            with self._changed:
+                self._commits += 1
+                self._records += len(batch.records)
+                self._max_batch_size = max(self._max_batch_size, len(batch.records))
+                self._commit_seconds += elapsed
+            batch.done.set()
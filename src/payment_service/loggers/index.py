@@ -0,0 +1,325 @@
+"""
+Sidecar indexes for JSON-lines transaction logs.
+
+`build_index` scans a log written with `JsonLinesFormatter` and writes one
+sorted file of fixed-width (key, offset) entries per lookup kind next to it:
+transaction id, customer (id, email, phone or name) and timestamp.
+`TransactionLogReader` memory-maps the logs and their indexes and answers
+lookups with a binary search instead of a scan of the whole log:
+
+    python -m payment_service.loggers.index build transactions.log
+    python -m payment_service.loggers.index query transactions.log --transaction-id ch_123
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+_MAGIC = b"PSLOGIX1"
+# magic, log bytes covered by the index, entries
+_HEADER = struct.Struct(">8sQQ")
+# key (hash of the value, or timestamp in microseconds), record offset
+_ENTRY = struct.Struct(">QQ")
+
+INDEX_KINDS = ("transaction", "customer", "time")
+
+
+def index_path(log_path: str | os.PathLike, kind: str) -> str:
+    return f"{os.fspath(log_path)}.{kind}.idx"
+
+
+def _hash_key(value: str) -> int:
+    digest = blake2b(value.strip().lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _time_key(timestamp: float) -> int:
+    return max(0, int(timestamp * 1_000_000))
+
+
+def _customer_values(record: dict[str, Any]) -> set[str]:
+    if record.get("type") != "payment":
+        return set()
+    fields = ("customer_id", "email", "phone", "customer")
+    return {record[name].strip().lower() for name in fields if record.get(name)}
+
+
+def _entries(record: dict[str, Any]) -> Iterator[tuple[str, int]]:
+    if record.get("transaction_id"):
+        yield "transaction", _hash_key(record["transaction_id"])
+    for value in _customer_values(record):
+        yield "customer", _hash_key(value)
+    if isinstance(record.get("ts"), (int, float)):
+        yield "time", _time_key(record["ts"])
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _records(data: mmap.mmap, start: int, end: int) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yields (offset, record) for the complete JSON lines in [start, end)."""
+    offset = start
+    while offset < end:
+        newline = data.find(b"\n", offset, end)
+        if newline < 0:
+            return
+        try:
+            record = json.loads(data[offset:newline])
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            yield offset, record
+        offset = newline + 1
+
+
+def _complete_length(data: Optional[mmap.mmap]) -> int:
+    """Length of the log up to its last complete line."""
+    if data is None:
+        return 0
+    return data.rfind(b"\n") + 1
+
+
+class _Index(Sequence[int]):
+    """Sorted keys of one index file, read straight from the mmap."""
+
+    def __init__(self, path: str):
+        self._data = _map(path)
+        if self._data is None or self._data[:8] != _MAGIC:
+            raise ValueError(f"{path} is not a transaction log index")
+        _, self.indexed_bytes, self._length = _HEADER.unpack_from(self._data)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int) -> int:
+        return _ENTRY.unpack_from(self._data, _HEADER.size + position * _ENTRY.size)[0]
+
+    def offset(self, position: int) -> int:
+        return _ENTRY.unpack_from(self._data, _HEADER.size + position * _ENTRY.size)[1]
+
+    def entries(self) -> Iterator[tuple[int, int]]:
+        return _ENTRY.iter_unpack(memoryview(self._data)[_HEADER.size:])
+
+    def range(self, low: int, high: int) -> Iterator[int]:
+        """Offsets of the entries with low <= key <= high, in key order."""
+        position = bisect.bisect_left(self, low)
+        while position < self._length and self[position] <= high:
+            yield self.offset(position)
+            position += 1
+
+    def close(self):
+        self._data.close()
+
+
+def build_index(log_path: str | os.PathLike) -> int:
+    """
+    Creates or extends the sidecar indexes of `log_path`.
+
+    Only the part of the log written since the last build is parsed; its
+    entries are merged into the existing sorted files. Returns the number
+    of records indexed by this call.
+    """
+    log_path = os.fspath(log_path)
+    data = _map(log_path)
+    try:
+        end = _complete_length(data)
+        existing: dict[str, _Index] = {}
+        for kind in INDEX_KINDS:
+            try:
+                existing[kind] = _Index(index_path(log_path, kind))
+            except (OSError, ValueError):
+                pass
+        covered = {index.indexed_bytes for index in existing.values()}
+        if len(existing) != len(INDEX_KINDS) or len(covered) != 1 or covered.pop() > end:
+            for index in existing.values():
+                index.close()
+            existing, start = {}, 0
+        else:
+            start = existing["time"].indexed_bytes
+
+        new: dict[str, list[tuple[int, int]]] = {kind: [] for kind in INDEX_KINDS}
+        records = 0
+        if data is not None:
+            for offset, record in _records(data, start, end):
+                records += 1
+                for kind, key in _entries(record):
+                    new[kind].append((key, offset))
+
+        for kind in INDEX_KINDS:
+            entries = sorted(new[kind])
+            old = existing.get(kind)
+            merged = heapq.merge(old.entries(), entries) if old else iter(entries)
+            _write_index(index_path(log_path, kind), end, len(entries) + (len(old) if old else 0), merged)
+            if old:
+                old.close()
+        return records
+    finally:
+        if data is not None:
+            data.close()
+
+
+def _write_index(path: str, indexed_bytes: int, count: int, entries: Iterable[tuple[int, int]]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, indexed_bytes, count))
+        pack = _ENTRY.pack
+        file.write(b"".join(pack(key, offset) for key, offset in entries))
+    os.replace(tmp_path, path)
+
+
+class _Segment:
+    def __init__(self, path: str):
+        self.path = path
+        self.data = _map(path)
+        self.end = _complete_length(self.data)
+        self.indexes: dict[str, _Index] = {}
+        for kind in INDEX_KINDS:
+            try:
+                self.indexes[kind] = _Index(index_path(path, kind))
+            except (OSError, ValueError):
+                pass
+        covered = {index.indexed_bytes for index in self.indexes.values()}
+        if len(self.indexes) == len(INDEX_KINDS) and len(covered) == 1:
+            self.indexed_bytes = min(covered.pop(), self.end)
+        else:
+            self.close_indexes()
+            self.indexed_bytes = 0
+
+    def record(self, offset: int) -> dict[str, Any]:
+        return json.loads(self.data[offset:self.data.find(b"\n", offset)])
+
+    def lookup(self, kind: str, low: int, high: int) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Indexed records with keys in [low, high], then the unindexed tail."""
+        if self.data is None:
+            return
+        index = self.indexes.get(kind)
+        if index is not None:
+            for offset in index.range(low, high):
+                yield offset, self.record(offset)
+        for offset, record in _records(self.data, self.indexed_bytes, self.end):
+            if any(k == kind and low <= key <= high for k, key in _entries(record)):
+                yield offset, record
+
+    def close_indexes(self):
+        for index in self.indexes.values():
+            index.close()
+        self.indexes = {}
+
+    def close(self):
+        self.close_indexes()
+        if self.data is not None:
+            self.data.close()
+
+
+class TransactionLogReader:
+    """
+    Query API over one or more JSON-lines logs (for example rotated segments).
+
+    Each log and its sidecar indexes are memory-mapped as of opening, so a
+    lookup is a binary search per segment. Records appended after the last
+    `build_index` are found by scanning only that unindexed tail.
+    """
+
+    def __init__(self, log_paths: str | os.PathLike | Sequence[str | os.PathLike]):
+        if isinstance(log_paths, (str, os.PathLike)):
+            log_paths = [log_paths]
+        self.segments = [_Segment(os.fspath(path)) for path in log_paths]
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+    def __enter__(self) -> "TransactionLogReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def find_transaction(self, transaction_id: str) -> list[dict[str, Any]]:
+        """The payment and refund records of `transaction_id`."""
+        key = _hash_key(transaction_id)
+        return [
+            record
+            for segment in self.segments
+            for _, record in segment.lookup("transaction", key, key)
+            if record.get("transaction_id") == transaction_id
+        ]
+
+    def find_customer(self, customer: str) -> list[dict[str, Any]]:
+        """Payments whose customer id, email, phone or name is `customer`."""
+        value = customer.strip().lower()
+        key = _hash_key(value)
+        return [
+            record
+            for segment in self.segments
+            for _, record in segment.lookup("customer", key, key)
+            if value in _customer_values(record)
+        ]
+
+    def between(
+        self, since: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Records with since <= ts <= until across every segment, oldest first."""
+        low = _time_key(since) if since is not None else 0
+        high = _time_key(until) if until is not None else 2**64 - 1
+        per_segment = [
+            sorted(
+                (record for _, record in segment.lookup("time", low, high)),
+                key=lambda record: record["ts"],
+            )
+            for segment in self.segments
+        ]
+        return heapq.merge(*per_segment, key=lambda record: record["ts"])
+
+
+def _timestamp(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query transaction logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="create or extend the sidecar indexes")
+    build.add_argument("logs", nargs="+")
+    query = commands.add_parser("query", help="print matching records as JSON lines")
+    query.add_argument("logs", nargs="+")
+    lookup = query.add_mutually_exclusive_group(required=True)
+    lookup.add_argument("--transaction-id")
+    lookup.add_argument("--customer", help="customer id, email, phone or name")
+    lookup.add_argument("--since", type=_timestamp, help="epoch seconds or ISO 8601")
+    query.add_argument("--until", type=_timestamp, help="epoch seconds or ISO 8601")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for log in args.logs:
+            print(f"{log}: indexed {build_index(log)} new records")
+        return
+
+    with TransactionLogReader(args.logs) as reader:
+        if args.transaction_id:
+            records = reader.find_transaction(args.transaction_id)
+        elif args.customer:
+            records = reader.find_customer(args.customer)
+        else:
+            records = reader.between(args.since, args.until)
+        for record in records:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import glob
+import gzip
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+_INDEX_SUFFIXES = (".transaction.idx", ".customer.idx", ".time.idx")
+
+
+@dataclass
+class RotationPolicy:
+    """
+    When the active log is rotated and how many closed segments are kept.
+
+    The log is rotated before a write that would take it past `max_bytes`,
+    or once it has been open for `interval` seconds. Closed segments are
+    gzip-compressed when `compress` is set, and the oldest are deleted
+    beyond `max_segments` or once older than `max_age` seconds.
+
+    Compression is off by default: a compressed segment loses its sidecar
+    indexes and can no longer be queried with `TransactionLogReader`.
+    """
+
+    max_bytes: Optional[int] = 100 * 1024 * 1024
+    interval: Optional[float] = None
+    max_segments: Optional[int] = 30
+    max_age: Optional[float] = None
+    compress: bool = False
+
+    def __post_init__(self):
+        if self.max_bytes is None and self.interval is None:
+            raise ValueError("A rotation policy needs max_bytes or interval")
+
+
+class RotatingFile:
+    """
+    Append-only text file that rotates into numbered segments.
+
+    The active file keeps its name; on rotation it is renamed to
+    `<path>.000001`, `<path>.000002`, ... (higher is newer, so existing
+    segments are never renamed), together with any sidecar indexes built
+    for it. Compression and pruning run on a background thread, so a write
+    that triggers a rotation only pays for a rename and an open.
+    Compressed segments can no longer be read by `TransactionLogReader`;
+    their indexes are dropped. Work interrupted by an exit (a partial
+    `.gz.tmp`, a segment left uncompressed) is cleaned up and queued again
+    when the file is next opened.
+
+    Each `write` is atomic with respect to rotation: a record never spans
+    two segments.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        policy: RotationPolicy,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = os.fspath(path)
+        self.policy = policy
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._pattern = re.compile(re.escape(os.path.basename(self.path)) + r"\.(\d{6,})(\.gz)?$")
+        self._sequence = max((number for number, _ in self._segments()), default=0)
+        self._file = open(self.path, "a")
+        self._size = self._file.tell()
+        self._opened_at = self.clock()
+        self.rotations = 0
+        self._jobs: queue.Queue[Optional[str]] = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="log-compressor", daemon=True
+        )
+        self._worker.start()
+        self._resume()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            if self._size and self._due(len(text)):
+                self.rotate()
+            written = self._file.write(text)
+            self._size += len(text) if text.isascii() else len(text.encode())
+            return written
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def rotate(self):
+        """Closes the active file as the next numbered segment and reopens it."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._sequence += 1
+            segment = f"{self.path}.{self._sequence:06d}"
+            os.replace(self.path, segment)
+            for suffix in _INDEX_SUFFIXES:
+                if os.path.exists(self.path + suffix):
+                    os.replace(self.path + suffix, segment + suffix)
+            self._file = open(self.path, "a")
+            self._size = 0
+            self._opened_at = self.clock()
+            self.rotations += 1
+        self._jobs.put(segment)
+
+    def close(self, wait: bool = True):
+        """Closes the active file; with `wait`, finishes pending compression first."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self._jobs.put(None)
+        if wait:
+            self._worker.join()
+
+    def segments(self) -> list[str]:
+        """Closed segments, oldest first."""
+        return [path for _, path in self._segments()]
+
+    def _due(self, incoming: int) -> bool:
+        policy = self.policy
+        if policy.max_bytes is not None and self._size + incoming > policy.max_bytes:
+            return True
+        return policy.interval is not None and self.clock() - self._opened_at >= policy.interval
+
+    def _segments(self) -> list[tuple[int, str]]:
+        found = []
+        for path in glob.glob(glob.escape(self.path) + ".*"):
+            match = self._pattern.match(os.path.basename(path))
+            if match:
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def _resume(self):
+        """Discards partial compressions and queues segments left uncompressed."""
+        for leftover in glob.glob(glob.escape(self.path) + ".*.gz.tmp"):
+            os.remove(leftover)
+        if self.policy.compress:
+            for _, segment in self._segments():
+                if not segment.endswith(".gz"):
+                    self._jobs.put(segment)
+
+    def _run(self):
+        while (segment := self._jobs.get()) is not None:
+            try:
+                if self.policy.compress:
+                    self._compress(segment)
+                self._prune()
+            except OSError as e:
+                print(f"Log segment maintenance failed for {segment}: {e}")
+
+    def _compress(self, segment: str):
+        tmp_path = f"{segment}.gz.tmp"
+        with open(segment, "rb") as source, gzip.open(tmp_path, "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(tmp_path, f"{segment}.gz")
+        shutil.copystat(segment, f"{segment}.gz")
+        os.remove(segment)
+        self._remove_indexes(segment)
+
+    def _prune(self):
+        segments = self._segments()
+        expired = []
+        if self.policy.max_segments is not None:
+            excess = len(segments) - self.policy.max_segments
+            expired += segments[: max(0, excess)]
+        if self.policy.max_age is not None:
+            cutoff = self.clock() - self.policy.max_age
+            expired += [
+                (number, path)
+                for number, path in segments
+                if os.path.getmtime(path) < cutoff
+            ]
+        for _, path in set(expired):
+            os.remove(path)
+            self._remove_indexes(path)
+
+    @staticmethod
+    def _remove_indexes(segment: str):
+        for suffix in _INDEX_SUFFIXES:
+            if os.path.exists(segment + suffix):
+                os.remove(segment + suffix)
@@ -1,30 +1,96 @@
+import atexit
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
 from payment_service.commons import CustomerData, PaymentData, PaymentResponse
 
+from .formats import RecordFormatter, TextFormatter
+from .rotation import RotatingFile, RotationPolicy
+
 
+@dataclass
 class TransactionLogger:
+    """
+    Appends transaction and refund records to `path`.
+
+    Each record is built in memory by `formatter` and written with a single
+    call, opening the file per write. With a `rotation` policy the log is
+    kept open instead, rotated into numbered segments and closed from an
+    `atexit` hook, so pending segment compression finishes. Subclasses change
+    how records reach the file by overriding `_write`, and open it with
+    `_open`.
+    """
+
+    path: str = "transactions.log"
+    formatter: RecordFormatter = field(default_factory=TextFormatter)
+    rotation: Optional[RotationPolicy] = None
+
+    def __post_init__(self):
+        self._file = None
+        if self.rotation:
+            self._file = self._open()
+            atexit.register(self.close)
+
     def log_transaction(
         self,
         customer_data: CustomerData,
         payment_data: PaymentData,
         payment_response: PaymentResponse,
     ):
-        with open("transactions.log", "a") as log_file:
-            log_file.write(
-                f"{customer_data.name} paid {payment_data.amount}\n"
-            )
-            log_file.write(f"Payment status: {payment_response.status}\n")
-            if payment_response.transaction_id:
-                log_file.write(
-                    f"Transaction ID: {payment_response.transaction_id}\n"
-                )
-            log_file.write(f"Message: {payment_response.message}\n")
+        self._write(
+            self._format_transaction(customer_data, payment_data, payment_response)
+        )
 
     def log_refund(
         self, transaction_id: str, refund_response: PaymentResponse
     ):
-        with open("transactions.log", "a") as log_file:
-            log_file.write(
-                f"Refund processed for transaction {transaction_id}\n"
-            )
-            log_file.write(f"Refund status: {refund_response.status}\n")
-            log_file.write(f"Message: {refund_response.message}\n")
+        self._write(self._format_refund(transaction_id, refund_response))
+
+    def log_refunds(self, refunds: Iterable[tuple[str, PaymentResponse]]):
+        """Writes many refund entries with a single open and write."""
+        text = "".join(
+            self._format_refund(transaction_id, refund_response)
+            for transaction_id, refund_response in refunds
+        )
+        if text:
+            self._write(text)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Pushes buffered records to the file; nothing is buffered here."""
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+            atexit.unregister(self.close)
+        return True
+
+    def _open(self):
+        """Opens the log for appending, rotating it if a policy is set."""
+        if self.rotation:
+            return RotatingFile(self.path, self.rotation)
+        return open(self.path, "a")
+
+    def _format_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        payment_response: PaymentResponse,
+    ) -> str:
+        return self.formatter.format_transaction(
+            customer_data, payment_data, payment_response, time.time()
+        )
+
+    def _format_refund(
+        self, transaction_id: str, refund_response: PaymentResponse
+    ) -> str:
+        return self.formatter.format_refund(transaction_id, refund_response, time.time())
+
+    def _write(self, text: str):
+        if self._file is not None:
+            self._file.write(text)
+            self._file.flush()
+            return
+        with open(self.path, "a") as log_file:
+            log_file.write(text)
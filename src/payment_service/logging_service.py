@@ -1,30 +1,69 @@
 from decorator_procotol import PaymentServiceDecoratorProtocol
 from decorator_procotol import PaymentServiceProtocol
+import os
 from dataclasses import dataclass
+from typing import Iterable, Optional, Union
 
-from .commons import CustomerData, PaymentData, PaymentResponse
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse, RefundBatchReport
 
 @dataclass
 class PaymentServiceLogging(PaymentServiceDecoratorProtocol):
     wrapped = PaymentServiceProtocol
 
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse: 
         print('Start process transaction')
 
-        response = self.wrapped.process_transaction(customer_data, payment_data)
+        response = self.wrapped.process_transaction(
+            customer_data, payment_data, idempotency_key
+        )
         print('Finish process transaction')
         return response
 
-    def process_refund(self, transaction_id: str): 
+    def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_workers: Optional[int] = None,
+    ) -> list[BatchItemResult]:
+        print('Start process batch')
+
+        results = self.wrapped.process_batch(items, max_workers)
+        failed = sum(1 for result in results if not result.ok)
+        print(f'Finish process batch: {len(results)} items, {failed} failed')
+        return results
+
+    def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ): 
         print(f'Start process refund: {transaction_id}')
 
-        response = self.wrapped.process_refund(transaction_id)
+        response = self.wrapped.process_refund(transaction_id, idempotency_key)
 
         print('Finish process refund')
         return response
 
+    def process_refunds(
+        self,
+        transaction_ids: Union[Iterable[str], str, os.PathLike],
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        log_batch_size: int = 500,
+    ) -> RefundBatchReport:
+        print('Start process refunds')
+
+        report = self.wrapped.process_refunds(
+            transaction_ids, max_workers, rate_limit, log_batch_size
+        )
+        print(
+            f'Finish process refunds: {report.succeeded} succeeded, '
+            f'{report.failed} failed, {report.throughput:.1f} refunds/s'
+        )
+        return report
+
     def setup_recurring(
         self, customer_data: CustomerData, payment_data: PaymentData
     ): 
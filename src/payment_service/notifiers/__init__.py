@@ -1,7 +1,8 @@
 from .notifier import NotifierProtocol
+from .async_notifier import AsyncNotifierProtocol
 
 from .email import EmailNotifier
 from .sms import SMSNotifier
 
 
-__all__ = ["NotifierProtocol", "EmailNotifier", "SMSNotifier"]
+__all__ = ["NotifierProtocol", "AsyncNotifierProtocol", "EmailNotifier", "SMSNotifier"]
@@ -0,0 +1,12 @@
+from typing import Protocol
+
+from payment_service.commons import CustomerData
+
+
+class AsyncNotifierProtocol(Protocol):
+    """Protocol for sending notifications without blocking the event loop.
+
+    Async counterpart of `NotifierProtocol`.
+    """
+
+    async def send_confirmation(self, customer_data: CustomerData): ...
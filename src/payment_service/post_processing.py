@@ -0,0 +1,109 @@
+import atexit
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class PostProcessingQueue:
+    """
+    In-process queue that runs payment side effects on background workers.
+
+    `PaymentService` submits listener notification, customer confirmation
+    and transaction logging here so the response can be returned as soon as
+    the processor answers. Tasks run in submission order when `workers` is 1.
+
+    `flush` blocks until everything submitted so far has run, and `close`
+    stops accepting work, drains what is left and joins the workers. With
+    `drain_on_exit` the queue is also closed from an `atexit` hook so a
+    normal interpreter shutdown does not drop pending side effects.
+    """
+
+    maxsize: int = 10_000
+    workers: int = 1
+    drain_on_exit: bool = True
+    failed: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._queue: queue.Queue = queue.Queue(maxsize=self.maxsize)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"post-processing-{i}", daemon=True
+            )
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        if self.drain_on_exit:
+            atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, task: Callable[..., Any], *args: Any):
+        """Queues `task(*args)`; blocks while the queue is full."""
+        with self._idle:
+            if self._closed:
+                raise RuntimeError("post-processing queue is closed")
+            self._pending += 1
+        self._queue.put((task, args))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every submitted task to finish. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops accepting tasks, drains the queue and stops the workers.
+
+        `timeout` bounds the whole call. Returns False if tasks were still
+        pending when it expired; the workers are daemon threads and finish
+        them in the background.
+        """
+        with self._idle:
+            if self._closed:
+                return self._pending == 0
+            self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        drained = self.flush(timeout)
+        try:
+            for _ in self._threads:
+                self._queue.put(None, timeout=_remaining(deadline))
+        except queue.Full:
+            drained = False
+        for thread in self._threads:
+            thread.join(_remaining(deadline))
+        if self.drain_on_exit:
+            atexit.unregister(self.close)
+        return drained
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            task, args = item
+            try:
+                task(*args)
+            except Exception as e:
+                print(f"Post-processing task failed: {e}")
+                with self._idle:
+                    self.failed += 1
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    if self._pending == 0:
+                        self._idle.notify_all()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
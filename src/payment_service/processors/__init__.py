@@ -1,15 +1,55 @@
-from .local_processor import LocalPaymentProcessor
-from .offline_processor import OfflinePaymentProcessor
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .async_payment import AsyncPaymentProcessorProtocol
+from .async_recurring import AsyncRecurringPaymentProcessorProtocol
+from .async_refunds import AsyncRefundProcessorProtocol
 from .payment import PaymentProcessorProtocol
 from .recurring import RecurringPaymentProcessorProtocol
 from .refunds import RefundProcessorProtocol
-from .stripe_processor import StripePaymentProcessor
+from .registry import ANY_CURRENCY, ProcessorRegistry, default_registry
+from .routing import LatencyAwareRouter, Route, RoutingWeights
+
+if TYPE_CHECKING:
+    from .local_processor import LocalPaymentProcessor
+    from .offline_processor import OfflinePaymentProcessor
+    from .stripe_processor import StripePaymentProcessor
+
+# Concrete processors are imported on first access so that workers which
+# never touch Stripe do not pay for importing the SDK at start-up.
+_LAZY_PROCESSORS = {
+    "LocalPaymentProcessor": ".local_processor",
+    "OfflinePaymentProcessor": ".offline_processor",
+    "StripePaymentProcessor": ".stripe_processor",
+}
 
 __all__ = [
+    "ANY_CURRENCY",
+    "AsyncPaymentProcessorProtocol",
+    "AsyncRecurringPaymentProcessorProtocol",
+    "AsyncRefundProcessorProtocol",
+    "LatencyAwareRouter",
     "PaymentProcessorProtocol",
     "StripePaymentProcessor",
     "OfflinePaymentProcessor",
     "RecurringPaymentProcessorProtocol",
     "RefundProcessorProtocol",
     "LocalPaymentProcessor",
+    "ProcessorRegistry",
+    "Route",
+    "RoutingWeights",
+    "default_registry",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_PROCESSORS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
@@ -0,0 +1,19 @@
+from typing import Optional, Protocol
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class AsyncPaymentProcessorProtocol(Protocol):
+    """Protocol for processing payments without blocking the event loop.
+
+    Async counterpart of `PaymentProcessorProtocol`. Implementations
+    should await their network I/O instead of blocking a thread, and
+    forward `idempotency_key` like the sync processors.
+    """
+
+    async def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse: ...
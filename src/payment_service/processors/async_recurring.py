@@ -0,0 +1,11 @@
+from typing import Protocol
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class AsyncRecurringPaymentProcessorProtocol(Protocol):
+    """Protocol for setting up recurring payments without blocking the event loop."""
+
+    async def setup_recurring_payment(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse: ...
@@ -0,0 +1,11 @@
+from typing import Optional, Protocol
+
+from payment_service.commons import PaymentResponse
+
+
+class AsyncRefundProcessorProtocol(Protocol):
+    """Protocol for processing refunds without blocking the event loop."""
+
+    async def refund_payment(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse: ...
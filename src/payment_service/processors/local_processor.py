@@ -1,4 +1,5 @@
 import uuid
+from typing import Optional
 
 from payment_service.commons import CustomerData, PaymentData, PaymentResponse
 
@@ -18,8 +19,11 @@ class LocalPaymentProcessor(
     Useful when the payment is not in USD currency.
     """
 
-    def process_payment(
-        self, customer_data: CustomerData, payment_data: PaymentData
+    def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse:
         print("Processing local payment for", customer_data.name)
         transaction_id = f"local-transaction-id-{uuid.uuid4()}"
@@ -30,7 +34,9 @@ class LocalPaymentProcessor(
             message="Local payment success",
         )
 
-    def refund_payment(self, transaction_id: str) -> PaymentResponse:
+    def refund_payment(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse:
         print("Processing refund for transaction id", transaction_id)
         return PaymentResponse(
             status="success",
@@ -1,10 +1,15 @@
+from typing import Optional
+
 from .payment import PaymentProcessorProtocol
 from payment_service.commons import CustomerData, PaymentData, PaymentResponse
 
 
 class OfflinePaymentProcessor(PaymentProcessorProtocol):
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse:
         print("Processing offline payment for", customer_data.name)
         return PaymentResponse(
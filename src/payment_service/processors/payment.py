@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Optional, Protocol
 
 from payment_service.commons import CustomerData, PaymentData, PaymentResponse
 
@@ -8,8 +8,14 @@ class PaymentProcessorProtocol(Protocol):
 
     This protocol defines the interface for payment processors. Implementations
     should provide methods for processing payments.
+
+    `idempotency_key` identifies retries of the same charge; processors
+    backed by an API with idempotency support should forward it.
     """
 
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse: ...
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from typing_extensions import Protocol
 
 from payment_service.commons import PaymentResponse
@@ -6,4 +8,6 @@ from payment_service.commons import PaymentResponse
 class RefundProcessorProtocol(Protocol):
     """Protocol for processing refunds."""
 
-    def refund_payment(self, transaction_id: str) -> PaymentResponse: ...
+    def refund_payment(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse: ...
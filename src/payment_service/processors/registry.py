@@ -0,0 +1,141 @@
+import threading
+from dataclasses import dataclass, field
+from functools import cache
+from importlib import import_module
+from typing import Callable, Optional
+
+from payment_service.commons import PaymentData, PaymentType
+
+from .payment import PaymentProcessorProtocol
+
+ProcessorFactory = Callable[[], PaymentProcessorProtocol]
+
+ANY_CURRENCY = None
+
+
+@dataclass(frozen=True)
+class ProcessorRegistration:
+    name: str
+    factory: ProcessorFactory
+    shared: bool = True
+
+
+@cache
+def _lazy_factory(name: str) -> ProcessorFactory:
+    """Builds the processor exported as `name` by this package, importing it on demand."""
+    return lambda: getattr(import_module(__package__), name)()
+
+
+@dataclass
+class ProcessorRegistry:
+    """
+    Maps (payment type, currency) to a payment processor.
+
+    Routes live in a dispatch table keyed by `(PaymentType, currency)`, with
+    `ANY_CURRENCY` as the fallback for a payment type, so resolving a
+    processor is one or two dict lookups. Processors registered as `shared`
+    are built once, on first use, and reused by every caller, which keeps
+    their pooled connections and caches warm. Shared processors must be
+    safe to use from several threads.
+
+    Currencies are matched case-insensitively. When re-registering a name
+    changes how it is built, or its last route is unregistered, its shared
+    instance is evicted: later lookups build a new one. The evicted instance
+    is not closed, since services built earlier may still be using it;
+    whoever holds it last closes it. `close` closes the shared instances
+    the registry still holds, for shutdown.
+    """
+
+    _routes: dict[tuple[PaymentType, Optional[str]], ProcessorRegistration] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _instances: dict[str, PaymentProcessorProtocol] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def register(
+        self,
+        name: str,
+        payment_type: PaymentType,
+        currency: Optional[str] = ANY_CURRENCY,
+        factory: Optional[ProcessorFactory] = None,
+        shared: bool = True,
+    ):
+        """
+        Routes payments of `payment_type` and `currency` to processor `name`.
+
+        `factory` defaults to the class of the same name exported by
+        `payment_service.processors`, imported lazily.
+        """
+        registration = ProcessorRegistration(
+            name=name, factory=factory or _lazy_factory(name), shared=shared
+        )
+        key = (payment_type, currency.upper() if currency else ANY_CURRENCY)
+        with self._lock:
+            previous = {
+                (route.factory, route.shared)
+                for route in self._routes.values()
+                if route.name == name
+            }
+            self._routes[key] = registration
+            if previous - {(registration.factory, registration.shared)}:
+                self._instances.pop(name, None)
+
+    def unregister(
+        self, payment_type: PaymentType, currency: Optional[str] = ANY_CURRENCY
+    ):
+        key = (payment_type, currency.upper() if currency else ANY_CURRENCY)
+        with self._lock:
+            registration = self._routes.pop(key, None)
+            if registration is not None and not any(
+                route.name == registration.name for route in self._routes.values()
+            ):
+                self._instances.pop(registration.name, None)
+
+    def registration_for(self, payment_data: PaymentData) -> ProcessorRegistration:
+        registration = self._routes.get(
+            (payment_data.type, payment_data.currency.upper())
+        ) or self._routes.get((payment_data.type, ANY_CURRENCY))
+        if registration is None:
+            raise ValueError("Invalid payment type")
+        return registration
+
+    def get(self, name: str) -> PaymentProcessorProtocol:
+        """Returns the shared instance of processor `name`."""
+        for registration in self._routes.values():
+            if registration.name == name:
+                return self._instance(registration)
+        raise ValueError(f"Unknown payment processor {name}")
+
+    def resolve(self, payment_data: PaymentData) -> PaymentProcessorProtocol:
+        return self._instance(self.registration_for(payment_data))
+
+    def _instance(self, registration: ProcessorRegistration) -> PaymentProcessorProtocol:
+        if not registration.shared:
+            return registration.factory()
+        processor = self._instances.get(registration.name)
+        if processor is None:
+            with self._lock:
+                processor = self._instances.get(registration.name)
+                if processor is None:
+                    processor = registration.factory()
+                    self._instances[registration.name] = processor
+        return processor
+
+    def close(self):
+        """Closes the shared instances still held (those with a `close` method) and forgets them."""
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        for processor in instances.values():
+            close = getattr(processor, "close", None)
+            if close is not None:
+                close()
+
+
+default_registry = ProcessorRegistry()
+default_registry.register("OfflinePaymentProcessor", PaymentType.OFFLINE)
+default_registry.register("StripePaymentProcessor", PaymentType.ONLINE, "USD")
+default_registry.register("LocalPaymentProcessor", PaymentType.ONLINE)
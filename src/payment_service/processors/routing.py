@@ -0,0 +1,223 @@
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional
+
+from payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+from .payment import PaymentProcessorProtocol
+
+
+class StatsSnapshot(NamedTuple):
+    calls: int
+    errors: int
+    ewma_latency: float
+    p99_latency: float
+    error_rate: float
+
+
+@dataclass
+class ProcessorStats:
+    """
+    Live latency and error statistics for one processor.
+
+    Latency is tracked as an exponentially weighted moving average plus a
+    streaming p99 estimate (stochastic quantile tracking, O(1) memory).
+    The error rate is an EWMA of calls the backend failed.
+    """
+
+    alpha: float = 0.1
+    quantile_gain: float = 0.05
+    calls: int = 0
+    errors: int = 0
+    ewma_latency: float = 0.0
+    p99_latency: float = 0.0
+    error_rate: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, latency: float, failed: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            if self.calls == 1:
+                self.ewma_latency = self.p99_latency = latency
+                self.error_rate = float(failed)
+                return
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+            self.error_rate += self.alpha * (float(failed) - self.error_rate)
+            # Move up by 0.99 steps above the estimate and down by 0.01 below
+            # it, which settles where 1% of samples exceed the estimate.
+            step = self.quantile_gain * max(self.ewma_latency, 1e-6)
+            if latency > self.p99_latency:
+                self.p99_latency += step * 0.99
+            else:
+                self.p99_latency -= step * 0.01
+
+    def snapshot(self) -> StatsSnapshot:
+        with self._lock:
+            return StatsSnapshot(
+                self.calls,
+                self.errors,
+                self.ewma_latency,
+                self.p99_latency,
+                self.error_rate,
+            )
+
+
+@dataclass
+class RoutingWeights:
+    """
+    Weights of the routing score; the lowest score wins.
+
+    score = latency * ewma + p99 * p99_latency + error * error_rate,
+    with latencies in seconds, so `error` is the number of seconds one
+    fully failing processor is considered to cost.
+    """
+
+    latency: float = 1.0
+    p99: float = 0.5
+    error: float = 5.0
+
+
+class Route(NamedTuple):
+    name: str
+    processor: PaymentProcessorProtocol
+    accepts: Callable[[PaymentData], bool] = lambda payment_data: True
+
+
+class RoutingDecision(NamedTuple):
+    timestamp: float
+    chosen: str
+    scores: dict[str, float]
+    explored: bool
+    pinned: bool = False
+
+
+@dataclass
+class LatencyAwareRouter(PaymentProcessorProtocol):
+    """
+    Payment processor that spreads traffic across several backends.
+
+    For each payment the router scores every route whose `accepts` returns
+    True from its live statistics and sends the payment to the best one.
+    Routes without samples are tried first, but only `max_probes` calls at
+    a time go to each of them, so a new route does not take every in-flight
+    payment at once. With probability `explore_rate` a random eligible
+    route is used instead, so a backend that recovered gets traffic again.
+
+    A payment with an idempotency key is pinned to the route it was first
+    sent to, and retries with that key go to the same backend, whose own
+    idempotency keeps a retry after a timeout from charging twice. The most
+    recent `pinned_keys` keys are kept.
+
+    Latency is measured around the processor call. An exception or a
+    response with `backend_error` set counts as an error; declines and
+    other failed payments do not, since the backend handled them fine.
+
+    The router can be registered in a `ProcessorRegistry` like any other
+    processor. `stats()` and `decisions` expose what it is doing.
+    """
+
+    routes: list[Route]
+    weights: RoutingWeights = field(default_factory=RoutingWeights)
+    explore_rate: float = 0.02
+    history: int = 1000
+    max_probes: int = 1
+    pinned_keys: int = 100_000
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if not self.routes:
+            raise ValueError("LatencyAwareRouter needs at least one route")
+        if self.max_probes < 1:
+            raise ValueError("max_probes must be at least 1")
+        self._stats = {route.name: ProcessorStats() for route in self.routes}
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._probes = {route.name: 0 for route in self.routes}
+        self._pins: OrderedDict[str, Route] = OrderedDict()
+        self.decisions: deque[RoutingDecision] = deque(maxlen=self.history)
+
+    def score(self, name: str) -> float:
+        stats = self._stats[name].snapshot()
+        if not stats.calls:
+            return float("-inf")
+        return (
+            self.weights.latency * stats.ewma_latency
+            + self.weights.p99 * stats.p99_latency
+            + self.weights.error * stats.error_rate
+        )
+
+    def _choose(
+        self, payment_data: PaymentData, idempotency_key: Optional[str]
+    ) -> tuple[Route, bool]:
+        """Returns the route for a payment and whether the call is a probe."""
+        with self._lock:
+            route = self._pins.get(idempotency_key) if idempotency_key else None
+            if route is not None:
+                self._pins.move_to_end(idempotency_key)
+                scores, explored, pinned = {}, False, True
+            else:
+                route, scores, explored = self._pick(payment_data)
+                pinned = False
+                if idempotency_key:
+                    self._pins[idempotency_key] = route
+                    if len(self._pins) > self.pinned_keys:
+                        self._pins.popitem(last=False)
+            probe = not self._stats[route.name].calls
+            self._probes[route.name] += probe
+            self.decisions.append(
+                RoutingDecision(time.time(), route.name, scores, explored, pinned)
+            )
+        return route, probe
+
+    def _pick(self, payment_data: PaymentData) -> tuple[Route, dict[str, float], bool]:
+        eligible = [route for route in self.routes if route.accepts(payment_data)]
+        if not eligible:
+            raise ValueError(
+                f"No processor accepts {payment_data.type.value} payments in {payment_data.currency}"
+            )
+        scores = {route.name: self.score(route.name) for route in eligible}
+        ready = [
+            route
+            for route in eligible
+            if scores[route.name] != float("-inf")
+            or self._probes[route.name] < self.max_probes
+        ]
+        if not ready:
+            # Nothing has samples yet and every route is at its probe limit:
+            # spread the calls instead of queueing them on one route.
+            return min(eligible, key=lambda route: self._probes[route.name]), scores, False
+        explored = len(ready) > 1 and self._rng.random() < self.explore_rate
+        if explored:
+            return self._rng.choice(ready), scores, True
+        return min(ready, key=lambda route: scores[route.name]), scores, False
+
+    def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse:
+        route, probe = self._choose(payment_data, idempotency_key)
+        started = time.perf_counter()
+        try:
+            response = route.processor.process_transaction(
+                customer_data, payment_data, idempotency_key=idempotency_key
+            )
+        except Exception:
+            self._stats[route.name].record(time.perf_counter() - started, True)
+            raise
+        finally:
+            if probe:
+                with self._lock:
+                    self._probes[route.name] -= 1
+        self._stats[route.name].record(
+            time.perf_counter() - started, response.backend_error
+        )
+        return response
+
+    def stats(self) -> dict[str, StatsSnapshot]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
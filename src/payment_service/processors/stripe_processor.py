@@ -1,9 +1,16 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
 
+import requests
 import stripe
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from stripe.error import StripeError  # type: ignore
 
+from payment_service.caching import SingleFlight, TTLCache
 from payment_service.commons import CustomerData, PaymentData, PaymentResponse
 
 from .payment import PaymentProcessorProtocol
@@ -13,21 +20,104 @@ from .refunds import RefundProcessorProtocol
 _ = load_dotenv()
 
 
+def _request_options(idempotency_key: Optional[str]) -> dict:
+    return {"idempotency_key": idempotency_key} if idempotency_key else {}
+
+
+def _backend_error(error: StripeError) -> bool:
+    """Connection failures, rate limiting and 5xx: Stripe failed, not the payment."""
+    status = error.http_status
+    return status is None or status == 429 or status >= 500
+
+
+@dataclass
 class StripePaymentProcessor(
     PaymentProcessorProtocol,
     RefundProcessorProtocol,
     RecurringPaymentProcessorProtocol,
 ):
+    """
+    Payment processor backed by the Stripe API.
+
+    The processor owns one `stripe.StripeClient` for its whole lifetime. The
+    client sends every request through a shared `requests.Session`, whose
+    keep-alive pool holds up to `pool_size` connections, so TLS handshakes
+    are paid once per connection instead of once per charge. A single
+    instance is safe to share between threads.
+
+    Settings left as None are read from the environment: `STRIPE_API_KEY`,
+    `STRIPE_API_BASE` (to target a local stand-in for the Stripe API) and
+    `STRIPE_PRICE_ID`.
+
+    Stripe customers used for subscriptions are cached by id and email for
+    `customer_cache_ttl` seconds (at most `customer_cache_size` entries), and
+    concurrent enrollments for the same new email create a single customer.
+
+    Recurring enrollment looks up the customer and the payment method in
+    parallel, skips attaching a method the customer already owns and skips
+    updating a default that is already set. The per-step timings (seconds)
+    are returned in `PaymentResponse.timings`.
+    """
+
+    api_key: Optional[str] = None
+    api_base: Optional[str] = None
+    price_id: Optional[str] = None
+    pool_size: int = 10
+    timeout: int = 80
+    max_network_retries: int = 0
+    customer_cache_size: int = 10_000
+    customer_cache_ttl: float = 300.0
+    client: stripe.StripeClient = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.api_key = self.api_key or os.getenv("STRIPE_API_KEY", "")
+        self.api_base = self.api_base or os.getenv("STRIPE_API_BASE")
+        self.price_id = self.price_id or os.getenv("STRIPE_PRICE_ID", "")
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, pool_block=True
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self.client = stripe.StripeClient(
+            self.api_key,
+            base_addresses={"api": self.api_base} if self.api_base else {},
+            max_network_retries=self.max_network_retries,
+            http_client=stripe.RequestsClient(
+                timeout=self.timeout, session=self._session
+            ),
+        )
+
+        self._customers = TTLCache(
+            maxsize=self.customer_cache_size, ttl=self.customer_cache_ttl
+        )
+        self._customer_lookups = SingleFlight()
+        self._lookups = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="stripe-lookup"
+        )
+
+    def close(self):
+        """Closes the pooled connections."""
+        self._lookups.shutdown(wait=True)
+        self._session.close()
+
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
         try:
-            charge = stripe.Charge.create(
-                amount=payment_data.amount,
-                currency="usd",
-                source=payment_data.source,
-                description="Charge for " + customer_data.name,
+            charge = self.client.charges.create(
+                params={
+                    "amount": payment_data.amount,
+                    "currency": "usd",
+                    "source": payment_data.source,
+                    "description": "Charge for " + customer_data.name,
+                },
+                options=_request_options(idempotency_key),
             )
             print("Payment successful")
             return PaymentResponse(
@@ -43,12 +133,17 @@ class StripePaymentProcessor(
                 amount=payment_data.amount,
                 transaction_id=None,
                 message=str(e),
+                backend_error=_backend_error(e),
             )
 
-    def refund_payment(self, transaction_id: str) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
+    def refund_payment(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse:
         try:
-            refund = stripe.Refund.create(charge=transaction_id)
+            refund = self.client.refunds.create(
+                params={"charge": transaction_id},
+                options=_request_options(idempotency_key),
+            )
             print("Refund successful")
             return PaymentResponse(
                 status=refund["status"],
@@ -63,29 +158,55 @@ class StripePaymentProcessor(
                 amount=0,
                 transaction_id=None,
                 message=str(e),
+                backend_error=_backend_error(e),
             )
 
     def setup_recurring_payment(
         self, customer_data: CustomerData, payment_data: PaymentData
     ) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
-        price_id = os.getenv("STRIPE_PRICE_ID", "")
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        # Checked before the lookups start, so a customer Stripe cannot
+        # identify costs no API call at all.
+        key = self._customer_key(customer_data)
         try:
-            customer = self._get_or_create_customer(customer_data)
-
-            payment_method = self._attach_payment_method(
-                customer.id, payment_data.source
+            customer_lookup = self._lookups.submit(
+                self._timed, timings, "customer",
+                self._get_or_create_customer, customer_data, key,
             )
+            payment_method_lookup = self._lookups.submit(
+                self._timed, timings, "payment_method",
+                self.client.payment_methods.retrieve, payment_data.source,
+            )
+            customer = customer_lookup.result()
+            payment_method = payment_method_lookup.result()
+            timings["lookups"] = time.perf_counter() - started
+
+            if self._owner_id(payment_method) != customer.id:
+                self._timed(
+                    timings, "attach",
+                    self._attach_payment_method, customer.id, payment_method,
+                )
 
-            self._set_default_payment_method(customer.id, payment_method.id)
+            if self._default_payment_method_id(customer) != payment_method.id:
+                self._timed(
+                    timings, "set_default",
+                    self._set_default_payment_method, customer.id, payment_method.id,
+                )
 
-            subscription = stripe.Subscription.create(
-                customer=customer.id,
-                items=[
-                    {"price": price_id},
-                ],
-                expand=["latest_invoice.payment_intent"],
+            subscription = self._timed(
+                timings, "subscription",
+                self.client.subscriptions.create,
+                params={
+                    "customer": customer.id,
+                    "items": [
+                        {"price": self.price_id},
+                    ],
+                    "default_payment_method": payment_method.id,
+                    "expand": ["latest_invoice.payment_intent"],
+                },
             )
+            timings["total"] = time.perf_counter() - started
 
             print("Recurring payment setup successful")
             amount = subscription["items"]["data"][0]["price"]["unit_amount"]
@@ -94,44 +215,98 @@ class StripePaymentProcessor(
                 amount=amount,
                 transaction_id=subscription["id"],
                 message="Recurring payment setup successful",
+                timings=timings,
             )
         except StripeError as e:
             print("Recurring payment setup failed:", e)
+            timings["total"] = time.perf_counter() - started
             return PaymentResponse(
                 status="failed",
                 amount=0,
                 transaction_id=None,
                 message=str(e),
+                backend_error=_backend_error(e),
+                timings=timings,
             )
 
+    @staticmethod
+    def _timed(timings: dict[str, float], step: str, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            timings[step] = time.perf_counter() - started
+
+    @staticmethod
+    def _owner_id(payment_method: stripe.PaymentMethod) -> Optional[str]:
+        owner = payment_method.get("customer")
+        return owner if isinstance(owner, str) or owner is None else owner.id
+
+    @staticmethod
+    def _default_payment_method_id(customer: stripe.Customer) -> Optional[str]:
+        invoice_settings = customer.get("invoice_settings") or {}
+        default = invoice_settings.get("default_payment_method")
+        return default if isinstance(default, str) or default is None else default.id
+
+    @staticmethod
+    def _customer_key(customer_data: CustomerData) -> tuple[str, str]:
+        if customer_data.customer_id:
+            return ("id", customer_data.customer_id)
+        if not customer_data.contact_info.email:
+            raise ValueError("Email required for subscriptions")
+        return ("email", customer_data.contact_info.email)
+
     def _get_or_create_customer(
-        self, customer_data: CustomerData
+        self, customer_data: CustomerData, key: tuple[str, str]
     ) -> stripe.Customer:
         """
         Creates a new customer in Stripe or retrieves an existing one.
+
+        Results are served from the customer cache when possible; misses for
+        the same key are collapsed into a single Stripe call.
         """
+        customer = self._customers.get(key)
+        if customer is not None:
+            return customer
+        return self._customer_lookups.do(
+            key, lambda: self._fetch_customer(key, customer_data)
+        )
+
+    def _fetch_customer(
+        self, key: tuple[str, str], customer_data: CustomerData
+    ) -> stripe.Customer:
+        customer = self._customers.get(key)
+        if customer is not None:
+            return customer
+
         if customer_data.customer_id:
-            customer = stripe.Customer.retrieve(customer_data.customer_id)
+            customer = self.client.customers.retrieve(customer_data.customer_id)
             print(f"Customer retrieved: {customer.id}")
         else:
-            if not customer_data.contact_info.email:
-                raise ValueError("Email required for subscriptions")
-            customer = stripe.Customer.create(
-                name=customer_data.name, email=customer_data.contact_info.email
+            customer = self.client.customers.create(
+                params={
+                    "name": customer_data.name,
+                    "email": customer_data.contact_info.email,
+                }
             )
             print(f"Customer created: {customer.id}")
+        self._cache_customer(customer)
         return customer
 
+    def _cache_customer(self, customer: stripe.Customer):
+        self._customers.set(("id", customer.id), customer)
+        if customer.get("email"):
+            self._customers.set(("email", customer["email"]), customer)
+
     def _attach_payment_method(
-        self, customer_id: str, payment_source: str
+        self, customer_id: str, payment_method: stripe.PaymentMethod
     ) -> stripe.PaymentMethod:
         """
         Attaches a payment method to a customer.
         """
-        payment_method = stripe.PaymentMethod.retrieve(payment_source)
-        stripe.PaymentMethod.attach(
+        payment_method = self.client.payment_methods.attach(
             payment_method.id,
-            customer=customer_id,
+            params={"customer": customer_id},
         )
         print(
             f"Payment method {payment_method.id} attached to customer {customer_id}"
@@ -144,10 +319,13 @@ class StripePaymentProcessor(
         """
         Sets the default payment method for a customer.
         """
-        stripe.Customer.modify(
+        customer = self.client.customers.update(
             customer_id,
-            invoice_settings={
-                "default_payment_method": payment_method_id,
+            params={
+                "invoice_settings": {
+                    "default_payment_method": payment_method_id,
+                },
             },
         )
+        self._cache_customer(customer)
         print(f"Default payment method set for customer {customer_id}")
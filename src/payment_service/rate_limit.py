@@ -0,0 +1,52 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Allows `rate` operations per second on average, with bursts of up to
+    `burst` operations (defaults to one second worth of tokens).
+    """
+
+    rate: float
+    burst: Optional[float] = None
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        self.burst = self.burst or max(self.rate, 1.0)
+        self._tokens = self.burst
+        self._updated = self.clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Blocks until `tokens` are available and consumes them."""
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            self.sleep(wait)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Consumes `tokens` if available right now, without blocking."""
+        return not self._take(tokens)
+
+    def _take(self, tokens: float) -> float:
+        """Consumes tokens and returns 0, or returns the seconds to wait."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
@@ -1,19 +1,34 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Self
+from typing import Iterable, Iterator, Optional, Self, Union
 
-from .commons import CustomerData, PaymentData, PaymentResponse, Request
+from .commons import (
+    BatchItemResult,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    RefundBatchReport,
+    RefundOutcome,
+    Request,
+)
 from .loggers import TransactionLogger
+from .idempotency import IdempotencyCache, fingerprint
 from .notifiers import NotifierProtocol
+from .post_processing import PostProcessingQueue
+from .rate_limit import RateLimiter
 from .processors import (
     PaymentProcessorProtocol,
     RecurringPaymentProcessorProtocol,
     RefundProcessorProtocol,
 )
 from .validators import CustomerValidator, PaymentDataValidator, ChainHandler
-from factory import PaymentProcessorFactory
+from .factory import PaymentProcessorFactory
 
-from service_protocol import PaymentServiceProtocol
-from listeners import ListenersManager
+from .service_protocol import PaymentServiceProtocol
+from .listeners import EventBus, ListenersManager, PaymentEvent, RefundEvent
 
 
 @dataclass
@@ -27,19 +42,37 @@ class PaymentService(PaymentServiceProtocol):
     Attributes:
         payment_processor: Procesador de pagos principal
         notifier: Servicio para enviar notificaciones
-        customer_validator: Validador de datos del cliente
-        payment_validator: Validador de datos de pago
+        validators: Cadena de validaciones. Se compila al crear el servicio;
+            un pago que no la supera lanza ValueError sin llegar al procesador.
         logger: Registrador de transacciones
         refund_processor: Procesador de reembolsos (opcional)
         recurring_processor: Procesador de pagos recurrentes (opcional)
+        batch_workers: Número de hilos usados por process_batch
+        post_processor: Cola en segundo plano para listeners, notificación y
+            registro (opcional). Si está configurada, process_transaction
+            responde apenas contesta el procesador.
+        listeners: Administrador de listeners. Con un EventBus los eventos se
+            entregan desde hilos propios sin demorar la transacción.
+        idempotency_cache: Caché de respuestas por clave de idempotencia
+            (opcional). Los reintentos con la misma clave devuelven la
+            respuesta original sin volver a cobrar; las respuestas fallidas
+            no se guardan, para que el reintento llegue al procesador.
     """
     payment_processor: PaymentProcessorProtocol
     notifier: NotifierProtocol
-    validators = ChainHandler
+    validators: ChainHandler
     logger: TransactionLogger
     listeners: ListenersManager
     refund_processor: Optional[RefundProcessorProtocol] = None
     recurring_processor: Optional[RecurringPaymentProcessorProtocol] = None
+    batch_workers: int = 8
+    post_processor: Optional[PostProcessingQueue] = None
+    idempotency_cache: Optional[IdempotencyCache] = None
+
+    def __post_init__(self):
+        # La cadena se recorre una sola vez aquí y no en cada pago; los
+        # handlers enlazados después con set_next no se incluyen.
+        self._validate = self.validators.compile()
 
     @classmethod
     def create_with_payment_processor(cls, payment_data: PaymentData, **kwargs) -> Self:
@@ -88,7 +121,10 @@ class PaymentService(PaymentServiceProtocol):
         self.notifier = notifier
 
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse:
         """
         Procesa una transacción de pago completa.
@@ -98,39 +134,197 @@ class PaymentService(PaymentServiceProtocol):
         2. Procesa la transacción con el procesador de pagos
         3. Envía una notificación de confirmación
         4. Registra la transacción
+
+        Los pasos 3 y 4 (junto con los listeners) se encolan en
+        post_processor cuando está configurado.
         
         Args:
             customer_data: Datos del cliente que realiza el pago
             payment_data: Datos del pago a procesar
+            idempotency_key: Clave de idempotencia del cliente (opcional). Se
+                reenvía al procesador y, si hay idempotency_cache, los
+                reintentos con la misma clave reutilizan la primera respuesta
+                que no haya fallado. Reutilizar la clave con otros datos lanza
+                ValueError.
             
         Returns:
             La respuesta del procesador de pagos
         """
+        if idempotency_key and self.idempotency_cache:
+            return self.idempotency_cache.get_or_run(
+                ("transaction", idempotency_key),
+                lambda: self._process_transaction(
+                    customer_data, payment_data, idempotency_key
+                ),
+                fingerprint(customer_data, payment_data),
+            )
+        return self._process_transaction(
+            customer_data, payment_data, idempotency_key
+        )
+
+    def _process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str],
+    ) -> PaymentResponse:
         # self.customer_validator.validate(customer_data)
         # self.payment_validator.validate(payment_data)
         try:
             request = Request(customer_data=customer_data, payment_data=payment_data)
-            self.validators.handle(request)
+            failures = self._validate(request)
+            if failures:
+                raise ValueError("; ".join(failure.message for failure in failures))
         except Exception as e:
             print(f"Error processing transaction: {e}")
             raise e
 
+        started = time.perf_counter()
         payment_response = self.payment_processor.process_transaction(
-            customer_data, payment_data
+            customer_data, payment_data, idempotency_key=idempotency_key
+        )
+        event = PaymentEvent(
+            payment_response,
+            customer_data,
+            payment_data,
+            processor=type(self.payment_processor).__name__,
+            elapsed=time.perf_counter() - started,
         )
 
-        if payment_response.status == 'succes:':
-            self.listeners.notify_all(f"Pago procesado al: {payment_response.transaction_id}")
+        if self.post_processor:
+            self.post_processor.submit(self._post_process, event)
         else:
-            self.listeners.notify_all(f"Pago denegado: {payment_response.message}")
-        
-        self.notifier.send_confirmation(customer_data)
-        self.logger.log_transaction(
-            customer_data, payment_data, payment_response
-        )
+            self._post_process(event)
         return payment_response
 
-    def process_refund(self, transaction_id: str):
+    def _post_process(self, event: PaymentEvent):
+        """
+        Ejecuta los efectos secundarios de una transacción ya procesada:
+        notifica a los listeners, envía la confirmación y registra la transacción.
+
+        Los listeners reciben el PaymentEvent; el texto solo se genera si
+        alguno lo pide con str(event).
+
+        Cada efecto se ejecuta aunque falle uno anterior, para que un listener
+        con errores no impida registrar la transacción. Después se relanza el
+        primer error y se imprimen los demás.
+        """
+        errors = []
+        for side_effect, *args in (
+            (self.listeners.notify_all, event, event.topic),
+            (self.notifier.send_confirmation, event.customer),
+            (self.logger.log_transaction, event.customer, event.payment, event.response),
+        ):
+            try:
+                side_effect(*args)
+            except Exception as e:
+                errors.append(e)
+        for error in errors[1:]:
+            print(f"Error in post-processing: {error}")
+        if errors:
+            raise errors[0]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que terminen los efectos secundarios pendientes, a que se
+        entreguen los eventos si listeners es un EventBus y a que el logger
+        escriba los registros que tenga en memoria.
+
+        Args:
+            timeout: Segundos máximos de espera (None espera indefinidamente)
+
+        Returns:
+            False si se agotó el tiempo con tareas pendientes, True en otro caso
+        """
+        flushed = True
+        if self.post_processor:
+            flushed = self.post_processor.flush(timeout)
+        if isinstance(self.listeners, EventBus):
+            flushed = self.listeners.flush(timeout) and flushed
+        return self.logger.flush(timeout) and flushed
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Drena la cola de post-procesamiento y el EventBus de listeners (si
+        lo hay), detiene sus hilos y cierra el logger.
+
+        Debe llamarse al apagar el servicio para no perder notificaciones,
+        eventos ni registros encolados.
+
+        Args:
+            timeout: Segundos máximos de espera (None espera indefinidamente)
+
+        Returns:
+            False si quedaron tareas sin ejecutar, True en otro caso
+        """
+        closed = True
+        if self.post_processor:
+            closed = self.post_processor.close(timeout)
+        # Closed after the post-processing queue, which still publishes events.
+        if isinstance(self.listeners, EventBus):
+            closed = self.listeners.close(timeout) and closed
+        # Last, since the steps above can still log transactions.
+        return self.logger.close(timeout) and closed
+
+    def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_workers: Optional[int] = None,
+    ) -> list[BatchItemResult]:
+        """
+        Procesa muchas transacciones en paralelo sobre un pool de hilos.
+
+        Cada par (cliente, pago) pasa por el mismo flujo que process_transaction.
+        Como el costo dominante es la espera de red del procesador, varios hilos
+        permiten tener muchas transacciones en vuelo a la vez. El iterable se
+        consume de forma perezosa y nunca hay más de 2 * max_workers
+        transacciones pendientes, así que sirve para lotes muy grandes.
+
+        Args:
+            items: Iterable de tuplas (customer_data, payment_data)
+            max_workers: Tamaño del pool; por defecto usa batch_workers
+
+        Returns:
+            Un BatchItemResult por elemento, en el mismo orden de entrada. Los
+            errores de un elemento se reportan en su resultado y no detienen
+            el resto del lote.
+        """
+        workers = self.batch_workers if max_workers is None else max_workers
+        if workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        results: list[BatchItemResult] = []
+        pending: deque[tuple[int, Future[PaymentResponse]]] = deque()
+
+        def collect(index: int, future: Future[PaymentResponse]):
+            try:
+                response = future.result()
+                results.append(BatchItemResult(index=index, response=response))
+            except Exception as e:
+                results.append(BatchItemResult(index=index, error=str(e)))
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="payment-batch"
+        ) as executor:
+            for index, (customer_data, payment_data) in enumerate(items):
+                if len(pending) >= workers * 2:
+                    collect(*pending.popleft())
+                pending.append(
+                    (
+                        index,
+                        executor.submit(
+                            self.process_transaction, customer_data, payment_data
+                        ),
+                    )
+                )
+            while pending:
+                collect(*pending.popleft())
+
+        return results
+
+    def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ):
         """
         Procesa un reembolso para una transacción existente.
         
@@ -139,6 +333,8 @@ class PaymentService(PaymentServiceProtocol):
         
         Args:
             transaction_id: Identificador de la transacción a reembolsar
+            idempotency_key: Clave de idempotencia del cliente (opcional), con
+                el mismo comportamiento que en process_transaction
             
         Returns:
             La respuesta del procesador de reembolsos
@@ -148,10 +344,132 @@ class PaymentService(PaymentServiceProtocol):
         """
         if not self.refund_processor:
             raise Exception("this processor does not support refunds")
-        refund_response = self.refund_processor.refund_payment(transaction_id)
+        if idempotency_key and self.idempotency_cache:
+            return self.idempotency_cache.get_or_run(
+                ("refund", idempotency_key),
+                lambda: self._process_refund(transaction_id, idempotency_key),
+                fingerprint(transaction_id),
+            )
+        return self._process_refund(transaction_id, idempotency_key)
+
+    def _process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str]
+    ) -> PaymentResponse:
+        refund_response = self.refund_processor.refund_payment(
+            transaction_id, idempotency_key=idempotency_key
+        )
         self.logger.log_refund(transaction_id, refund_response)
+        self._notify_refund(transaction_id, refund_response)
         return refund_response
 
+    def _notify_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        event = RefundEvent(transaction_id, refund_response)
+        self.listeners.notify_all(event, event.topic)
+
+    def process_refunds(
+        self,
+        transaction_ids: Union[Iterable[str], str, os.PathLike],
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        log_batch_size: int = 500,
+    ) -> RefundBatchReport:
+        """
+        Procesa reembolsos en bloque.
+
+        Los identificadores se consumen en streaming (desde un iterable o desde
+        un archivo con un identificador por línea) y se reembolsan en paralelo
+        con el procesador de reembolsos, con un máximo de 2 * max_workers
+        reembolsos pendientes. Las entradas del log se escriben por lotes de
+        log_batch_size en lugar de abrir el archivo en cada reembolso. Los
+        reembolsos que lanzan una excepción también se registran, como
+        fallidos; si una escritura del log falla, el error queda en el
+        log_error de cada reembolso de ese lote y el proceso continúa.
+
+        Args:
+            transaction_ids: Iterable de identificadores o ruta a un archivo
+            max_workers: Tamaño del pool; por defecto usa batch_workers
+            rate_limit: Máximo de reembolsos por segundo (opcional)
+            log_batch_size: Cantidad de reembolsos por escritura del log
+
+        Returns:
+            Un RefundBatchReport con el resultado de cada identificador, en el
+            orden de entrada, y el throughput total
+
+        Raises:
+            Exception: Si este servicio no tiene configurado un procesador de reembolsos
+        """
+        if not self.refund_processor:
+            raise Exception("this processor does not support refunds")
+        workers = self.batch_workers if max_workers is None else max_workers
+        if workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if isinstance(transaction_ids, (str, os.PathLike)):
+            transaction_ids = self._read_transaction_ids(transaction_ids)
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        def refund(transaction_id: str) -> PaymentResponse:
+            if limiter:
+                limiter.acquire()
+            return self.refund_processor.refund_payment(transaction_id)
+
+        outcomes: list[RefundOutcome] = []
+        to_log: list[tuple[RefundOutcome, PaymentResponse]] = []
+        pending: deque[tuple[str, Future[PaymentResponse]]] = deque()
+
+        def write_log():
+            try:
+                self.logger.log_refunds(
+                    [(outcome.transaction_id, response) for outcome, response in to_log]
+                )
+            except Exception as e:
+                print(f"Error logging refunds: {e}")
+                for outcome, _ in to_log:
+                    outcome.log_error = str(e)
+            to_log.clear()
+
+        def collect(transaction_id: str, future: Future[PaymentResponse]):
+            try:
+                response = future.result()
+            except Exception as e:
+                outcome = RefundOutcome(transaction_id=transaction_id, error=str(e))
+                response = PaymentResponse(status="failed", amount=0, message=str(e))
+            else:
+                outcome = RefundOutcome(transaction_id=transaction_id, response=response)
+                self._notify_refund(transaction_id, response)
+            outcomes.append(outcome)
+            to_log.append((outcome, response))
+            if len(to_log) >= log_batch_size:
+                write_log()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="refund-batch"
+        ) as executor:
+            for transaction_id in transaction_ids:
+                if len(pending) >= workers * 2:
+                    collect(*pending.popleft())
+                pending.append((transaction_id, executor.submit(refund, transaction_id)))
+            while pending:
+                collect(*pending.popleft())
+        write_log()
+        elapsed = time.perf_counter() - started
+
+        succeeded = sum(1 for outcome in outcomes if outcome.ok)
+        return RefundBatchReport(
+            outcomes=outcomes,
+            succeeded=succeeded,
+            failed=len(outcomes) - succeeded,
+            elapsed_seconds=elapsed,
+        )
+
+    @staticmethod
+    def _read_transaction_ids(path: Union[str, os.PathLike]) -> Iterator[str]:
+        with open(path) as ids_file:
+            for line in ids_file:
+                transaction_id = line.strip()
+                if transaction_id:
+                    yield transaction_id
+
     def setup_recurring(
         self, customer_data: CustomerData, payment_data: PaymentData
     ):
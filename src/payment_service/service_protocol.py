@@ -1,7 +1,8 @@
+import os
 from typing import Protocol
-from typing import Optional, Self
+from typing import Iterable, Optional, Self, Union
 
-from .commons import CustomerData, PaymentData, PaymentResponse
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse, RefundBatchReport
 from .loggers import TransactionLogger
 from .notifiers import NotifierProtocol
 from .processors import (
@@ -10,22 +11,41 @@ from .processors import (
     RefundProcessorProtocol,
 )
 from .validators import CustomerValidator, PaymentDataValidator, ChainHandler
-from listeners import ListenersManager
+from .listeners import ListenersManager
 
 class PaymentServiceProtocol(Protocol):
     payment_processor: PaymentProcessorProtocol
     notifier: NotifierProtocol
-    validators = ChainHandler
+    validators: ChainHandler
     logger: TransactionLogger
     listeners: ListenersManager
     refund_processor: Optional[RefundProcessorProtocol] = None
     recurring_processor: Optional[RecurringPaymentProcessorProtocol] = None
 
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse: ...
 
-    def process_refund(self, transaction_id: str): ...
+    def process_batch(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_workers: Optional[int] = None,
+    ) -> list[BatchItemResult]: ...
+
+    def process_refund(
+        self, transaction_id: str, idempotency_key: Optional[str] = None
+    ): ...
+
+    def process_refunds(
+        self,
+        transaction_ids: Union[Iterable[str], str, os.PathLike],
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        log_batch_size: int = 500,
+    ) -> RefundBatchReport: ...
 
     def setup_recurring(
         self, customer_data: CustomerData, payment_data: PaymentData
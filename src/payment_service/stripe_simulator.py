@@ -0,0 +1,393 @@
+"""
+Local stand-in for the parts of the Stripe API used by StripePaymentProcessor.
+
+Serves charges, refunds, customers, payment methods and subscriptions over
+HTTP/1.1 keep-alive, with configurable latency, error rate and 429 rate
+limiting. Point the processor at it with `api_base=simulator.url` or the
+`STRIPE_API_BASE` environment variable:
+
+    python -m payment_service.stripe_simulator --port 12111 --latency-ms 40
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .rate_limit import RateLimiter
+
+
+@dataclass
+class Latency:
+    """Latency distribution in milliseconds.
+
+    `distribution` is one of "constant", "uniform" (mean ± jitter_ms),
+    "normal" (jitter_ms is the standard deviation), "lognormal" (same, in
+    the log domain around the mean) or "exponential".
+    """
+
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+    distribution: str = "constant"
+
+    def sample(self, rng: random.Random) -> float:
+        match self.distribution:
+            case "constant":
+                value = self.mean_ms
+            case "uniform":
+                value = rng.uniform(
+                    self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms
+                )
+            case "normal":
+                value = rng.gauss(self.mean_ms, self.jitter_ms)
+            case "lognormal":
+                if self.mean_ms <= 0:
+                    return 0.0
+                sigma = self.jitter_ms / self.mean_ms
+                value = rng.lognormvariate(0.0, sigma) * self.mean_ms
+            case "exponential":
+                value = rng.expovariate(1 / self.mean_ms) if self.mean_ms else 0.0
+            case _:
+                raise ValueError(f"Unknown latency distribution {self.distribution}")
+        return max(value, 0.0)
+
+
+@dataclass
+class SimulatorConfig:
+    """
+    Behaviour of the simulated API.
+
+    Attributes:
+        latency: Default latency added to every response
+        endpoint_latency: Per-resource overrides, e.g. {"charges": Latency(80)}
+        error_rate: Probability of answering 500 api_error
+        decline_rate: Probability of declining a charge with 402 card_error
+        rate_limit: Requests per second accepted before answering 429
+        price_amount: unit_amount reported for subscription prices
+        seed: Seed for latency and error sampling, for reproducible runs
+    """
+
+    latency: Latency = field(default_factory=Latency)
+    endpoint_latency: dict[str, Latency] = field(default_factory=dict)
+    error_rate: float = 0.0
+    decline_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    price_amount: int = 1000
+    seed: Optional[int] = None
+
+
+class _SimulatorError(Exception):
+    def __init__(
+        self, status: int, type: str, message: str, code: Optional[str] = None
+    ):
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": {"type": type, "message": message}}
+        if code:
+            self.body["error"]["code"] = code
+
+
+class StripeSimulator:
+    """
+    In-memory Stripe API served from a background thread.
+
+    Use it as a context manager or call `start` and `stop`. `stats` reports
+    accepted connections, requests per endpoint and responses per status,
+    which is enough to check connection reuse, concurrency and retries.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or SimulatorConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._limiter = (
+            RateLimiter(self.config.rate_limit) if self.config.rate_limit else None
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._objects: dict[str, dict] = {}
+        self._connections = 0
+        self._requests: Counter[str] = Counter()
+        self._statuses: Counter[int] = Counter()
+
+        handler = type("Handler", (_Handler,), {"simulator": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StripeSimulator":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stripe-simulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StripeSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self._connections,
+                "requests": sum(self._requests.values()),
+                "endpoints": dict(self._requests),
+                "statuses": dict(self._statuses),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._connections = 0
+            self._requests.clear()
+            self._statuses.clear()
+
+    def _connected(self):
+        with self._lock:
+            self._connections += 1
+
+    def _handle(
+        self, method: str, path: str, form: dict[str, str]
+    ) -> tuple[int, dict]:
+        parts = [part for part in urlsplit(path).path.split("/") if part]
+        if len(parts) < 2 or parts[0] != "v1":
+            error = _SimulatorError(
+                404, "invalid_request_error",
+                f"Unrecognized request URL ({method}: {path})",
+            )
+            return error.status, error.body
+        resource = parts[1]
+        with self._lock:
+            self._requests[f"{method} /v1/{resource}"] += 1
+
+        latency = self.config.endpoint_latency.get(resource, self.config.latency)
+        with self._rng_lock:
+            delay = latency.sample(self._rng)
+            failing = self._rng.random() < self.config.error_rate
+            declining = self._rng.random() < self.config.decline_rate
+        if delay:
+            time.sleep(delay / 1000)
+
+        try:
+            if self._limiter and not self._limiter.try_acquire():
+                raise _SimulatorError(
+                    429, "invalid_request_error", "Too many requests", "rate_limit"
+                )
+            if failing:
+                raise _SimulatorError(500, "api_error", "Simulated API error")
+            return 200, self._route(method, resource, parts[2:], form, declining)
+        except _SimulatorError as e:
+            return e.status, e.body
+
+    def _route(
+        self,
+        method: str,
+        resource: str,
+        rest: list[str],
+        form: dict[str, str],
+        declining: bool,
+    ) -> dict:
+        match (method, resource, rest):
+            case ("POST", "charges", []):
+                if declining:
+                    raise _SimulatorError(
+                        402, "card_error", "Your card was declined.", "card_declined"
+                    )
+                return self._create("ch", {
+                    "object": "charge",
+                    "amount": int(form.get("amount", 0)),
+                    "currency": form.get("currency", "usd"),
+                    "source": form.get("source"),
+                    "description": form.get("description"),
+                    "status": "succeeded",
+                })
+            case ("POST", "refunds", []):
+                charge = self._get("ch", form.get("charge", ""))
+                return self._create("re", {
+                    "object": "refund",
+                    "amount": charge["amount"],
+                    "charge": charge["id"],
+                    "status": "succeeded",
+                })
+            case ("POST", "customers", []):
+                return self._create("cus", {
+                    "object": "customer",
+                    "name": form.get("name"),
+                    "email": form.get("email"),
+                    "invoice_settings": {"default_payment_method": None},
+                })
+            case ("GET", "customers", [customer_id]):
+                return self._get("cus", customer_id)
+            case ("POST", "customers", [customer_id]):
+                customer = self._get("cus", customer_id)
+                default = form.get("invoice_settings[default_payment_method]")
+                if default is not None:
+                    with self._lock:
+                        customer["invoice_settings"]["default_payment_method"] = default
+                return customer
+            case ("GET", "payment_methods", [payment_method_id]):
+                return self._payment_method(payment_method_id)
+            case ("POST", "payment_methods", [payment_method_id, "attach"]):
+                payment_method = self._payment_method(payment_method_id)
+                customer = self._get("cus", form.get("customer", ""))
+                with self._lock:
+                    payment_method["customer"] = customer["id"]
+                return payment_method
+            case ("POST", "subscriptions", []):
+                customer = self._get("cus", form.get("customer", ""))
+                price = form.get("items[0][price]", "")
+                return self._create("sub", {
+                    "object": "subscription",
+                    "customer": customer["id"],
+                    "status": "active",
+                    "default_payment_method": form.get("default_payment_method"),
+                    "items": {
+                        "object": "list",
+                        "data": [{
+                            "object": "subscription_item",
+                            "price": {
+                                "object": "price",
+                                "id": price,
+                                "unit_amount": self.config.price_amount,
+                            },
+                        }],
+                    },
+                })
+        raise _SimulatorError(
+            404, "invalid_request_error",
+            f"Unrecognized request URL ({method}: /v1/{resource})",
+        )
+
+    def _create(self, prefix: str, fields: dict) -> dict:
+        obj = {"id": f"{prefix}_sim_{next(self._ids)}", "livemode": False, **fields}
+        with self._lock:
+            self._objects[obj["id"]] = obj
+        return obj
+
+    def _get(self, prefix: str, object_id: str) -> dict:
+        with self._lock:
+            obj = self._objects.get(object_id)
+        if obj is None or not object_id.startswith(prefix + "_"):
+            raise _SimulatorError(
+                404, "invalid_request_error",
+                f"No such object: '{object_id}'", "resource_missing",
+            )
+        return obj
+
+    def _payment_method(self, payment_method_id: str) -> dict:
+        with self._lock:
+            obj = self._objects.get(payment_method_id)
+            if obj is None:
+                obj = self._objects[payment_method_id] = {
+                    "id": payment_method_id,
+                    "object": "payment_method",
+                    "type": "card",
+                    "customer": None,
+                    "livemode": False,
+                }
+        return obj
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    simulator: StripeSimulator
+
+    def setup(self):
+        super().setup()
+        self.simulator._connected()
+
+    def do_GET(self):
+        self._respond("GET")
+
+    def do_POST(self):
+        self._respond("POST")
+
+    def do_DELETE(self):
+        self._respond("DELETE")
+
+    def _respond(self, method: str):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode() if length else ""
+        query = urlsplit(self.path).query
+        form = dict(parse_qsl(body or query, keep_blank_values=True))
+
+        status, payload = self.simulator._handle(method, self.path, form)
+        with self.simulator._lock:
+            self.simulator._statuses[status] += 1
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Request-Id", f"req_sim_{next(self.simulator._ids)}")
+        if status in (429, 500):
+            self.send_header("Stripe-Should-Retry", "true")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Stripe API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--distribution",
+        default="constant",
+        choices=["constant", "uniform", "normal", "lognormal", "exponential"],
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--decline-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        latency=Latency(args.latency_ms, args.jitter_ms, args.distribution),
+        error_rate=args.error_rate,
+        decline_rate=args.decline_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    simulator = StripeSimulator(config, host=args.host, port=args.port)
+    print(f"Stripe simulator listening on {simulator.url}")
+    try:
+        simulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator._server.server_close()
+        print(json.dumps(simulator.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import json
+import os
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.listeners import AccountingListener, PaymentEvent, RefundEvent, Totals
+from payment_service.listeners.accounting import UNKNOWN
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+
+
+def payment(number: int, currency: str = "USD", amount: int = 100) -> PaymentEvent:
+    return PaymentEvent(
+        PaymentResponse(status="succeeded", amount=amount, transaction_id=f"ch_{number}"),
+        CUSTOMER,
+        PaymentData(amount=amount, source="tok_visa", currency=currency),
+        processor="Stripe",
+        timestamp=1000.0 + number,
+    )
+
+
+def refund(number: int, amount: int = 100) -> RefundEvent:
+    return RefundEvent(
+        f"ch_{number}",
+        PaymentResponse(status="succeeded", amount=amount, transaction_id=f"re_{number}"),
+        timestamp=2000.0 + number,
+    )
+
+
+def listener(path, **kwargs) -> AccountingListener:
+    return AccountingListener(
+        checkpoint_path=str(path), checkpoint_interval=float("inf"), checkpoint_on_exit=False, **kwargs
+    )
+
+
+def test_replays_the_journal_after_a_crash(tmp_path):
+    path = tmp_path / "accounting.json"
+    before = listener(path)
+    before.notify_batch([payment(1), payment(2, "EUR")])
+    before.checkpoint()
+    before.notify_batch([payment(3), refund(2, 40)])
+    expected = before.snapshot()
+    # Crash: no final checkpoint, and the last journal line is torn.
+    before._journal.close()
+    with open(f"{path}.journal", "ab") as journal:
+        journal.write(b'["payment",1004.0,"ch_4"')
+
+    after = listener(path)
+    assert after.snapshot().to_dict() == expected.to_dict()
+    assert after.snapshot().by_currency["EUR"] == Totals(count=1, amount=100, refunds=1, refunded=40)
+
+    after.notify(payment(5))
+    after.close()
+    reopened = listener(path)
+    assert reopened.snapshot().totals.count == 4
+    reopened.close()
+
+
+def test_checkpoint_truncates_the_journal(tmp_path):
+    path = tmp_path / "accounting.json"
+    accounting = listener(path)
+    accounting.notify_batch([payment(number) for number in range(100)])
+    journal = f"{path}.journal"
+    assert os.path.getsize(journal) > 5000
+
+    accounting.checkpoint()
+
+    with open(journal, "rb") as file:
+        header, *entries = file.read().splitlines()
+    assert entries == []
+    with open(path, encoding="utf-8") as checkpoint:
+        state = json.load(checkpoint)
+    assert state["journal_offset"] == json.loads(header)["base"] > 0
+    assert state["events"] == 100
+    accounting.close()
+
+
+def test_refund_attribution_is_bounded_by_max_tracked(tmp_path):
+    path = tmp_path / "accounting.json"
+    accounting = listener(path, max_tracked=2)
+    accounting.notify_batch([payment(1, "EUR"), payment(2, "EUR"), payment(3, "EUR")])
+    accounting.close()
+
+    restored = listener(path, max_tracked=2)
+    restored.notify_batch([refund(1), refund(3)])
+
+    by_currency = restored.snapshot().by_currency
+    assert by_currency[UNKNOWN].refunds == 1
+    assert by_currency["EUR"].refunds == 1
+    restored.close()
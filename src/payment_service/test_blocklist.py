@@ -0,0 +1,83 @@
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.listeners import ListenersManager
+from payment_service.loggers import TransactionLogger
+from payment_service.service import PaymentService
+from payment_service.validators import Blocklist, BlocklistHandler, CustomerHandler, build_blocklist
+
+
+@pytest.fixture
+def blocklist(tmp_path):
+    path = tmp_path / "blocklist.bin"
+    sources = [f"tok_stolen_{i}" for i in range(1000)]
+    assert build_blocklist(path, sources=sources, emails=["Fraud@Mail.co"]) == 1001
+    with Blocklist(path) as blocklist:
+        yield blocklist
+
+
+def test_exact_and_normalized_matches(blocklist):
+    assert blocklist.contains_source("tok_stolen_0")
+    assert blocklist.contains_source("tok_stolen_999")
+    # Sources are opaque tokens and only match exactly.
+    assert not blocklist.contains_source("TOK_STOLEN_0")
+    assert not blocklist.contains_source("tok_visa")
+    # Emails are matched case-insensitively, ignoring surrounding spaces.
+    assert blocklist.contains_email("fraud@mail.co")
+    assert blocklist.contains_email("  FRAUD@mail.CO ")
+    assert not blocklist.contains_email("jon@mail.co")
+
+
+def test_empty_blocklist_blocks_nothing(tmp_path):
+    path = tmp_path / "empty.bin"
+    assert build_blocklist(path) == 0
+
+    with Blocklist(path) as blocklist:
+        assert len(blocklist) == 0
+        assert not blocklist.contains_source("tok_visa")
+        assert not blocklist.contains_email("jon@mail.co")
+
+
+def test_rejects_files_that_are_not_blocklists(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        Blocklist(path)
+
+
+class RecordingProcessor:
+    def __init__(self):
+        self.charged = []
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        self.charged.append(payment_data.source)
+        return PaymentResponse(status="succeeded", amount=payment_data.amount)
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def test_payment_service_rejects_blocklisted_payments(tmp_path, blocklist):
+    processor = RecordingProcessor()
+    validators = CustomerHandler()
+    validators.set_next(BlocklistHandler(blocklist))
+    service = PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        validators=validators,
+        logger=TransactionLogger(path=str(tmp_path / "transactions.log")),
+        listeners=ListenersManager(),
+    )
+    customer = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+    fraudster = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="FRAUD@mail.co"))
+
+    with pytest.raises(ValueError, match="source is blocklisted"):
+        service.process_transaction(customer, PaymentData(amount=10, source="tok_stolen_7"))
+    with pytest.raises(ValueError, match="email is blocklisted"):
+        service.process_transaction(fraudster, PaymentData(amount=10, source="tok_visa"))
+    service.process_transaction(customer, PaymentData(amount=10, source="tok_visa"))
+
+    assert processor.charged == ["tok_visa"]
@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.loggers import BufferedTransactionLogger, JsonLinesFormatter
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def log_payments(logger, first: int, count: int):
+    for number in range(first, first + count):
+        logger.log_transaction(
+            CUSTOMER,
+            PaymentData(amount=number, source="tok_visa"),
+            PaymentResponse(status="succeeded", amount=number, transaction_id=f"ch_{number}"),
+        )
+
+
+def test_concurrent_writers_produce_intact_records(tmp_path):
+    path = tmp_path / "transactions.log"
+    logger = BufferedTransactionLogger(
+        path=str(path), formatter=JsonLinesFormatter(), max_buffer_size=1000, flush_on_exit=False
+    )
+    threads = [
+        threading.Thread(target=log_payments, args=(logger, worker * 200, 200))
+        for worker in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.close()
+
+    with open(path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert sorted(record["amount"] for record in records) == list(range(1600))
+
+
+def test_close_flushes_the_buffer(tmp_path):
+    path = tmp_path / "transactions.log"
+    logger = BufferedTransactionLogger(path=str(path), flush_interval=None, flush_on_exit=False)
+    log_payments(logger, 1, 3)
+    assert path.read_text() == ""
+
+    logger.close()
+    assert path.read_text().count("Transaction ID: ch_") == 3
+    with pytest.raises(RuntimeError):
+        log_payments(logger, 4, 1)
+
+
+def test_buffer_is_flushed_at_exit(tmp_path):
+    path = tmp_path / "transactions.log"
+    script = f"""
+from payment_service.loggers import BufferedTransactionLogger
+logger = BufferedTransactionLogger(path={str(path)!r}, flush_interval=None)
+logger._write("pending\\n")
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=SRC, check=True, timeout=30)
+
+    assert path.read_text() == "pending\n"
+
+
+class FullDisk:
+    """Wraps the log file; every write fails."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, text):
+        raise OSError("No space left on device")
+
+    def close(self):
+        self.file.close()
+
+    @property
+    def closed(self):
+        return self.file.closed
+
+
+def test_close_releases_the_handle_when_the_final_flush_fails(tmp_path):
+    logger = BufferedTransactionLogger(
+        path=str(tmp_path / "transactions.log"), flush_interval=None
+    )
+    log_payments(logger, 1, 1)
+    logger._file = FullDisk(logger._file)
+
+    with pytest.raises(OSError):
+        logger.close()
+    assert logger._file.closed
+    # A second close, e.g. from the exit hook, does nothing.
+    assert logger.close()
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+
+from payment_service.listeners import BackpressurePolicy, EventBus, EventTopic
+
+
+class GatedListener:
+    """Records events; blocks inside `notify` until the gate opens."""
+
+    def __init__(self):
+        self.received = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def notify(self, event):
+        self.entered.set()
+        self.gate.wait()
+        self.received.append(event)
+
+
+class BatchRecorder:
+    def __init__(self):
+        self.batches = []
+
+    def notify_batch(self, events):
+        self.batches.append(list(events))
+
+
+def stalled_bus(**kwargs) -> tuple[EventBus, GatedListener]:
+    """A bus whose only worker is stuck delivering event 0."""
+    bus = EventBus(drain_on_exit=False, **kwargs)
+    listener = GatedListener()
+    bus.subscribe(listener)
+    bus.notify_all(0)
+    assert listener.entered.wait(5)
+    return bus, listener
+
+
+def test_delivers_in_order_and_flushes():
+    bus = EventBus(drain_on_exit=False)
+    recorder = BatchRecorder()
+    bus.subscribe(recorder)
+
+    for i in range(500):
+        bus.notify_all(i)
+
+    assert bus.flush(5)
+    assert [event for batch in recorder.batches for event in batch] == list(range(500))
+    assert bus.close(5)
+    with pytest.raises(RuntimeError):
+        bus.notify_all(500)
+
+
+def test_routes_events_by_topic():
+    bus = EventBus(drain_on_exit=False)
+    succeeded, everything = BatchRecorder(), BatchRecorder()
+    bus.subscribe(succeeded, [EventTopic.PAYMENT_SUCCEEDED])
+    bus.subscribe(everything)
+
+    bus.notify_all("ok", EventTopic.PAYMENT_SUCCEEDED)
+    bus.notify_all("denied", EventTopic.PAYMENT_DENIED)
+    bus.close(5)
+
+    assert [event for batch in succeeded.batches for event in batch] == ["ok"]
+    assert [event for batch in everything.batches for event in batch] == ["ok", "denied"]
+
+
+def test_block_policy_waits_for_room():
+    bus, listener = stalled_bus(maxsize=2, policy=BackpressurePolicy.BLOCK)
+    bus.notify_all(1)
+    bus.notify_all(2)
+    publisher = threading.Thread(target=bus.notify_all, args=(3,))
+    publisher.start()
+
+    time.sleep(0.05)
+    assert publisher.is_alive()
+
+    listener.gate.set()
+    publisher.join(5)
+    assert not publisher.is_alive()
+    assert bus.close(5)
+    assert listener.received == [0, 1, 2, 3]
+    assert bus.dropped == 0
+
+
+def test_drop_oldest_policy_keeps_the_newest_events():
+    bus, listener = stalled_bus(maxsize=3, policy=BackpressurePolicy.DROP_OLDEST)
+    for i in range(1, 11):
+        bus.notify_all(i)
+
+    assert bus.dropped == 7
+    listener.gate.set()
+    assert bus.close(5)
+    assert listener.received == [0, 8, 9, 10]
+
+
+def test_spill_policy_keeps_every_event_in_order(tmp_path):
+    bus, listener = stalled_bus(
+        maxsize=3,
+        policy=BackpressurePolicy.SPILL,
+        spill_path=str(tmp_path / "spill.bin"),
+    )
+    for i in range(1, 11):
+        bus.notify_all(i)
+
+    assert bus.spilled == 7
+    assert bus.pending == 11
+    listener.gate.set()
+    assert bus.close(5)
+    assert listener.received == list(range(11))
+    assert bus.pending == 0
+
+
+def test_unreadable_spill_counts_events_as_failed(tmp_path):
+    spill_path = tmp_path / "spill.bin"
+    bus, listener = stalled_bus(
+        maxsize=1, policy=BackpressurePolicy.SPILL, spill_path=str(spill_path)
+    )
+    for i in range(1, 5):
+        bus.notify_all(i)
+    assert bus.spilled == 3
+    with open(spill_path, "r+b") as spill:
+        spill.write(b"not a pickle")
+
+    listener.gate.set()
+    assert bus.flush(5)
+    assert listener.received == [0, 1]
+    assert bus.failed == 3
+    assert bus.close(5)
+
+
+def test_close_timeout_leaves_the_spill_file_to_the_workers(tmp_path):
+    bus, listener = stalled_bus(
+        maxsize=1,
+        policy=BackpressurePolicy.SPILL,
+        spill_path=str(tmp_path / "spill.bin"),
+    )
+    for i in range(1, 4):
+        bus.notify_all(i)
+
+    assert not bus.close(0.05)
+    assert bus._spill_file is not None
+
+    listener.gate.set()
+    assert bus.flush(5)
+    assert listener.received == [0, 1, 2, 3]
+    for thread in bus._threads:
+        thread.join(5)
+    assert bus._spill_file is None
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.loggers import GroupCommitTransactionLogger, JsonLinesFormatter
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def log_payments(logger, first: int, count: int):
+    for number in range(first, first + count):
+        logger.log_transaction(
+            CUSTOMER,
+            PaymentData(amount=number, source="tok_visa"),
+            PaymentResponse(status="succeeded", amount=number, transaction_id=f"ch_{number}"),
+        )
+
+
+def test_concurrent_writers_produce_intact_records(tmp_path):
+    path = tmp_path / "transactions.log"
+    logger = GroupCommitTransactionLogger(
+        path=str(path), formatter=JsonLinesFormatter(), flush_on_exit=False
+    )
+    threads = [
+        threading.Thread(target=log_payments, args=(logger, worker * 100, 100))
+        for worker in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert logger.close(5)
+
+    with open(path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert sorted(record["amount"] for record in records) == list(range(800))
+    metrics = logger.metrics()
+    assert metrics.records == 800
+    assert metrics.commits <= 800
+
+
+def test_write_errors_reach_every_caller_of_the_batch(tmp_path):
+    logger = GroupCommitTransactionLogger(path=str(tmp_path / "transactions.log"), flush_on_exit=False)
+    logger._file.close()
+
+    with pytest.raises(ValueError):
+        log_payments(logger, 1, 1)
+    logger.close(5)
+    with pytest.raises(RuntimeError):
+        log_payments(logger, 2, 1)
+
+
+def test_open_batch_is_committed_at_exit(tmp_path):
+    path = tmp_path / "transactions.log"
+    script = f"""
+import threading
+from payment_service.loggers import GroupCommitTransactionLogger
+logger = GroupCommitTransactionLogger(path={str(path)!r}, max_delay=60)
+# The writer waits for its batch, which only the exit hook commits.
+threading.Thread(target=logger._write, args=("pending\\n",), daemon=True).start()
+while not logger._batch.records:
+    pass
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=SRC, check=True, timeout=30)
+
+    assert path.read_text() == "pending\n"
@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.idempotency import IdempotencyCache, fingerprint
+from payment_service.listeners import ListenersManager
+from payment_service.loggers import TransactionLogger
+from payment_service.service import PaymentService
+from payment_service.validators import CustomerHandler
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+
+
+class CountingOperation:
+    def __init__(self, *statuses: str):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self) -> PaymentResponse:
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return PaymentResponse(status=status, amount=100, transaction_id=f"ch_{self.calls}")
+
+
+def test_retry_gets_the_stored_response():
+    cache = IdempotencyCache()
+    operation = CountingOperation("succeeded")
+
+    first = cache.get_or_run("key", operation, "payload")
+    second = cache.get_or_run("key", operation, "payload")
+
+    assert second == first
+    assert operation.calls == 1
+
+
+def test_failed_responses_are_not_stored():
+    cache = IdempotencyCache()
+    operation = CountingOperation("failed", "succeeded")
+
+    assert cache.get_or_run("key", operation, "payload").status == "failed"
+    assert cache.get_or_run("key", operation, "payload").status == "succeeded"
+    assert cache.get_or_run("key", operation, "payload").status == "succeeded"
+    assert operation.calls == 2
+
+
+def test_key_reused_with_another_payload_is_rejected():
+    cache = IdempotencyCache()
+    operation = CountingOperation("succeeded")
+    cache.get_or_run("key", operation, fingerprint(PaymentData(amount=100, source="tok_visa")))
+
+    with pytest.raises(ValueError):
+        cache.get_or_run("key", operation, fingerprint(PaymentData(amount=999, source="tok_visa")))
+    assert operation.calls == 1
+
+
+def test_concurrent_retries_run_once():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def operation():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return PaymentResponse(status="succeeded", amount=100, transaction_id="ch_1")
+
+    results, errors = [], []
+
+    def retry(payload):
+        try:
+            results.append(cache.get_or_run("key", operation, payload))
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=retry, args=("payload",))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=retry, args=("payload",)) for _ in range(4)]
+    mismatch = threading.Thread(target=retry, args=("other payload",))
+    for thread in [*followers, mismatch]:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers, mismatch]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert len(errors) == 1
+
+
+class ChargingProcessor:
+    def __init__(self):
+        self.charges = []
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        self.charges.append((payment_data.amount, idempotency_key))
+        return PaymentResponse(status="succeeded", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def test_service_charges_once_per_key(tmp_path):
+    processor = ChargingProcessor()
+    service = PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        validators=CustomerHandler(),
+        logger=TransactionLogger(path=str(tmp_path / "transactions.log")),
+        listeners=ListenersManager(),
+        idempotency_cache=IdempotencyCache(),
+    )
+    payment = PaymentData(amount=100, source="tok_visa")
+
+    service.process_transaction(CUSTOMER, payment, idempotency_key="order-1")
+    service.process_transaction(CUSTOMER, payment, idempotency_key="order-1")
+    with pytest.raises(ValueError):
+        service.process_transaction(
+            CUSTOMER, PaymentData(amount=200, source="tok_visa"), idempotency_key="order-1"
+        )
+
+    assert processor.charges == [(100, "order-1")]
@@ -0,0 +1,55 @@
+import asyncio
+import gc
+
+import pytest
+
+from payment_service.listeners import AsyncListenersManager, EventBus, EventTopic, ListenersManager
+
+
+class Recorder:
+    def __init__(self):
+        self.received = []
+
+    def notify(self, event):
+        self.received.append(event)
+
+
+class AsyncRecorder(Recorder):
+    async def notify(self, event):
+        self.received.append(event)
+
+
+def test_listeners_can_be_passed_and_assigned():
+    first, second = Recorder(), Recorder()
+    manager = ListenersManager(listeners=[first])
+    assert manager.listeners == [first]
+
+    manager.listeners = [second]
+    manager.notify_all("event", EventTopic.PAYMENT_SUCCEEDED)
+
+    assert manager.listeners == [second]
+    assert first.received == [] and second.received == ["event"]
+    bus = EventBus(listeners=[first], drain_on_exit=False)
+    assert bus.listeners == [first]
+    bus.close(5)
+
+
+def test_async_manager_routes_by_topic_and_drops_weak_listeners():
+    manager = AsyncListenersManager()
+    succeeded, everything, weak = AsyncRecorder(), AsyncRecorder(), AsyncRecorder()
+    manager.subscribe(succeeded, [EventTopic.PAYMENT_SUCCEEDED])
+    manager.subscribe(everything)
+    manager.subscribe(weak, weak=True)
+
+    asyncio.run(manager.notify_all("ok", EventTopic.PAYMENT_SUCCEEDED))
+    asyncio.run(manager.notify_all("denied", EventTopic.PAYMENT_DENIED))
+    assert succeeded.received == ["ok"]
+    assert everything.received == ["ok", "denied"]
+    assert weak.received == ["ok", "denied"]
+
+    del weak
+    gc.collect()
+    assert len(manager.listeners) == 2
+    manager.unsubcribe(succeeded)
+    with pytest.raises(ValueError):
+        manager.unsubcribe(succeeded)
@@ -0,0 +1,144 @@
+import gzip
+import os
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.loggers import JsonLinesFormatter, RotatingFile, RotationPolicy, TransactionLogger
+from payment_service.loggers.index import TransactionLogReader
+
+LINE = "x" * 29 + "\n"
+
+
+def read_segment(path: str) -> str:
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt") as file:
+            return file.read()
+    with open(path) as file:
+        return file.read()
+
+
+def test_rotates_by_size_without_splitting_records(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    log = RotatingFile(path, RotationPolicy(max_bytes=100, max_segments=None, compress=False))
+    for _ in range(10):
+        log.write(LINE)
+    log.close()
+
+    segments = log.segments()
+    assert [os.path.basename(segment) for segment in segments] == [
+        "transactions.log.000001", "transactions.log.000002", "transactions.log.000003"
+    ]
+    assert all(os.path.getsize(segment) <= 100 for segment in segments)
+    assert "".join(read_segment(path) for path in [*segments, path]) == LINE * 10
+
+
+def test_rotates_by_age(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "transactions.log")
+    log = RotatingFile(
+        path,
+        RotationPolicy(max_bytes=None, interval=60, compress=False),
+        clock=lambda: now[0],
+    )
+    log.write(LINE)
+    now[0] = 30
+    log.write(LINE)
+    now[0] = 61
+    log.write(LINE)
+    log.close()
+
+    assert [read_segment(segment) for segment in log.segments()] == [LINE * 2]
+    assert read_segment(path) == LINE
+
+
+def test_compresses_and_prunes_closed_segments(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, max_segments=2, compress=True))
+    for i in range(6):
+        log.write(f"{i:029d}\n")
+    log.close()
+
+    segments = log.segments()
+    assert [os.path.basename(segment) for segment in segments] == [
+        "transactions.log.000004.gz", "transactions.log.000005.gz"
+    ]
+    assert [read_segment(segment) for segment in segments] == [f"{3:029d}\n", f"{4:029d}\n"]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_prunes_segments_older_than_max_age(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, max_segments=None, max_age=3600, compress=False))
+    log.write(LINE)
+    log.write(LINE)
+    log.close()
+    os.utime(log.segments()[0], (0, 0))
+
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, max_segments=None, max_age=3600, compress=False))
+    log.write(LINE)
+    log.close()
+
+    assert [os.path.basename(segment) for segment in log.segments()] == ["transactions.log.000002"]
+
+
+def test_sidecar_indexes_move_with_their_segment(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    with open(f"{path}.transaction.idx", "w") as index:
+        index.write("index")
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, compress=False))
+    log.write(LINE)
+    log.write(LINE)
+    log.close()
+
+    assert not os.path.exists(f"{path}.transaction.idx")
+    assert os.path.exists(f"{path}.000001.transaction.idx")
+
+
+def test_transaction_logger_writes_through_the_rotating_file(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    logger = TransactionLogger(path=path, rotation=RotationPolicy(max_bytes=40, compress=False))
+    for _ in range(3):
+        logger._write(LINE)
+    assert logger.close()
+
+    assert read_segment(f"{path}.000001") == LINE
+    assert read_segment(f"{path}.000002") == LINE
+    assert read_segment(path) == LINE
+
+
+def test_reopening_finishes_interrupted_compression(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, compress=False))
+    log.write(LINE)
+    log.write(LINE)
+    log.close()
+    # An exit during compression leaves a partial archive and the original.
+    with open(f"{path}.000001.gz.tmp", "wb") as partial:
+        partial.write(b"\x1f\x8b")
+
+    log = RotatingFile(path, RotationPolicy(max_bytes=30, compress=True))
+    log.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["transactions.log", "transactions.log.000001.gz"]
+    assert read_segment(f"{path}.000001.gz") == LINE
+
+
+def test_segments_stay_queryable_by_default(tmp_path):
+    path = str(tmp_path / "transactions.log")
+    logger = TransactionLogger(
+        path=path, formatter=JsonLinesFormatter(), rotation=RotationPolicy(max_bytes=300)
+    )
+    customer = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+    for number in range(4):
+        logger.log_transaction(
+            customer,
+            PaymentData(amount=number + 1, source="tok_visa"),
+            PaymentResponse(status="succeeded", amount=number + 1, transaction_id=f"ch_{number}"),
+        )
+    logger.close()
+
+    log = RotatingFile(path, RotationPolicy())
+    segments = log.segments()
+    log.close()
+    assert segments and not any(segment.endswith(".gz") for segment in segments)
+    with TransactionLogReader([*segments, path]) as reader:
+        assert len(reader.find_customer("jon@mail.co")) == 4
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.listeners import ListenersManager
+from payment_service.loggers import TransactionLogger
+from payment_service.post_processing import PostProcessingQueue
+from payment_service.service import PaymentService
+from payment_service.validators import CustomerHandler
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+
+
+def test_runs_tasks_in_order_and_counts_failures():
+    post_processor = PostProcessingQueue(drain_on_exit=False)
+    done = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    for i in range(100):
+        post_processor.submit(done.append, i)
+    post_processor.submit(fail)
+
+    assert post_processor.flush(5)
+    assert done == list(range(100))
+    assert post_processor.failed == 1
+    assert post_processor.close(5)
+    with pytest.raises(RuntimeError):
+        post_processor.submit(done.append, 100)
+
+
+def test_close_returns_within_timeout_when_the_queue_is_full():
+    post_processor = PostProcessingQueue(maxsize=2, drain_on_exit=False)
+    gate = threading.Event()
+    for _ in range(3):
+        post_processor.submit(gate.wait, 5)
+
+    started = time.monotonic()
+    assert not post_processor.close(0.2)
+    assert time.monotonic() - started < 1
+    gate.set()
+
+
+class Processor:
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        return PaymentResponse(status="succeeded", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class Notifier:
+    def __init__(self):
+        self.sent = 0
+
+    def send_confirmation(self, customer_data):
+        self.sent += 1
+
+
+class BrokenListener:
+    def notify(self, event):
+        raise RuntimeError("listener down")
+
+
+def test_a_failing_listener_does_not_lose_the_log_line(tmp_path):
+    path = tmp_path / "transactions.log"
+    listeners = ListenersManager()
+    listeners.subscribe(BrokenListener())
+    notifier = Notifier()
+    post_processor = PostProcessingQueue(drain_on_exit=False)
+    service = PaymentService(
+        payment_processor=Processor(),
+        notifier=notifier,
+        validators=CustomerHandler(),
+        logger=TransactionLogger(path=str(path)),
+        listeners=listeners,
+        post_processor=post_processor,
+    )
+
+    service.process_transaction(CUSTOMER, PaymentData(amount=10, source="tok_visa"))
+    assert post_processor.close(5)
+
+    assert post_processor.failed == 1
+    assert notifier.sent == 1
+    assert "Transaction ID: ch_1" in path.read_text()
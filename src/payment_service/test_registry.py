@@ -0,0 +1,73 @@
+import pytest
+
+from payment_service.commons import PaymentData, PaymentType
+from payment_service.processors import ANY_CURRENCY, LocalPaymentProcessor, ProcessorRegistry
+
+
+class Closable:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def payment(currency: str = "USD", type: PaymentType = PaymentType.ONLINE) -> PaymentData:
+    return PaymentData(amount=100, source="tok_visa", currency=currency, type=type)
+
+
+def test_routes_by_type_and_currency_with_fallback():
+    registry = ProcessorRegistry()
+    registry.register("Usd", PaymentType.ONLINE, "usd", factory=Closable)
+    registry.register("Any", PaymentType.ONLINE, factory=Closable)
+
+    assert registry.registration_for(payment("USD")).name == "Usd"
+    assert registry.registration_for(payment("eur")).name == "Any"
+    with pytest.raises(ValueError):
+        registry.resolve(payment(type=PaymentType.OFFLINE))
+
+
+def test_shared_instances_are_built_once_and_lazily():
+    registry = ProcessorRegistry()
+    registry.register("LocalPaymentProcessor", PaymentType.ONLINE, ANY_CURRENCY)
+    registry.register("Fresh", PaymentType.OFFLINE, factory=Closable, shared=False)
+
+    assert registry.resolve(payment()) is registry.resolve(payment("EUR"))
+    assert isinstance(registry.get("LocalPaymentProcessor"), LocalPaymentProcessor)
+    fresh = payment(type=PaymentType.OFFLINE)
+    assert registry.resolve(fresh) is not registry.resolve(fresh)
+
+
+def test_eviction_does_not_close_instances_still_in_use():
+    registry = ProcessorRegistry()
+    registry.register("Stripe", PaymentType.ONLINE, factory=Closable)
+    in_use = registry.resolve(payment())
+
+    registry.register("Stripe", PaymentType.ONLINE, factory=lambda: Closable())
+    replacement = registry.resolve(payment())
+    assert replacement is not in_use
+    assert not in_use.closed
+
+    registry.unregister(PaymentType.ONLINE)
+    assert not replacement.closed
+    with pytest.raises(ValueError):
+        registry.get("Stripe")
+
+
+def test_reregistering_the_same_factory_keeps_the_instance():
+    registry = ProcessorRegistry()
+    registry.register("Stripe", PaymentType.ONLINE, "USD", factory=Closable)
+    instance = registry.resolve(payment())
+
+    registry.register("Stripe", PaymentType.ONLINE, "EUR", factory=Closable)
+    assert registry.resolve(payment("EUR")) is instance
+
+
+def test_close_closes_the_instances_it_holds():
+    registry = ProcessorRegistry()
+    registry.register("Stripe", PaymentType.ONLINE, factory=Closable)
+    instance = registry.resolve(payment())
+
+    registry.close()
+    assert instance.closed
+    assert registry.resolve(payment()) is not instance
@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.processors import LatencyAwareRouter, Route
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+PAYMENT = PaymentData(amount=100, source="tok_visa")
+
+
+class Backend:
+    def __init__(self, response: PaymentResponse = None, error: Exception = None):
+        self.response = response or PaymentResponse(status="succeeded", amount=100)
+        self.error = error
+        self.calls = 0
+        self.gate = None
+        self.lock = threading.Lock()
+        self.in_flight = self.peak = 0
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            if self.error is not None:
+                raise self.error
+            return self.response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_retries_with_a_key_stay_on_the_first_route():
+    first, second = Backend(error=TimeoutError("read timed out")), Backend()
+    router = LatencyAwareRouter([Route("first", first), Route("second", second)], explore_rate=0)
+    router._stats["first"].record(0.01, False)
+    router._stats["second"].record(0.02, False)
+
+    with pytest.raises(TimeoutError):
+        router.process_transaction(CUSTOMER, PAYMENT, idempotency_key="order-1")
+    # The timeout makes "second" score better, but the retry keeps the
+    # key's route so that backend can deduplicate it.
+    first.error = None
+    router.process_transaction(CUSTOMER, PAYMENT, idempotency_key="order-1")
+
+    assert (first.calls, second.calls) == (2, 0)
+    assert router.decisions[-1].pinned
+    router.process_transaction(CUSTOMER, PAYMENT, idempotency_key="order-2")
+    assert router.decisions[-1].chosen == "second"
+    assert not router.decisions[-1].pinned
+
+
+def test_pins_are_bounded():
+    router = LatencyAwareRouter([Route("only", Backend())], pinned_keys=2)
+    for key in ("a", "b", "c"):
+        router.process_transaction(CUSTOMER, PAYMENT, idempotency_key=key)
+
+    router.process_transaction(CUSTOMER, PAYMENT, idempotency_key="a")
+    assert not router.decisions[-1].pinned
+    router.process_transaction(CUSTOMER, PAYMENT, idempotency_key="c")
+    assert router.decisions[-1].pinned
+
+
+def test_declines_are_not_backend_errors():
+    declined = PaymentResponse(status="failed", amount=100, message="Your card was declined.")
+    outage = PaymentResponse(status="failed", amount=100, message="502", backend_error=True)
+    backend = Backend(declined)
+    router = LatencyAwareRouter([Route("only", backend)])
+
+    router.process_transaction(CUSTOMER, PAYMENT)
+    assert router.stats()["only"].errors == 0
+    backend.response = outage
+    router.process_transaction(CUSTOMER, PAYMENT)
+    backend.error = ConnectionError("reset")
+    with pytest.raises(ConnectionError):
+        router.process_transaction(CUSTOMER, PAYMENT)
+    assert router.stats()["only"].errors == 2
+
+
+def test_a_new_route_gets_a_bounded_number_of_probes():
+    known, new = Backend(), Backend()
+    router = LatencyAwareRouter([Route("known", known), Route("new", new)], explore_rate=0)
+    router._stats["known"].record(0.01, False)
+    new.gate = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(router.process_transaction, CUSTOMER, PAYMENT) for _ in range(8)]
+        done, _ = wait(futures, timeout=1)
+        new.gate.set()
+        wait(futures, timeout=5)
+
+    assert len(done) == 7
+    assert (new.calls, known.calls) == (1, 7)
@@ -0,0 +1,299 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from payment_service.async_service import AsyncPaymentService
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.idempotency import IdempotencyCache
+from payment_service.listeners import AsyncListenersManager, ListenersManager, RefundEvent
+from payment_service.loggers import TransactionLogger
+from payment_service.service import PaymentService
+from payment_service.validators import CustomerHandler, PaymentHandler
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+FAILING_AMOUNT = 13
+
+
+class SlowProcessor:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.completed = 0
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(random.uniform(0, 0.002))
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+        if payment_data.amount == FAILING_AMOUNT:
+            raise RuntimeError("processor down")
+        return PaymentResponse(
+            status="succeeded",
+            amount=payment_data.amount,
+            transaction_id=f"ch_{payment_data.amount}",
+        )
+
+    def refund_payment(self, transaction_id, idempotency_key=None):
+        return PaymentResponse(status="succeeded", amount=0, transaction_id=f"re_{transaction_id}")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def make_service(tmp_path, processor, validators=None, **kwargs) -> PaymentService:
+    return PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        validators=CustomerHandler() if validators is None else validators,
+        logger=TransactionLogger(path=str(tmp_path / "transactions.log")),
+        listeners=ListenersManager(),
+        **kwargs,
+    )
+
+
+def payments(count: int):
+    return [(CUSTOMER, PaymentData(amount=amount, source="tok_visa")) for amount in range(1, count + 1)]
+
+
+def test_process_batch_keeps_input_order_and_reports_errors(tmp_path):
+    processor = SlowProcessor()
+    service = make_service(tmp_path, processor)
+
+    results = service.process_batch(payments(100), max_workers=4)
+
+    assert [result.index for result in results] == list(range(100))
+    assert results[FAILING_AMOUNT - 1].error == "processor down"
+    for result in results:
+        if result.index != FAILING_AMOUNT - 1:
+            assert result.ok
+            assert result.response.transaction_id == f"ch_{result.index + 1}"
+    assert processor.peak <= 4
+
+
+def test_process_batch_consumes_items_lazily(tmp_path):
+    processor = SlowProcessor()
+    service = make_service(tmp_path, processor)
+    workers = 3
+    ahead = []
+
+    def items():
+        for pulled, item in enumerate(payments(200)):
+            ahead.append(pulled - processor.completed)
+            yield item
+
+    results = service.process_batch(items(), max_workers=workers)
+
+    assert len(results) == 200
+    assert max(ahead) <= 2 * workers
+
+
+def test_process_batch_rejects_zero_workers(tmp_path):
+    service = make_service(tmp_path, SlowProcessor())
+
+    with pytest.raises(ValueError):
+        service.process_batch(payments(1), max_workers=0)
+    with pytest.raises(ValueError):
+        make_service(tmp_path, SlowProcessor(), refund_processor=SlowProcessor()).process_refunds(
+            ["ch_1"], max_workers=0
+        )
+
+
+class AsyncSlowProcessor:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(random.uniform(0, 0.002))
+        self.in_flight -= 1
+        if payment_data.amount == FAILING_AMOUNT:
+            raise RuntimeError("processor down")
+        return PaymentResponse(status="succeeded", amount=payment_data.amount)
+
+
+class AsyncSilentNotifier:
+    async def send_confirmation(self, customer_data):
+        pass
+
+
+class AsyncNullLogger:
+    async def log_transaction(self, customer_data, payment_data, payment_response):
+        pass
+
+
+def test_async_process_batch_is_bounded_and_ordered():
+    processor = AsyncSlowProcessor()
+    service = AsyncPaymentService(
+        payment_processor=processor,
+        notifier=AsyncSilentNotifier(),
+        validators=CustomerHandler(),
+        logger=AsyncNullLogger(),
+        listeners=AsyncListenersManager(),
+    )
+
+    results = asyncio.run(service.process_batch(iter(payments(100)), max_concurrency=5))
+
+    assert [result.index for result in results] == list(range(100))
+    assert results[FAILING_AMOUNT - 1].error == "processor down"
+    assert processor.peak <= 5
+    with pytest.raises(ValueError):
+        asyncio.run(service.process_batch(payments(1), max_concurrency=0))
+
+
+class FlakyRefunds:
+    def refund_payment(self, transaction_id, idempotency_key=None):
+        if transaction_id == "ch_bad":
+            raise RuntimeError("charge not found")
+        return PaymentResponse(status="succeeded", amount=100, transaction_id=f"re_{transaction_id}")
+
+
+class BrokenLogger(TransactionLogger):
+    def log_refunds(self, refunds):
+        raise OSError("disk full")
+
+
+def test_process_refunds_logs_failed_refunds(tmp_path):
+    service = make_service(tmp_path, SlowProcessor(), refund_processor=FlakyRefunds())
+
+    report = service.process_refunds(["ch_1", "ch_bad", "ch_2"], max_workers=2)
+
+    assert [outcome.ok for outcome in report.outcomes] == [True, False, True]
+    log = (tmp_path / "transactions.log").read_text()
+    assert "Refund processed for transaction ch_bad" in log
+    assert "charge not found" in log
+    assert report.unlogged == 0
+
+
+def test_process_refunds_reports_logging_failures_per_item(tmp_path):
+    service = make_service(tmp_path, SlowProcessor(), refund_processor=FlakyRefunds())
+    service.logger = BrokenLogger(path=str(tmp_path / "transactions.log"))
+
+    report = service.process_refunds(
+        ["ch_1", "ch_bad", "ch_2", "ch_3"], max_workers=2, log_batch_size=2
+    )
+
+    assert [outcome.transaction_id for outcome in report.outcomes] == ["ch_1", "ch_bad", "ch_2", "ch_3"]
+    assert report.succeeded == 3
+    assert report.unlogged == 4
+    assert all(outcome.log_error == "disk full" for outcome in report.outcomes)
+
+
+class RecordingProcessor(SlowProcessor):
+    def __init__(self):
+        super().__init__()
+        self.charged = []
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key=None):
+        self.charged.append(payment_data.amount)
+        return super().process_transaction(customer_data, payment_data, idempotency_key)
+
+
+def test_invalid_payments_never_reach_the_processor(tmp_path):
+    processor = RecordingProcessor()
+    validators = CustomerHandler()
+    validators.set_next(PaymentHandler())
+    service = make_service(tmp_path, processor, validators)
+    nameless = CustomerData(name="", contact_info=ContactInfo(email="jon@mail.co"))
+
+    with pytest.raises(ValueError, match="missing name"):
+        service.process_transaction(nameless, PaymentData(amount=-5, source="tok_visa"))
+    with pytest.raises(ValueError, match="amount must be positive"):
+        service.process_transaction(CUSTOMER, PaymentData(amount=-5, source="tok_visa"))
+    assert service.process_transaction(CUSTOMER, PaymentData(amount=5, source="tok_visa")).status == "succeeded"
+    assert processor.charged == [5]
+
+
+def test_async_invalid_payments_never_reach_the_processor():
+    processor = AsyncSlowProcessor()
+    validators = CustomerHandler()
+    validators.set_next(PaymentHandler())
+    service = AsyncPaymentService(
+        payment_processor=processor,
+        notifier=AsyncSilentNotifier(),
+        validators=validators,
+        logger=AsyncNullLogger(),
+        listeners=AsyncListenersManager(),
+    )
+
+    with pytest.raises(ValueError, match="amount must be positive"):
+        asyncio.run(service.process_transaction(CUSTOMER, PaymentData(amount=-5, source="tok_visa")))
+    assert processor.peak == 0
+
+
+class AsyncRefunds:
+    def __init__(self):
+        self.refunded = []
+
+    async def refund_payment(self, transaction_id, idempotency_key=None):
+        self.refunded.append(transaction_id)
+        await asyncio.sleep(0.01)
+        return PaymentResponse(status="succeeded", amount=100, transaction_id=f"re_{transaction_id}")
+
+
+class AsyncRefundLogger(AsyncNullLogger):
+    async def log_refund(self, transaction_id, refund_response):
+        pass
+
+
+class AsyncRecordingListener:
+    def __init__(self):
+        self.events = []
+
+    async def notify(self, event):
+        self.events.append(event)
+
+
+def make_async_refund_service(refunds, listener) -> AsyncPaymentService:
+    return AsyncPaymentService(
+        payment_processor=AsyncSlowProcessor(),
+        notifier=AsyncSilentNotifier(),
+        validators=CustomerHandler(),
+        logger=AsyncRefundLogger(),
+        listeners=AsyncListenersManager(listeners=[listener]),
+        refund_processor=refunds,
+        idempotency_cache=IdempotencyCache(),
+    )
+
+
+def test_async_refunds_are_published_to_listeners():
+    listener = AsyncRecordingListener()
+    service = make_async_refund_service(AsyncRefunds(), listener)
+
+    response = asyncio.run(service.process_refund("ch_1"))
+
+    [event] = listener.events
+    assert isinstance(event, RefundEvent)
+    assert event.transaction_id == "ch_1"
+    assert event.response is response
+
+
+def test_async_refund_retries_with_the_same_key_refund_once():
+    refunds = AsyncRefunds()
+    listener = AsyncRecordingListener()
+    service = make_async_refund_service(refunds, listener)
+
+    async def retries():
+        concurrent = await asyncio.gather(
+            *(service.process_refund("ch_1", idempotency_key="key-1") for _ in range(3))
+        )
+        later = await service.process_refund("ch_1", idempotency_key="key-1")
+        with pytest.raises(ValueError, match="different request"):
+            await service.process_refund("ch_2", idempotency_key="key-1")
+        return [*concurrent, later]
+
+    responses = asyncio.run(retries())
+
+    assert refunds.refunded == ["ch_1"]
+    assert len(listener.events) == 1
+    assert all(response is responses[0] for response in responses)
@@ -0,0 +1,71 @@
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData
+from payment_service.processors import StripePaymentProcessor
+from payment_service.stripe_simulator import StripeSimulator
+
+CUSTOMER = CustomerData(name="Jon Doe", contact_info=ContactInfo(email="jon@mail.co"))
+CARD = PaymentData(amount=1000, source="pm_card_visa")
+
+
+@pytest.fixture
+def simulator():
+    with StripeSimulator() as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def processor(simulator):
+    processor = StripePaymentProcessor(
+        api_key="sk_test_simulator", api_base=simulator.url, price_id="price_sim"
+    )
+    yield processor
+    processor.close()
+
+
+def customer_calls(simulator) -> int:
+    return simulator.stats()["endpoints"].get("POST /v1/customers", 0)
+
+
+def test_enrollments_reuse_the_cached_customer(simulator, processor):
+    first = processor.setup_recurring_payment(CUSTOMER, CARD)
+    created = customer_calls(simulator)
+    second = processor.setup_recurring_payment(CUSTOMER, CARD)
+
+    assert first.status == second.status == "active"
+    assert customer_calls(simulator) == created
+
+
+def test_cached_customers_expire(simulator, processor):
+    now = [0.0]
+    processor._customers.clock = lambda: now[0]
+    processor.setup_recurring_payment(CUSTOMER, CARD)
+    created = customer_calls(simulator)
+
+    now[0] = processor.customer_cache_ttl + 1
+    processor.setup_recurring_payment(CUSTOMER, CARD)
+
+    assert customer_calls(simulator) > created
+
+
+def test_second_enrollment_skips_attach_and_set_default(simulator, processor):
+    first = processor.setup_recurring_payment(CUSTOMER, CARD)
+    simulator.reset_stats()
+    second = processor.setup_recurring_payment(CUSTOMER, CARD)
+
+    assert {"attach", "set_default"} <= first.timings.keys()
+    assert not {"attach", "set_default"} & second.timings.keys()
+    assert simulator.stats()["endpoints"] == {
+        "GET /v1/payment_methods": 1,
+        "POST /v1/subscriptions": 1,
+    }
+
+
+def test_missing_email_fails_before_any_api_call(simulator, processor):
+    anonymous = CustomerData(name="Jon Doe", contact_info=ContactInfo(phone="+1 555 0100"))
+
+    with pytest.raises(ValueError, match="Email required"):
+        processor.setup_recurring_payment(anonymous, CARD)
+    # Waits for any lookup still running.
+    processor.close()
+    assert simulator.stats()["requests"] == 0
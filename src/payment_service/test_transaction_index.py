@@ -0,0 +1,84 @@
+import os
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from payment_service.loggers import JsonLinesFormatter
+from payment_service.loggers.index import INDEX_KINDS, TransactionLogReader, build_index, index_path
+
+FORMATTER = JsonLinesFormatter()
+
+
+def write_payment(log, number: int, email: str, timestamp: float):
+    customer = CustomerData(name=f"Customer {number}", contact_info=ContactInfo(email=email))
+    response = PaymentResponse(status="succeeded", amount=number, transaction_id=f"ch_{number}")
+    with open(log, "a", encoding="utf-8") as file:
+        file.write(FORMATTER.format_transaction(
+            customer, PaymentData(amount=number, source="tok_visa"), response, timestamp
+        ))
+
+
+def write_refund(log, number: int, timestamp: float):
+    response = PaymentResponse(status="succeeded", amount=number, transaction_id=f"re_{number}")
+    with open(log, "a", encoding="utf-8") as file:
+        file.write(FORMATTER.format_refund(f"ch_{number}", response, timestamp))
+
+
+def test_build_and_query(tmp_path):
+    log = tmp_path / "transactions.log"
+    for number in range(100):
+        write_payment(log, number, f"user{number % 10}@mail.co", 1000.0 + number)
+    write_refund(log, 42, 2000.0)
+
+    assert build_index(log) == 101
+    assert all(os.path.exists(index_path(log, kind)) for kind in INDEX_KINDS)
+
+    with TransactionLogReader(log) as reader:
+        assert [record["type"] for record in reader.find_transaction("ch_42")] == ["payment", "refund"]
+        assert reader.find_transaction("ch_missing") == []
+        assert sorted(record["amount"] for record in reader.find_customer("USER3@mail.co")) == [
+            3, 13, 23, 33, 43, 53, 63, 73, 83, 93
+        ]
+        assert [record["ts"] for record in reader.between(1010.0, 1014.0)] == [
+            1010.0, 1011.0, 1012.0, 1013.0, 1014.0
+        ]
+
+
+def test_incremental_build_and_unindexed_tail(tmp_path):
+    log = tmp_path / "transactions.log"
+    for number in range(10):
+        write_payment(log, number, "a@mail.co", 1000.0 + number)
+    assert build_index(log) == 10
+
+    for number in range(10, 15):
+        write_payment(log, number, "a@mail.co", 1000.0 + number)
+    with TransactionLogReader(log) as reader:
+        # Appended after the last build: found by scanning the tail.
+        assert [record["amount"] for record in reader.find_transaction("ch_12")] == [12]
+        assert len(reader.find_customer("a@mail.co")) == 15
+
+    assert build_index(log) == 5
+    assert build_index(log) == 0
+    with TransactionLogReader(log) as reader:
+        assert len(list(reader.between())) == 15
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    log = tmp_path / "transactions.log"
+    write_payment(log, 1, "a@mail.co", 1000.0)
+    with open(log, "a", encoding="utf-8") as file:
+        file.write('{"type":"payment","transaction_id":"ch_2"')
+
+    assert build_index(log) == 1
+    with TransactionLogReader(log) as reader:
+        assert reader.find_transaction("ch_2") == []
+        assert len(reader.find_transaction("ch_1")) == 1
+
+
+def test_queries_span_segments(tmp_path):
+    segments = [tmp_path / "transactions.log.000001", tmp_path / "transactions.log"]
+    write_payment(segments[0], 1, "a@mail.co", 1000.0)
+    write_payment(segments[1], 2, "a@mail.co", 2000.0)
+    build_index(segments[0])
+
+    with TransactionLogReader(segments) as reader:
+        assert [record["amount"] for record in reader.find_customer("a@mail.co")] == [1, 2]
+        assert [record["amount"] for record in reader.between()] == [1, 2]
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, Request
+from payment_service.validators import (
+    BatchValidator,
+    ChainHandler,
+    CustomerHandler,
+    PaymentHandler,
+    RejectReason,
+)
+
+NO_NAME = "Invalid customer data: missing name"
+NEGATIVE = "Invalid payment data: amount must be positive"
+
+
+def request(name: str = "Jon Doe", amount: int = 100) -> Request:
+    return Request(
+        customer_data=CustomerData(name=name, contact_info=ContactInfo(email="jon@mail.co")),
+        payment_data=PaymentData(amount=amount, source="tok_visa"),
+    )
+
+
+def chain() -> ChainHandler:
+    head = CustomerHandler()
+    head.set_next(PaymentHandler())
+    return head
+
+
+def test_compile_returns_failures_in_chain_order():
+    validate = chain().compile()
+
+    assert validate.handlers == ("CustomerHandler", "PaymentHandler")
+    assert validate(request()) == ()
+    assert [tuple(failure) for failure in validate(request(name="", amount=-1))] == [
+        ("CustomerHandler", NO_NAME)
+    ]
+    assert [failure.message for failure in chain().compile(collect_all=True)(
+        request(name="", amount=-1)
+    )] == [NO_NAME, NEGATIVE]
+
+
+def test_compile_async_matches_compile():
+    validate = chain().compile_async(collect_all=True)
+
+    assert asyncio.run(validate(request())) == ()
+    assert [failure.message for failure in asyncio.run(validate(request(name="", amount=-1)))] == [
+        NO_NAME, NEGATIVE
+    ]
+
+
+class LegacyHandler(ChainHandler):
+    """Written against the old API: validates and forwards in `handle`."""
+
+    def __init__(self):
+        self.seen = 0
+
+    def handle(self, request: Request):
+        self.seen += 1
+        if self._next_handlrer is not None:
+            self._next_handlrer.handle(request)
+
+
+def test_handlers_that_only_implement_handle_still_work(capsys):
+    legacy = LegacyHandler()
+    legacy.set_next(PaymentHandler())
+    head = CustomerHandler()
+    head.set_next(legacy)
+
+    validate = head.compile()
+    assert validate.handlers == ("CustomerHandler", "LegacyHandler")
+    assert validate(request(amount=-1)) == ()
+    assert legacy.seen == 1
+    assert NEGATIVE in capsys.readouterr().out
+
+
+def test_batch_validator_reports_each_failing_row():
+    result = BatchValidator().validate(
+        amounts=[100, 0, 50, -5],
+        sources=["tok_visa", "tok_visa", "", "tok_visa"],
+        names=["Jon", "Ann", "Bo", None],
+        emails=["jon@mail.co", None, "bo@mail.co", None],
+        phones=[None, "+1 555 0100", None, None],
+    )
+
+    assert result.valid.tolist() == [True, False, False, False]
+    assert result.invalid_count == 3
+    assert result.invalid_rows().tolist() == [1, 2, 3]
+    assert result.reason(1) == RejectReason.NON_POSITIVE_AMOUNT
+    assert result.reason(2) == RejectReason.MISSING_SOURCE
+    assert result.reason(3) == (
+        RejectReason.NON_POSITIVE_AMOUNT | RejectReason.MISSING_NAME | RejectReason.MISSING_CONTACT
+    )
+    assert result.messages(3) == [NO_NAME, "Invalid customer data: missing email and phone", NEGATIVE]
+
+
+def test_batch_validator_matches_the_handlers():
+    requests = [request(), request(name=""), request(amount=-1)]
+    result = BatchValidator().validate_requests(requests)
+    columns = BatchValidator().validate(
+        amounts=[100, 100, -1],
+        sources=np.array(["tok_visa"] * 3),
+        names=np.array(["Jon Doe", "", "Jon Doe"]),
+        emails=np.array(["jon@mail.co"] * 3),
+        phones=np.array([""] * 3),
+    )
+
+    validate = chain().compile(collect_all=True)
+    for row, item in enumerate(requests):
+        assert result.messages(row) == [failure.message for failure in validate(item)]
+    assert columns.reasons.tolist() == result.reasons.tolist()
+    with pytest.raises(ValueError):
+        BatchValidator().validate([1, 2], ["a"], ["a", "b"], ["a", "b"], ["a", "b"])
+
+
+class RemoteCheck(ChainHandler):
+    """An independent check that waits at `barrier`, then fails after `delay`."""
+
+    independent = True
+
+    def __init__(self, barrier: threading.Barrier, delay: float, message: str):
+        self.barrier = barrier
+        self.delay = delay
+        self.message = message
+
+    def check(self, request: Request):
+        # Only returns if every check of the stage is running at once.
+        self.barrier.wait()
+        time.sleep(self.delay)
+        raise ValueError(self.message)
+
+
+def test_independent_handlers_run_together_and_report_in_order():
+    barrier = threading.Barrier(2, timeout=5)
+    head = CustomerHandler()
+    head.set_next(RemoteCheck(barrier, 0.05, "slow")).set_next(RemoteCheck(barrier, 0, "fast"))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        validate = head.compile(collect_all=True, executor=executor)
+        assert [failure.message for failure in validate(request())] == ["slow", "fast"]
+        assert [failure.message for failure in validate(request(name=""))] == [NO_NAME, "slow", "fast"]
+        first = head.compile(executor=executor)(request())
+
+    assert [failure.message for failure in first] == ["fast"]
+
+
+def test_independent_handlers_run_as_concurrent_tasks():
+    barrier = threading.Barrier(2, timeout=5)
+    head = RemoteCheck(barrier, 0.05, "slow")
+    head.set_next(RemoteCheck(barrier, 0, "fast"))
+
+    failures = asyncio.run(head.compile_async(collect_all=True)(request()))
+
+    assert [failure.message for failure in failures] == ["slow", "fast"]
@@ -0,0 +1,37 @@
+from payment_service.commons import ContactInfo, CustomerData, PaymentData, Request
+from payment_service.validators import CustomerHandler, VelocityHandler, VelocityLimit
+
+
+def request(email: str = "jon@mail.co", source: str = "tok_visa", amount: int = 100) -> Request:
+    return Request(
+        customer_data=CustomerData(name="Jon Doe", contact_info=ContactInfo(email=email)),
+        payment_data=PaymentData(amount=amount, source=source),
+    )
+
+
+def test_velocity_behind_another_handler_rejects_over_limit(capsys):
+    velocity = VelocityHandler([VelocityLimit("customer", max_count=2)], clock=lambda: 0.0)
+    chain = CustomerHandler()
+    chain.set_next(velocity)
+
+    for _ in range(3):
+        chain.handle(request())
+
+    assert velocity.tracked_keys() == 1
+    assert capsys.readouterr().out.count("Velocity limit exceeded") == 1
+
+
+def test_compiled_chain_counts_per_key_and_ages_out():
+    now = [0.0]
+    velocity = VelocityHandler(
+        [VelocityLimit("source", window=60, max_amount=250, buckets=6)], clock=lambda: now[0]
+    )
+    chain = CustomerHandler()
+    chain.set_next(velocity)
+    validate = chain.compile()
+
+    assert validate(request(amount=200)) == ()
+    assert [failure.handler for failure in validate(request(amount=100))] == ["VelocityHandler"]
+    assert validate(request(source="tok_other", amount=100)) == ()
+    now[0] = 61
+    assert validate(request(amount=100)) == ()
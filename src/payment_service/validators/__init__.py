@@ -1,11 +1,64 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .customer import CustomerValidator
 from .payment import PaymentDataValidator
 from .chain_handle import ChainHandler
-from .customer_handle import CustomerHandler
+from .compiled import (
+    AsyncCompiledValidation,
+    CompiledValidation,
+    ValidationFailure,
+    compile_steps,
+)
+from .customer_handle import CustomerHandler, PaymentHandler
+from .velocity import HOUR, MINUTE, VelocityHandler, VelocityLimit
+
+if TYPE_CHECKING:
+    from .batch import BatchValidationResult, BatchValidator, RejectReason
+    from .blocklist import Blocklist, BlocklistHandler, build_blocklist
+
+# The batch validator needs NumPy, and the blocklist doubles as a CLI run
+# with `python -m`, so both are only imported when used.
+_LAZY_VALIDATORS = {
+    "BatchValidationResult": ".batch",
+    "BatchValidator": ".batch",
+    "RejectReason": ".batch",
+    "Blocklist": ".blocklist",
+    "BlocklistHandler": ".blocklist",
+    "build_blocklist": ".blocklist",
+}
 
 __all__ = [
+    "AsyncCompiledValidation",
+    "BatchValidationResult",
+    "BatchValidator",
+    "Blocklist",
+    "BlocklistHandler",
     "CustomerValidator",
     "PaymentDataValidator",
     "ChainHandler",
+    "CompiledValidation",
     "CustomerHandler",
+    "PaymentHandler",
+    "RejectReason",
+    "VelocityHandler",
+    "VelocityLimit",
+    "ValidationFailure",
+    "build_blocklist",
+    "compile_steps",
+    "HOUR",
+    "MINUTE",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_VALIDATORS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
@@ -1,15 +1,124 @@
-from abc import ABC, abstractmethod
+import asyncio
+from abc import ABC
+from concurrent.futures import Executor
 from typing import Self, Optional
-from dataclasses import dataclass
-from commons import request 
+
+from payment_service.commons import Request
+
+from .compiled import (
+    AsyncCompiledValidation,
+    CompiledValidation,
+    compile_async_stages,
+    compile_stages,
+    compile_steps,
+)
+
 
 class ChainHandler(ABC):
-    _next_handlrer: Optional[Self]
+    _next_handlrer: Optional[Self] = None
+    # Independent handlers neither depend on nor affect the others, so when
+    # the chain is compiled with an executor (or for asyncio) consecutive
+    # independent handlers run concurrently. Only mark handlers that wait on
+    # I/O (remote lookups, external stores): for in-memory checks the thread
+    # hop costs more than the check.
+    independent: bool = False
 
     def set_next(self, handler: Self):
         self._next_handlrer = handler
         return handler
     
-    @abstractmethod
-    def handle(self, request):
-        ...
\ No newline at end of file
+    def check(self, request: Request):
+        """
+        Validates `request` for this handler only, raising ValueError on failure.
+
+        Handlers written before `check` existed only override `handle`, which
+        validates and forwards to the rest of the chain itself. For those the
+        default runs `handle`, and `compile` stops walking the chain there,
+        so they keep printing their own errors as before.
+        """
+        if not self._legacy():
+            raise NotImplementedError(f"{type(self).__name__} must implement check")
+        self.handle(request)
+
+    def handle(self, request: Request):
+        try:
+            self.check(request)
+            if self._next_handlrer is not None:
+                self._next_handlrer.handle(request)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    async def check_async(self, request: Request):
+        """
+        Asyncio version of `check`; handlers doing I/O should override it.
+
+        By default independent handlers run `check` on a worker thread and
+        the others run it inline.
+        """
+        if self.independent:
+            await asyncio.to_thread(self.check, request)
+        else:
+            self.check(request)
+
+    def compile(
+        self, collect_all: bool = False, executor: Optional[Executor] = None
+    ) -> CompiledValidation:
+        """
+        Flattens the chain starting at this handler into one callable.
+
+        The chain is walked once, here, instead of on every request: the
+        result loops over each handler's bound `check` in order and returns a
+        tuple of `ValidationFailure`s (empty when valid) instead of printing.
+        With an `executor`, runs of consecutive independent handlers are
+        submitted to it together, so they cost the slowest of them rather
+        than their sum, and stop at the first failure.
+        """
+        handlers = self._chain()
+        if executor is None:
+            steps = [(type(handler).__name__, handler.check) for handler in handlers]
+            return compile_steps(steps, collect_all=collect_all)
+        stages = [
+            (parallel, [(type(handler).__name__, handler.check) for handler in group])
+            for parallel, group in self._stages(handlers)
+        ]
+        return compile_stages(stages, executor, collect_all=collect_all)
+
+    def compile_async(self, collect_all: bool = False) -> AsyncCompiledValidation:
+        """
+        Like `compile` for asyncio: the result is a coroutine function that
+        awaits each handler's `check_async`, running consecutive independent
+        handlers as concurrent tasks and cancelling the rest on failure.
+        """
+        handlers = self._chain()
+        stages = [
+            (parallel, [(type(handler).__name__, handler.check_async) for handler in group])
+            for parallel, group in self._stages(handlers)
+        ]
+        return compile_async_stages(stages, collect_all=collect_all)
+
+    def _chain(self) -> list["ChainHandler"]:
+        handlers = []
+        handler: Optional[ChainHandler] = self
+        while handler is not None:
+            handlers.append(handler)
+            if handler._legacy():
+                break
+            handler = handler._next_handlrer
+        return handlers
+
+    def _legacy(self) -> bool:
+        """True for handlers that override `handle` but not `check`."""
+        cls = type(self)
+        return cls.check is ChainHandler.check and cls.handle is not ChainHandler.handle
+
+    @staticmethod
+    def _stages(handlers: list["ChainHandler"]) -> list[tuple[bool, list["ChainHandler"]]]:
+        """Groups consecutive handlers into (parallel, handlers) stages."""
+        stages: list[tuple[bool, list[ChainHandler]]] = []
+        for handler in handlers:
+            if stages and stages[-1][0] == handler.independent:
+                stages[-1][1].append(handler)
+            else:
+                stages.append((handler.independent, [handler]))
+        # A lone independent handler gains nothing from a thread hop.
+        return [(parallel and len(group) > 1, group) for parallel, group in stages]
@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import FIRST_EXCEPTION, Executor, wait
+from typing import Awaitable, Callable, NamedTuple, Sequence
+
+from payment_service.commons import Request
+
+
+class ValidationFailure(NamedTuple):
+    handler: str
+    message: str
+
+
+CompiledValidation = Callable[[Request], tuple[ValidationFailure, ...]]
+AsyncCompiledValidation = Callable[[Request], Awaitable[tuple[ValidationFailure, ...]]]
+
+Step = tuple[str, Callable[[Request], None]]
+AsyncStep = tuple[str, Callable[[Request], Awaitable[None]]]
+# (parallel, steps): runs of independent handlers are parallel stages.
+Stage = tuple[bool, Sequence[Step]]
+AsyncStage = tuple[bool, Sequence[AsyncStep]]
+
+
+def compile_steps(
+    steps: Sequence[Step],
+    collect_all: bool = False,
+) -> CompiledValidation:
+    """
+    Runs (handler name, check) pairs in order as one function.
+
+    The function returns a tuple of failures, empty when the request is
+    valid. By default it stops at the first failure, like a chain; with
+    `collect_all` every check runs and all failures are reported.
+    """
+    steps = tuple(steps)
+
+    def validate(request):
+        failures = ()
+        for name, check in steps:
+            try:
+                check(request)
+            except ValueError as e:
+                failures += (ValidationFailure(name, str(e)),)
+                if not collect_all:
+                    break
+        return failures
+
+    validate.handlers = tuple(name for name, _ in steps)
+    return validate
+
+
+def parallel_steps(
+    steps: Sequence[Step], executor: Executor, collect_all: bool = False
+) -> CompiledValidation:
+    """
+    Runs the checks of `steps` concurrently on `executor`.
+
+    Without `collect_all` the first failure is returned as soon as it
+    happens and the checks that have not started yet are cancelled; checks
+    already running on a thread finish in the background. Failures are
+    reported in step order.
+    """
+
+    def validate(request):
+        futures = {
+            executor.submit(check, request): i for i, (_, check) in enumerate(steps)
+        }
+        pending = set(futures)
+        failed = []
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    error = future.exception()
+                    if isinstance(error, ValueError):
+                        failed.append((futures[future], str(error)))
+                    elif error is not None:
+                        raise error
+                if failed and not collect_all:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+        return tuple(
+            ValidationFailure(steps[i][0], message) for i, message in sorted(failed)
+        )
+
+    validate.handlers = tuple(name for name, _ in steps)
+    return validate
+
+
+def compile_stages(
+    stages: Sequence[Stage], executor: Executor, collect_all: bool = False
+) -> CompiledValidation:
+    """Runs `stages` in order, parallel ones on `executor`, sequential ones compiled."""
+    parts = [
+        parallel_steps(steps, executor, collect_all)
+        if parallel
+        else compile_steps(steps, collect_all)
+        for parallel, steps in stages
+    ]
+    if len(parts) == 1:
+        return parts[0]
+
+    def validate(request):
+        failures = ()
+        for part in parts:
+            found = part(request)
+            if found:
+                if not collect_all:
+                    return found
+                failures += found
+        return failures
+
+    validate.handlers = tuple(name for part in parts for name in part.handlers)
+    return validate
+
+
+async def _parallel_async(
+    steps: Sequence[AsyncStep], request: Request, collect_all: bool
+) -> list[ValidationFailure]:
+    tasks = {
+        asyncio.ensure_future(check(request)): i for i, (_, check) in enumerate(steps)
+    }
+    pending = set(tasks)
+    failed = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                error = task.exception()
+                if isinstance(error, ValueError):
+                    failed.append((tasks[task], str(error)))
+                elif error is not None:
+                    raise error
+            if failed and not collect_all:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+    return [ValidationFailure(steps[i][0], message) for i, message in sorted(failed)]
+
+
+def compile_async_stages(
+    stages: Sequence[AsyncStage], collect_all: bool = False
+) -> AsyncCompiledValidation:
+    """
+    Asyncio counterpart of `compile_stages`.
+
+    The checks of a parallel stage run as tasks on the running loop; without
+    `collect_all` the remaining tasks are cancelled at the first failure.
+    """
+
+    async def validate(request):
+        failures = []
+        for parallel, steps in stages:
+            if parallel:
+                failures += await _parallel_async(steps, request, collect_all)
+            else:
+                for name, check in steps:
+                    try:
+                        await check(request)
+                    except ValueError as e:
+                        failures.append(ValidationFailure(name, str(e)))
+                        if not collect_all:
+                            break
+            if failures and not collect_all:
+                break
+        return tuple(failures)
+
+    validate.handlers = tuple(name for _, steps in stages for name, _ in steps)
+    return validate
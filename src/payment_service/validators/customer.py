@@ -4,14 +4,11 @@ from payment_service.commons import CustomerData
 class CustomerValidator:
     def validate(self, customer_data: CustomerData):
         if not customer_data.name:
-            print("Invalid customer data: missing name")
             raise ValueError("Invalid customer data: missing name")
         if not customer_data.contact_info:
-            print("Invalid customer data: missing contact info")
             raise ValueError("Invalid customer data: missing contact info")
         if not (
             customer_data.contact_info.email
             or customer_data.contact_info.phone
         ):
-            print("Invalid customer data: missing email and phone")
             raise ValueError("Invalid customer data: missing email and phone")
@@ -1,25 +1,19 @@
-from chain_handle import ChainHandler
-from commons import Request
+from payment_service.commons import Request
+
+from .chain_handle import ChainHandler
 from .customer import CustomerValidator
 from .payment import PaymentDataValidator
 
 class CustomerHandler(ChainHandler):
-    def handle(self, request: Request):
-        validator = CustomerValidator()
-        try:
-            validator.validate(request.customer_data)
-            if self._next_handlrer:
-                self._next_handlrer.handle(request)
-                 
-        except ValueError as e:
-            print(f"Error: {e}")
+    def __init__(self):
+        self.validator = CustomerValidator()
+
+    def check(self, request: Request):
+        self.validator.validate(request.customer_data)
 
 class PaymentHandler(ChainHandler):
-    def handle(self, request: Request):
-        validator = PaymentDataValidator()
-        try:
-            validator.validate(request.payment_data)
-            if self._next_handlrer:
-                self._next_handlrer.handle(request)
-        except ValueError as e:
-            print(f"Error: {e}")  
\ No newline at end of file
+    def __init__(self):
+        self.validator = PaymentDataValidator()
+
+    def check(self, request: Request):
+        self.validator.validate(request.payment_data)
@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Literal, Optional, Sequence
+
+from payment_service.commons import Request
+
+from .chain_handle import ChainHandler
+
+MINUTE = 60.0
+HOUR = 3600.0
+
+
+@dataclass(frozen=True)
+class VelocityLimit:
+    """
+    At most `max_count` payments and/or `max_amount` in total per key within
+    the last `window` seconds. `scope` selects the key: the customer (id,
+    else email, else phone) or the payment source. The window is split into
+    `buckets` slots; counts age out one slot at a time.
+    """
+
+    scope: Literal["customer", "source"]
+    window: float = MINUTE
+    max_count: Optional[int] = None
+    max_amount: Optional[int] = None
+    buckets: int = 60
+
+    def __post_init__(self):
+        if self.scope not in ("customer", "source"):
+            raise ValueError(f"Unknown velocity scope {self.scope}")
+        if self.window <= 0 or self.buckets < 1:
+            raise ValueError("window and buckets must be positive")
+        if self.max_count is None and self.max_amount is None:
+            raise ValueError("A velocity limit needs max_count or max_amount")
+
+    @property
+    def bucket_width(self) -> float:
+        return self.window / self.buckets
+
+
+class SlidingWindow:
+    """Ring of per-bucket counts and amounts with running totals."""
+
+    __slots__ = ("counts", "amounts", "count", "amount", "head")
+
+    def __init__(self, buckets: int, head: int):
+        self.counts = [0] * buckets
+        self.amounts = [0] * buckets
+        self.count = 0
+        self.amount = 0
+        self.head = head
+
+    def advance(self, bucket: int):
+        """Moves the window forward to absolute bucket `bucket`, dropping expired slots."""
+        size = len(self.counts)
+        steps = bucket - self.head
+        if steps <= 0:
+            return
+        if steps >= size:
+            self.counts = [0] * size
+            self.amounts = [0] * size
+            self.count = self.amount = 0
+        else:
+            for expired in range(self.head + 1, bucket + 1):
+                slot = expired % size
+                self.count -= self.counts[slot]
+                self.amount -= self.amounts[slot]
+                self.counts[slot] = self.amounts[slot] = 0
+        self.head = bucket
+
+    def add(self, amount: int):
+        slot = self.head % len(self.counts)
+        self.counts[slot] += 1
+        self.amounts[slot] += amount
+        self.count += 1
+        self.amount += amount
+
+
+class _WindowStore:
+    """LRU map of key -> SlidingWindow that also drops windows idle for a full window."""
+
+    def __init__(self, limit: VelocityLimit, max_keys: int):
+        self.limit = limit
+        self.max_keys = max_keys
+        self.windows: OrderedDict[Hashable, SlidingWindow] = OrderedDict()
+
+    def window(self, key: Hashable, bucket: int) -> SlidingWindow:
+        window = self.windows.get(key)
+        if window is None:
+            window = self.windows[key] = SlidingWindow(self.limit.buckets, bucket)
+        else:
+            self.windows.move_to_end(key)
+            window.advance(bucket)
+        self._evict(bucket)
+        return window
+
+    def _evict(self, bucket: int):
+        windows = self.windows
+        while len(windows) > self.max_keys:
+            windows.popitem(last=False)
+        # The least recently used windows sit at the front; once one of them
+        # is older than a full window it holds nothing and can go.
+        while windows:
+            oldest = next(iter(windows.values()))
+            if bucket - oldest.head < self.limit.buckets:
+                break
+            windows.popitem(last=False)
+
+
+class VelocityHandler(ChainHandler):
+    """
+    Rejects payments that exceed per-customer or per-source velocity limits.
+
+    Each limit keeps a bucketed sliding window per key with running totals,
+    so a check costs O(1) amortized regardless of the window length, and at
+    most `max_keys` windows per limit (least recently used first out; idle
+    windows are dropped as they age out). Accepted payments are counted;
+    rejected ones are not.
+    """
+
+    def __init__(
+        self,
+        limits: Sequence[VelocityLimit],
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not limits:
+            raise ValueError("VelocityHandler needs at least one limit")
+        self.limits = tuple(limits)
+        self.clock = clock
+        self._stores = [_WindowStore(limit, max_keys) for limit in self.limits]
+        self._lock = threading.Lock()
+
+    def tracked_keys(self) -> int:
+        """Number of windows currently held across all limits."""
+        return sum(len(store.windows) for store in self._stores)
+
+    @staticmethod
+    def _key(limit: VelocityLimit, request: Request) -> Optional[Hashable]:
+        if limit.scope == "source":
+            return request.payment_data.source or None
+        customer = request.customer_data
+        contact = customer.contact_info
+        return customer.customer_id or contact.email or contact.phone or None
+
+    def check(self, request: Request):
+        amount = request.payment_data.amount
+        now = self.clock()
+        with self._lock:
+            windows = []
+            for limit, store in zip(self.limits, self._stores):
+                key = self._key(limit, request)
+                if key is None:
+                    continue
+                window = store.window(key, int(now // limit.bucket_width))
+                if limit.max_count is not None and window.count + 1 > limit.max_count:
+                    raise ValueError(
+                        f"Velocity limit exceeded: more than {limit.max_count} "
+                        f"payments per {limit.scope} in {limit.window:g}s"
+                    )
+                if limit.max_amount is not None and window.amount + amount > limit.max_amount:
+                    raise ValueError(
+                        f"Velocity limit exceeded: more than {limit.max_amount} "
+                        f"per {limit.scope} in {limit.window:g}s"
+                    )
+                windows.append(window)
+            for window in windows:
+                window.add(amount)